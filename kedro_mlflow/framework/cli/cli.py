@@ -1,22 +1,35 @@
 import os
+import re
+import socket
 import subprocess
 from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlparse
 
 import click
 from kedro import __file__ as KEDRO_PATH
 
-from kedro_mlflow.framework.cli.cli_utils import (
-    render_jinja_template,
-    write_jinja_template,
-)
-from kedro_mlflow.framework.context import get_mlflow_config
 from kedro_mlflow.utils import _already_updated, _get_project_globals, _is_kedro_project
 
+# this module is imported by every kedro command (even "kedro --help")
+# through the entry points of the plugin: mlflow, jinja2 and the kedro
+# context are only imported in the commands which need them
+
 TEMPLATE_FOLDER_PATH = Path(__file__).parent.parent.parent / "template" / "project"
 
+# the key of the click context where the working directory
+# of the last update of the commands is stored
+_COMMANDS_CWD_KEY = "kedro_mlflow.commands_cwd"
+
 
 class KedroClickGroup(click.Group):
-    def reset_commands(self):
+    def reset_commands(self, ctx=None):
+        # click calls list_commands and get_command several times per
+        # invocation (e.g. once per command for the help): the project
+        # is inspected once per invocation and working directory
+        cwd = Path.cwd()
+        if ctx is not None and ctx.meta.get(_COMMANDS_CWD_KEY) == cwd:
+            return
         self.commands = {}
 
         # add commands on the fly based on conditions
@@ -24,12 +37,18 @@ class KedroClickGroup(click.Group):
             self.add_command(init)
             if _already_updated():
                 self.add_command(ui)
+                self.add_command(sync)
+                self.add_command(migrate_store)
+                self.add_command(runs)
+                self.add_command(export_metrics)
                 # self.add_command(run) # TODO : IMPLEMENT THIS FUNCTION
         else:
             self.add_command(new)
+        if ctx is not None:
+            ctx.meta[_COMMANDS_CWD_KEY] = cwd
 
     def list_commands(self, ctx):
-        self.reset_commands()
+        self.reset_commands(ctx)
         commands_list = sorted(self.commands)
         if commands_list == ["init"]:
             click.secho(
@@ -39,7 +58,7 @@ class KedroClickGroup(click.Group):
         return commands_list
 
     def get_command(self, ctx, cmd_name):
-        self.reset_commands()
+        self.reset_commands(ctx)
         return self.commands.get(cmd_name)
 
 
@@ -85,6 +104,11 @@ def init(force, silent):
          If you do not want to erase "run.py", insert the hooks manually
     """
 
+    from kedro_mlflow.framework.cli.cli_utils import (
+        render_jinja_template,
+        write_jinja_template,
+    )
+
     # get constants
     project_path = Path().cwd()
     project_globals = _get_project_globals()
@@ -168,7 +192,7 @@ def init(force, silent):
     "--project-path",
     "-p",
     required=False,
-    help="The environment within conf folder we want to retrieve.",
+    help="The path to the kedro project. Default to the current directory.",
 )
 @click.option(
     "--env",
@@ -177,20 +201,403 @@ def init(force, silent):
     default="local",
     help="The environment within conf folder we want to retrieve.",
 )
-def ui(project_path, env):
+@click.option(
+    "--port",
+    type=int,
+    default=None,
+    help="The port of the ui. Overrides 'ui.port' of mlflow.yml.",
+)
+@click.option(
+    "--host",
+    default=None,
+    help="The host of the ui. Overrides 'ui.host' of mlflow.yml.",
+)
+@click.option(
+    "--server/--no-server",
+    default=None,
+    help="Launch the ui with 'mlflow server' instead of 'mlflow ui'. Overrides 'ui.server' of mlflow.yml.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=int,
+    default=None,
+    help="The number of workers of 'mlflow server'. Overrides 'ui.workers' of mlflow.yml.",
+)
+def ui(project_path, env, port, host, server, workers):
     """Opens the mlflow user interface with the
         project-specific settings of mlflow.yml. This interface
         enables to browse and compares runs.
 
     """
+    from kedro_mlflow.framework.context import get_mlflow_config
 
     # the context must contains the self.mlflow attribues with mlflow configuration
     mlflow_conf = get_mlflow_config(project_path=project_path, env=env)
+    # the options of the command line take precedence over mlflow.yml
+    ui_opts = dict(mlflow_conf.ui_opts)
+    ui_opts.update(
+        {
+            k: v
+            for k, v in dict(
+                port=port, host=host, server=server, workers=workers
+            ).items()
+            if v is not None
+        }
+    )
+    if ui_opts["workers"] is not None and not ui_opts["server"]:
+        raise click.UsageError(
+            "'--workers' can only be used with '--server': 'mlflow ui' has a single worker"
+        )
 
-    # call mlflow ui with specific options
-    # TODO : add more options for ui
     subprocess.call(
-        ["mlflow", "ui", "--backend-store-uri", mlflow_conf.mlflow_tracking_uri]
+        _get_ui_command(
+            tracking_uri=mlflow_conf.mlflow_tracking_uri,
+            project_path=mlflow_conf.project_path,
+            **ui_opts,
+        )
+    )
+
+
+def _get_ui_command(
+    tracking_uri: str,
+    project_path: Path,
+    port: Optional[int] = None,
+    host: Optional[str] = None,
+    server: bool = False,
+    workers: Optional[int] = None,
+) -> List[str]:
+    if server:
+        # "mlflow server" serves the ui with several gunicorn workers, hence
+        # slow searches on large experiments do not block the other requests
+        command = ["mlflow", "server", "--backend-store-uri", tracking_uri]
+        if urlparse(tracking_uri).scheme != "file":
+            # it is mandatory for a database, and only used by the experiments
+            # created from the ui: kedro-mlflow creates them with the client
+            command += [
+                "--default-artifact-root",
+                (Path(project_path) / "mlruns").as_uri(),
+            ]
+        if workers is not None:
+            command += ["--workers", str(workers)]
+    else:
+        command = ["mlflow", "ui", "--backend-store-uri", tracking_uri]
+    host = host or "localhost"
+    command += ["--host", host, "--port", str(port or _find_free_port(host))]
+    return command
+
+
+def _find_free_port(host: str, default_port: int = 5000) -> int:
+    """The default port of mlflow if it is free,
+    or a free port chosen by the system.
+    """
+    for port in (default_port, 0):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind((host, port))
+            except OSError:
+                continue
+            return sock.getsockname()[1]
+    raise KedroMlflowCliError(f"No free port found on host '{host}'")
+
+
+@mlflow_commands.command()
+@click.option(
+    "--env",
+    "-e",
+    required=False,
+    default="local",
+    help="The environment within conf folder we want to retrieve.",
+)
+def sync(env):
+    """Sends the runs recorded in the local spool (see the "spool"
+        section of mlflow.yml) to the tracking server. The runs which
+        are already synchronized are skipped, hence the command can
+        be safely run again, e.g. after a failure.
+
+    """
+    from kedro_mlflow.framework.context import get_mlflow_config
+    from kedro_mlflow.framework.tracking import sync_spool
+
+    mlflow_conf = get_mlflow_config(project_path=Path().cwd(), env=env)
+    synced_run_ids = sync_spool(
+        spool_uri=mlflow_conf.spool_uri, tracking_uri=mlflow_conf.mlflow_tracking_uri
+    )
+    click.secho(
+        f"{len(synced_run_ids)} run(s) synchronized with '{mlflow_conf.mlflow_tracking_uri}'",
+        fg="green",
+    )
+
+
+@mlflow_commands.command(name="migrate-store")
+@click.option(
+    "--env",
+    "-e",
+    required=False,
+    default="local",
+    help="The environment within conf folder we want to retrieve.",
+)
+@click.option(
+    "--db-uri",
+    default="sqlite:///mlflow.db",
+    show_default=True,
+    help="The SQLAlchemy uri of the database where the runs are copied.",
+)
+@click.option(
+    "--batch-size",
+    type=int,
+    default=100,
+    show_default=True,
+    help="The number of runs inserted in the database in a single transaction.",
+)
+@click.option(
+    "--update-config/--no-update-config",
+    default=True,
+    help="Should 'mlflow_tracking_uri' be replaced by the database uri in mlflow.yml?",
+)
+def migrate_store(env, db_uri, batch_size, update_config):
+    """Copies the runs of the file store of the project (the default
+        "mlruns" folder) in a database, which is much faster to list and
+        search runs. The ids, the metrics history, the params, the tags and
+        the artifact locations are kept: the artifacts stay in the file store.
+        The runs already copied are skipped, hence the command can be
+        safely run again, e.g. after a failure.
+
+    """
+    from kedro_mlflow.framework.context import get_mlflow_config
+    from kedro_mlflow.framework.tracking.migration import migrate_file_store
+
+    project_path = Path().cwd()
+    mlflow_conf = get_mlflow_config(project_path=project_path, env=env)
+    if urlparse(mlflow_conf.mlflow_tracking_uri).scheme != "file":
+        raise KedroMlflowCliError(
+            f"'mlflow_tracking_uri' must be a file store to be migrated, got '{mlflow_conf.mlflow_tracking_uri}'"
+        )
+
+    def progress(nb_processed, nb_runs):
+        click.echo(f"{nb_processed}/{nb_runs} runs processed")
+
+    summary = migrate_file_store(
+        file_store_uri=mlflow_conf.mlflow_tracking_uri,
+        db_uri=db_uri,
+        batch_size=batch_size,
+        progress=progress,
+    )
+    click.secho(
+        f"{summary['runs']} run(s) of {summary['experiments']} experiment(s) migrated to '{db_uri}' ({summary['metrics']} metric values, {summary['skipped']} run(s) already migrated)",
+        fg="green",
+    )
+    if update_config:
+        mlflow_yml_path = _update_tracking_uri(project_path, env, db_uri)
+        click.secho(
+            f"'mlflow_tracking_uri' updated in '{mlflow_yml_path.relative_to(project_path).as_posix()}'",
+            fg="green",
+        )
+
+
+def _update_tracking_uri(project_path: Path, env: str, tracking_uri: str) -> Path:
+    # the file where the uri is defined is edited in place to keep its comments,
+    # the environment first since it overrides the base configuration
+    pattern = re.compile(r"^mlflow_tracking_uri:.*$", flags=re.MULTILINE)
+    for conf_env in (env, "base"):
+        mlflow_yml_path = project_path / "conf" / conf_env / "mlflow.yml"
+        if mlflow_yml_path.is_file():
+            mlflow_yml = mlflow_yml_path.read_text(encoding="utf-8")
+            if pattern.search(mlflow_yml):
+                mlflow_yml_path.write_text(
+                    pattern.sub(f"mlflow_tracking_uri: {tracking_uri}", mlflow_yml),
+                    encoding="utf-8",
+                )
+                return mlflow_yml_path
+    raise KedroMlflowCliError(
+        f"No 'mlflow_tracking_uri' key found in the mlflow.yml of the '{env}' and 'base' environments"
+    )
+
+
+@mlflow_commands.command()
+@click.option(
+    "--env",
+    "-e",
+    required=False,
+    default="local",
+    help="The environment within conf folder we want to retrieve.",
+)
+@click.option(
+    "--experiment",
+    "-x",
+    "experiment_names",
+    multiple=True,
+    help="The name of an experiment to search. Default to the experiment of mlflow.yml. Can be repeated.",
+)
+@click.option(
+    "--filter",
+    "-f",
+    "filters",
+    multiple=True,
+    help='A condition on the runs, e.g. "tags.pipeline_name = \'training\'" or "metrics.rmse < 0.5". Can be repeated.',
+)
+@click.option(
+    "--order-by",
+    "-o",
+    default=None,
+    help="The sort key of the runs, e.g. 'metrics.rmse ASC'. Default to 'attributes.start_time DESC'.",
+)
+@click.option(
+    "--max-results",
+    "-n",
+    type=int,
+    default=None,
+    help="The maximum number of runs. Default to 20 runs displayed, and all the runs exported.",
+)
+@click.option(
+    "--export",
+    "export_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Export the runs with all their metrics, params and tags to a '.csv' or a '.parquet' file.",
+)
+@click.option(
+    "--index-path",
+    type=click.Path(dir_okay=False),
+    default="mlflow_runs_index.db",
+    show_default=True,
+    help="The sqlite file of the local index of the runs.",
+)
+@click.option(
+    "--sync/--no-sync",
+    "sync_index",
+    default=True,
+    help="Should the index be updated with the runs which changed on the tracking server?",
+)
+@click.option(
+    "--full-sync",
+    is_flag=True,
+    default=False,
+    help="Fetch all the runs again, e.g. to catch the tags added to old runs or the deleted runs.",
+)
+def runs(
+    env,
+    experiment_names,
+    filters,
+    order_by,
+    max_results,
+    export_path,
+    index_path,
+    sync_index,
+    full_sync,
+):
+    """Searches the runs in a local index of their metadata, which is
+        updated incrementally from the tracking server, hence searching
+        many runs does not query the tracking server each time.
+
+    """
+    from kedro_mlflow.framework.context import get_mlflow_config
+    from kedro_mlflow.framework.tracking.index import RunsIndex, export_runs
+
+    mlflow_conf = get_mlflow_config(project_path=Path().cwd(), env=env)
+    experiment_names = list(experiment_names) or [mlflow_conf.experiment_opts["name"]]
+    runs_index = RunsIndex(index_path, tracking_uri=mlflow_conf.mlflow_tracking_uri)
+    if sync_index or full_sync:
+        nb_fetched_runs = runs_index.sync(experiment_names, full=full_sync)
+        click.echo(f"{nb_fetched_runs} run(s) fetched from the tracking server")
+
+    try:
+        runs_df = runs_index.search(
+            experiment_names,
+            filters=filters,
+            order_by=order_by,
+            max_results=max_results
+            if max_results is not None or export_path is not None
+            else 20,
+        )
+    except ValueError as error:
+        raise click.UsageError(str(error))
+
+    if export_path is not None:
+        export_runs(runs_df, export_path)
+        click.secho(f"{len(runs_df)} run(s) exported to '{export_path}'", fg="green")
+    else:
+        click.echo(_format_runs(runs_df, filters=filters, order_by=order_by))
+
+
+def _format_runs(runs_df, filters, order_by) -> str:
+    # the keys used in the search and the tags set by kedro-mlflow are displayed
+    if runs_df.empty:
+        return "No run found"
+    columns = ["run_id", "status", "start_time", "tags.pipeline_name"]
+    for column in runs_df.columns:
+        if column not in columns and any(
+            column in string for string in (*filters, order_by or "")
+        ):
+            columns.append(column)
+    columns = [column for column in columns if column in runs_df.columns]
+    return runs_df[columns].to_string(index=False)
+
+
+@mlflow_commands.command(name="export-metrics")
+@click.option(
+    "--env",
+    "-e",
+    required=False,
+    default="local",
+    help="The environment within conf folder we want to retrieve.",
+)
+@click.option(
+    "--experiment",
+    "-x",
+    "experiment_name",
+    default=None,
+    help="The name of the experiment. Default to the experiment of mlflow.yml.",
+)
+@click.option(
+    "--filter",
+    "-f",
+    "filter_string",
+    default="",
+    help="A filter of the runs with the syntax of 'mlflow.search_runs', e.g. \"tags.pipeline_name = 'training'\".",
+)
+@click.option(
+    "--metric",
+    "-m",
+    "metrics",
+    multiple=True,
+    help="The key of a metric to export. Default to all the metrics. Can be repeated.",
+)
+@click.option(
+    "--output",
+    required=True,
+    type=click.Path(file_okay=False),
+    help="The directory of the parquet dataset, partitioned by run id.",
+)
+@click.option(
+    "--max-workers",
+    type=int,
+    default=8,
+    show_default=True,
+    help="The number of runs fetched concurrently.",
+)
+def export_metrics(env, experiment_name, filter_string, metrics, output, max_workers):
+    """Exports the metrics history of all the runs of an experiment
+        in a parquet dataset partitioned by run id, which can be loaded
+        with the MlflowExperimentMetricsDataSet. Only the runs which
+        changed since the previous export are fetched again.
+
+    """
+    from kedro_mlflow.framework.context import get_mlflow_config
+    from kedro_mlflow.io import MlflowExperimentMetricsDataSet
+
+    mlflow_conf = get_mlflow_config(project_path=Path().cwd(), env=env)
+    summary = MlflowExperimentMetricsDataSet(
+        filepath=output,
+        experiment_name=experiment_name or mlflow_conf.experiment_opts["name"],
+        filter_string=filter_string,
+        metrics=list(metrics) or None,
+        max_workers=max_workers,
+        tracking_uri=mlflow_conf.mlflow_tracking_uri,
+    ).export()
+    click.secho(
+        f"{summary['exported']} run(s) exported to '{output}' ({summary['values']} metric values, {summary['unchanged']} run(s) unchanged, {summary['removed']} run(s) removed)",
+        fg="green",
     )
 
 
@@ -5,6 +5,7 @@ from typing import Any, Dict, Union
 import mlflow
 
 from kedro_mlflow import utils as utils
+from kedro_mlflow.framework.tracking.policy import TrackingPolicy, _is_retryable
 
 LOGGER = logging.getLogger(__name__)
 
@@ -15,9 +16,34 @@ class KedroMlflowConfig:
 
     RUN_OPTS = {"id": None, "name": None, "nested": True}
 
-    UI_OPTS = {"port": None, "host": None}
+    UI_OPTS = {"port": None, "host": None, "server": False, "workers": None}
 
-    NODE_HOOK_OPTS = {"flatten_dict_params": False, "recursive": True, "sep": "."}
+    SPOOL_OPTS = {"enabled": False, "path": "mlruns_spool", "sync": None}
+
+    SPOOL_SYNC_MODES = (None, "end_of_run", "background")
+
+    TRACKING_POLICY_OPTS = {
+        "timeout": None,
+        "max_retries": 0,
+        "backoff_factor": 1,
+        "failures_threshold": None,
+    }
+
+    NODE_HOOK_OPTS = {
+        "flatten_dict_params": False,
+        "recursive": True,
+        "sep": ".",
+        "log_performance": False,
+        "profile": [],
+    }
+
+    PIPELINE_HOOK_OPTS = {
+        "skip_unchanged_model": False,
+        "signature_from_persisted_input": False,
+        "log_datasets_performance": False,
+        "log_timeline": False,
+        "resources_sampling_interval": None,
+    }
 
     def __init__(
         self,
@@ -26,7 +52,10 @@ class KedroMlflowConfig:
         experiment_opts: Union[Dict[str, Any], None] = None,
         run_opts: Union[Dict[str, Any], None] = None,
         ui_opts: Union[Dict[str, Any], None] = None,
+        spool_opts: Union[Dict[str, Any], None] = None,
+        tracking_policy_opts: Union[Dict[str, Any], None] = None,
         node_hook_opts: Union[Dict[str, Any], None] = None,
+        pipeline_hook_opts: Union[Dict[str, Any], None] = None,
     ):
 
         # declare attributes in __init__.py to avoid pylint complaining
@@ -42,7 +71,14 @@ class KedroMlflowConfig:
         self.experiment_opts = None
         self.run_opts = None
         self.ui_opts = None
+        self.spool_opts = None
+        self.spool_uri = None
+        self.tracking_policy_opts = None
+        self.tracking_policy = None
+        # True if the tracking server is unavailable and the runs fall back to the spool
+        self.offline = False
         self.node_hook_opts = None
+        self.pipeline_hook_opts = None
         self.mlflow_client = None  # the client to interact with the mlflow database
         self.experiment = (
             None  # the mlflow experiment object to interact directly with it
@@ -56,7 +92,9 @@ class KedroMlflowConfig:
             experiment=experiment_opts,
             run=run_opts,
             ui=ui_opts,
-            hooks=dict(node=node_hook_opts),
+            spool=spool_opts,
+            tracking_policy=tracking_policy_opts,
+            hooks=dict(node=node_hook_opts, pipeline=pipeline_hook_opts),
         )
         self.from_dict(configuration)
 
@@ -83,6 +121,21 @@ class KedroMlflowConfig:
                     {
                         port {int} : the port where the ui must be served
                         host {str} : the host for the ui
+                        server {bool}: Should the ui be served by "mlflow server" instead of "mlflow ui"? Default to False.
+                        workers {int}: The number of workers of "mlflow server". None for the default of mlflow. Default to None.
+                    }
+                spool:
+                    {
+                        enabled {bool}: Should the runs be recorded in a local file store (the spool) instead of the tracking server? They are sent to the tracking server with "kedro mlflow sync". Default to False.
+                        path {str}: The path of the spool, relative to the project root. Default to "mlruns_spool".
+                        sync {str}: Should the spool be synchronized automatically at the end of each run? It can be "end_of_run" (blocking), "background" (in a thread, once the run is ended) or None (only with "kedro mlflow sync"). Default to None.
+                    }
+                tracking_policy:
+                    {
+                        timeout {float}: The maximum duration in seconds of a call to the tracking server, or None to wait indefinitely. Default to None.
+                        max_retries {int}: How many times should a call which failed with a transient error (e.g. a connection error, a timeout or a 503) be retried? Default to 0.
+                        backoff_factor {float}: The retries wait backoff_factor * 2 ** (retry - 1) seconds. Default to 1.
+                        failures_threshold {int}: After how many calls failed in a row should the tracking server not be called anymore during the run? The calls which fail are then written in the spool and sent with "kedro mlflow sync". None to fail the pipeline instead. Default to None.
                     }
                 hooks:
                     {
@@ -91,6 +144,16 @@ class KedroMlflowConfig:
                              flatten_dict_params {bool}: When the parameter is a dict, should we crete several parameters i the dict, one for each entry? This may be necessary beacuase mlflow has a liit size for parameters. Default to False.
                              recursive {bool}: In we flatten dict parameters, should we apply the strategy recusrively in case of nested dicts? Default to True.
                              sep {str}: The separator in case of nested dict flattening {level1:{p1:1, p2:2}} will be logged as level1.p1, level.p2. Default to "."
+                             log_performance {bool}: Should the wall time, the cpu time and the peak memory increase of each node be logged as mlflow metrics, with a summary in "performance/nodes.json"? Default to False.
+                             profile {List[str]}: The names or the tags of the nodes to profile with cProfile. Their profiles are logged in the "profiles" folder of the run. Default to [].
+                            },
+                        pipeline:
+                            {
+                             skip_unchanged_model {bool}: Should the logging of a PipelineML model be skipped when neither its artifacts nor its inference pipeline changed since the last logged model of the experiment? Default to False.
+                             signature_from_persisted_input {bool}: Should the input_name dataset of a PipelineML be loaded to infer the signature of the model when it is persisted? It loads all the data of the dataset. If False, the signature is only inferred when the data is in memory. Default to False.
+                             log_datasets_performance {bool}: Should the time spent to load and save each dataset be logged in a "performance/datasets.csv" table, and as mlflow metrics for the slowest datasets? Default to False.
+                             log_timeline {bool}: Should the start and the end of each node, with the process and the thread where it runs, be logged in a "performance/timeline.json" trace which can be opened in chrome://tracing? Default to False.
+                             resources_sampling_interval {float}: The interval in seconds between two samples of the cpu, memory, disk and network usage, which are logged as mlflow metrics during the run. None to disable the sampling. Default to None.
                             }
                     }
             }
@@ -101,7 +164,10 @@ class KedroMlflowConfig:
         experiment_opts = configuration.get("experiment")
         run_opts = configuration.get("run")
         ui_opts = configuration.get("ui")
+        spool_opts = configuration.get("spool")
+        tracking_policy_opts = configuration.get("tracking_policy")
         node_hook_opts = configuration.get("hooks", {}).get("node")
+        pipeline_hook_opts = configuration.get("hooks", {}).get("pipeline")
 
         self.mlflow_tracking_uri = self._validate_uri(uri=mlflow_tracking_uri)
         self.experiment_opts = _validate_opts(
@@ -109,17 +175,59 @@ class KedroMlflowConfig:
         )
         self.run_opts = _validate_opts(opts=run_opts, default=self.RUN_OPTS)
         self.ui_opts = _validate_opts(opts=ui_opts, default=self.UI_OPTS)
+        if self.ui_opts["workers"] is not None and not self.ui_opts["server"]:
+            raise KedroMlflowConfigError(
+                "'ui.workers' can only be set when 'ui.server' is True: 'mlflow ui' has a single worker"
+            )
+        self.spool_opts = _validate_opts(opts=spool_opts, default=self.SPOOL_OPTS)
+        if self.spool_opts["sync"] not in self.SPOOL_SYNC_MODES:
+            raise KedroMlflowConfigError(
+                f"'spool.sync' must be one of {self.SPOOL_SYNC_MODES}, got '{self.spool_opts['sync']}'"
+            )
+        self.spool_uri = self._validate_uri(uri=self.spool_opts["path"])
+        self.tracking_policy_opts = _validate_opts(
+            opts=tracking_policy_opts, default=self.TRACKING_POLICY_OPTS
+        )
+        self._validate_tracking_policy_opts()
+        self.tracking_policy = TrackingPolicy(
+            **self.tracking_policy_opts, spool_uri=self.spool_uri
+        )
         self.node_hook_opts = _validate_opts(
             opts=node_hook_opts, default=self.NODE_HOOK_OPTS
         )
+        self.pipeline_hook_opts = _validate_opts(
+            opts=pipeline_hook_opts, default=self.PIPELINE_HOOK_OPTS
+        )
+        interval = self.pipeline_hook_opts["resources_sampling_interval"]
+        if interval is not None and not (
+            isinstance(interval, (int, float)) and interval > 0
+        ):
+            raise KedroMlflowConfigError(
+                f"'hooks.pipeline.resources_sampling_interval' must be a positive number or None, got '{interval}'"
+            )
 
         # instantiate mlflow objects to interact with the database
         # the client must not be create dbefore carefully checking the uri,
         # otherwise mlflow creates a mlruns folder to the current location
+        self.offline = False
         self.mlflow_client = mlflow.tracking.MlflowClient(
-            tracking_uri=self.mlflow_tracking_uri
+            tracking_uri=self.runs_tracking_uri
         )
-        self._get_or_create_experiment()
+        try:
+            self.tracking_policy.execute(self._get_or_create_experiment)
+        except Exception as error:
+            if self.spool_opts["enabled"] or not (
+                self.tracking_policy.fallback_to_spool and _is_retryable(error)
+            ):
+                raise
+            LOGGER.warning(
+                f"The tracking server '{self.mlflow_tracking_uri}' is unavailable ({error}), the runs are recorded in the spool '{self.spool_uri}'. Run 'kedro mlflow sync' to send them later."
+            )
+            self.offline = True
+            self.mlflow_client = mlflow.tracking.MlflowClient(
+                tracking_uri=self.runs_tracking_uri
+            )
+            self._get_or_create_experiment()
 
     def to_dict(self):
         """Retrieve all the attributes needed to setup the config
@@ -144,10 +252,44 @@ class KedroMlflowConfig:
             "experiments": self.experiment_opts,
             "run": self.run_opts,
             "ui": self.ui_opts,
-            "hooks": {"node": self.node_hook_opts},
+            "spool": self.spool_opts,
+            "tracking_policy": self.tracking_policy_opts,
+            "hooks": {"node": self.node_hook_opts, "pipeline": self.pipeline_hook_opts},
         }
         return info
 
+    @property
+    def runs_tracking_uri(self) -> str:
+        """The uri where the runs are recorded: the local spool
+        when it is enabled or when the tracking server is unavailable,
+        the ``mlflow_tracking_uri`` otherwise.
+        """
+        if self.spool_opts["enabled"] or self.offline:
+            return self.spool_uri
+        return self.mlflow_tracking_uri
+
+    def _validate_tracking_policy_opts(self) -> None:
+        opts = self.tracking_policy_opts
+        if opts["timeout"] is not None and not opts["timeout"] > 0:
+            raise KedroMlflowConfigError(
+                f"'tracking_policy.timeout' must be a positive number or None, got '{opts['timeout']}'"
+            )
+        if not isinstance(opts["max_retries"], int) or opts["max_retries"] < 0:
+            raise KedroMlflowConfigError(
+                f"'tracking_policy.max_retries' must be a non negative integer, got '{opts['max_retries']}'"
+            )
+        if not opts["backoff_factor"] >= 0:
+            raise KedroMlflowConfigError(
+                f"'tracking_policy.backoff_factor' must be a non negative number, got '{opts['backoff_factor']}'"
+            )
+        if opts["failures_threshold"] is not None and (
+            not isinstance(opts["failures_threshold"], int)
+            or opts["failures_threshold"] < 1
+        ):
+            raise KedroMlflowConfigError(
+                f"'tracking_policy.failures_threshold' must be a positive integer or None, got '{opts['failures_threshold']}'"
+            )
+
     def _get_or_create_experiment(self) -> mlflow.entities.Experiment:
         """Best effort to get the experiment associated
         to the configuration
@@ -0,0 +1,161 @@
+import csv
+import threading
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Callable, Dict, List, Optional
+
+import mlflow
+from kedro.io import AbstractTransformer, AbstractVersionedDataSet, DataCatalog
+from mlflow.entities import Metric
+
+from kedro_mlflow.framework.hooks.node_hook import _sanitize_metric_key
+from kedro_mlflow.framework.tracking.policy import get_tracking_policy
+
+# only the datasets which take the most time are logged as metrics,
+# all of them are in the table artifact
+TOP_DATASETS_METRICS = 10
+
+DATASETS_PERFORMANCE_COLUMNS = [
+    "dataset",
+    "load_count",
+    "load_time_s",
+    "save_count",
+    "save_time_s",
+    "size_bytes",
+]
+
+
+class DatasetsPerformanceTransformer(AbstractTransformer):
+    """Measure the time spent to load and save each dataset of a catalog.
+
+    kedro 0.16 has no hook around the datasets loading and saving,
+    so the measures are made by a transformer added to all the datasets
+    of the catalog. It is only added when the datasets performance
+    is logged, so there is no overhead at all otherwise.
+    """
+
+    def __init__(self):
+        self.catalog = None
+        self.records = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # the catalog and its transformers are pickled by the ParallelRunner:
+        # the datasets loaded in the subprocesses are timed but not recorded
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def instrument(self, catalog: DataCatalog) -> None:
+        self.catalog = catalog
+        self.records = {}
+        # the transformer is also added to the datasets created during
+        # the run (e.g. the MemoryDataSets of the intermediary outputs)
+        catalog.add_transformer(self)
+
+    def restore(self) -> None:
+        if self.catalog is not None:
+            for transformers in self.catalog._transformers.values():
+                if self in transformers:
+                    transformers.remove(self)
+            if self in self.catalog._default_transformers:
+                self.catalog._default_transformers.remove(self)
+
+    def load(self, data_set_name: str, load: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return load()
+        finally:
+            self.record("load", data_set_name, time.perf_counter() - start)
+
+    def save(self, data_set_name: str, save: Callable[[Any], None], data: Any) -> None:
+        start = time.perf_counter()
+        try:
+            save(data)
+        finally:
+            self.record("save", data_set_name, time.perf_counter() - start)
+
+    def record(self, operation: str, name: str, duration: float) -> None:
+        # the datasets may be loaded and saved in threads
+        # (ThreadRunner or "async" mode)
+        with self._lock:
+            record = self.records.setdefault(
+                name, dict(load_count=0, load_time_s=0.0, save_count=0, save_time_s=0.0)
+            )
+            record[f"{operation}_count"] += 1
+            record[f"{operation}_time_s"] += duration
+
+    def summarize(self) -> List[Dict[str, Any]]:
+        summary = [
+            dict(
+                dataset=name,
+                size_bytes=_get_dataset_size(self.catalog._data_sets.get(name)),
+                **record,
+            )
+            for name, record in self.records.items()
+        ]
+        # the datasets which take the most time first since they are the bottlenecks
+        return sorted(
+            summary, key=lambda x: x["load_time_s"] + x["save_time_s"], reverse=True
+        )
+
+    def log(self) -> None:
+        """Log the performance of the datasets in the active mlflow run:
+        a "performance/datasets.csv" table with all the datasets, and
+        metrics for the ones which take the most time.
+        """
+        summary = self.summarize()
+        self.records = {}
+        if not summary or mlflow.active_run() is None:
+            return
+
+        timestamp = int(time.time() * 1000)
+        metrics = [
+            Metric(
+                key=f"dataset.{_sanitize_metric_key(row['dataset'])}.{measure}",
+                value=row[measure],
+                timestamp=timestamp,
+                step=0,
+            )
+            for row in summary[:TOP_DATASETS_METRICS]
+            for measure in ("load_time_s", "save_time_s", "size_bytes")
+            if row[measure] is not None
+        ]
+        run_id = mlflow.active_run().info.run_id
+        policy = get_tracking_policy()
+        policy.log_batch(run_id, metrics=metrics)
+
+        with TemporaryDirectory() as tmp_dir:
+            table_path = Path(tmp_dir) / "datasets.csv"
+            with open(table_path, mode="w", newline="") as file_handler:
+                writer = csv.DictWriter(file_handler, DATASETS_PERFORMANCE_COLUMNS)
+                writer.writeheader()
+                writer.writerows(summary)
+            policy.call(
+                "log_artifact",
+                run_id=run_id,
+                local_path=table_path,
+                artifact_path="performance",
+            )
+
+
+def _get_dataset_size(data_set) -> Optional[int]:
+    """Best effort to get the size in bytes of the local
+    file (or folder) of a dataset.
+    """
+    filepath = getattr(data_set, "_filepath", None)
+    if filepath is None or getattr(data_set, "_protocol", "file") != "file":
+        return None
+    try:
+        if isinstance(data_set, AbstractVersionedDataSet):
+            filepath = data_set._get_load_path()
+        path = Path(str(filepath))
+        if path.is_dir():
+            return sum(
+                file.stat().st_size for file in path.rglob("*") if file.is_file()
+            )
+        return path.stat().st_size
+    except Exception:  # e.g. the dataset was not saved
+        return None
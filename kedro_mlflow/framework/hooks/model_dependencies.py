@@ -0,0 +1,145 @@
+import functools
+import inspect
+import json
+import sys
+import types
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+import pkg_resources
+from kedro.io import DataCatalog
+
+from kedro_mlflow.pipeline.pipeline_ml import PipelineML
+
+
+def _get_inference_dependencies(
+    pipeline: PipelineML, catalog: Optional[DataCatalog] = None
+) -> List[str]:
+    """Retrieve the installed distributions which are needed to
+    load the model of a ``PipelineML`` and run its inference pipeline,
+    pinned to their exact version.
+
+    The distributions are the ones which provide:
+        - the modules where the functions of the inference nodes
+        are defined, and the modules of the global objects these
+        functions refer to (recursively for the functions),
+        - the modules where the classes of the artifacts datasets
+        are defined, and the modules these modules import,
+        - ``kedro-mlflow``, ``kedro`` and ``mlflow`` which are needed
+        to load the model.
+    Modules which are not provided by an installed distribution
+    (e.g. the standard library) are ignored.
+
+    Arguments:
+        pipeline {PipelineML} -- The pipeline whose model is logged.
+
+    Keyword Arguments:
+        catalog {Optional[DataCatalog]} -- The catalog of the pipeline.
+            If provided, the modules of the artifacts datasets are
+            analyzed too. (default: {None})
+
+    Returns:
+        List[str] -- The pinned requirements, e.g. ["pandas==1.0.5", ...]
+    """
+    modules_names = {"kedro_mlflow", "kedro", "mlflow"}
+    for inference in pipeline.inference_pipelines.values():
+        for node in inference.nodes:
+            modules_names.update(_get_function_modules(node._func))
+
+    if catalog is not None:
+        artifacts_names = pipeline._get_inference_inputs() - {pipeline.input_name}
+        for name in artifacts_names & set(catalog._data_sets):
+            module = sys.modules.get(type(catalog._data_sets[name]).__module__)
+            if module is not None:
+                modules_names.add(module.__name__)
+                modules_names.update(
+                    obj.__name__
+                    for obj in vars(module).values()
+                    if isinstance(obj, types.ModuleType)
+                )
+
+    distributions_by_module = _get_distributions_by_module()
+    dependencies = {
+        distributions_by_module[module_name.split(".")[0]]
+        for module_name in modules_names
+        if module_name.split(".")[0] in distributions_by_module
+    }
+    return sorted(dependencies)
+
+
+def _get_function_modules(func: Callable) -> Set[str]:
+    """Retrieve the names of the modules a function needs: the module
+    where it is defined and the modules of the global objects
+    it refers to. The functions defined in the same package which
+    are referred to are analyzed recursively.
+    """
+    modules_names = set()
+    visited = set()
+    to_visit = [func]
+    while to_visit:
+        current_func = inspect.unwrap(to_visit.pop())
+        if isinstance(current_func, functools.partial):
+            current_func = current_func.func
+        if id(current_func) in visited:
+            continue
+        visited.add(id(current_func))
+
+        module = inspect.getmodule(current_func)
+        if module is None:
+            continue
+        modules_names.add(module.__name__)
+        try:
+            global_vars = inspect.getclosurevars(current_func).globals
+        except TypeError:
+            # builtins and callable objects have no code to analyze
+            continue
+        for obj in global_vars.values():
+            if isinstance(obj, types.ModuleType):
+                modules_names.add(obj.__name__)
+            elif inspect.isfunction(obj) and (
+                obj.__module__.split(".")[0] == module.__name__.split(".")[0]
+            ):
+                to_visit.append(obj)
+            elif getattr(obj, "__module__", None):
+                modules_names.add(obj.__module__)
+    return modules_names
+
+
+def _get_distributions_by_module() -> Dict[str, str]:
+    """Map the top level modules to the installed distributions
+    which provide them, pinned to their exact version.
+
+    The distributions installed in editable mode or from a local
+    folder (e.g. the package of the kedro project) are ignored:
+    their pinned version cannot be installed from a package index.
+
+    Returns:
+        Dict[str, str] -- e.g. {"sklearn": "scikit-learn==0.23.1", ...}
+    """
+    distributions_by_module = {}
+    for distribution in pkg_resources.working_set:
+        if _is_local_distribution(distribution):
+            continue
+        requirement = f"{distribution.project_name}=={distribution.version}"
+        if distribution.has_metadata("top_level.txt"):
+            modules_names = distribution.get_metadata_lines("top_level.txt")
+        else:
+            modules_names = [distribution.project_name.replace("-", "_")]
+        for module_name in modules_names:
+            distributions_by_module[module_name] = requirement
+    return distributions_by_module
+
+
+def _is_local_distribution(distribution: pkg_resources.Distribution) -> bool:
+    # "setup.py develop" (and "pip install -e" before pip 21.3) installs are
+    # found through an egg-link, and pip records when a distribution is
+    # installed from a folder (PEP 610)
+    if any(
+        (Path(path) / f"{distribution.project_name}.egg-link").is_file()
+        for path in sys.path
+    ):
+        return True
+    if distribution.has_metadata("direct_url.json"):
+        direct_url = json.loads(distribution.get_metadata("direct_url.json"))
+        return "dir_info" in direct_url
+    return False
@@ -0,0 +1,100 @@
+import hashlib
+import inspect
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import mlflow
+from mlflow.tracking import MlflowClient
+
+from kedro_mlflow.pipeline.pipeline_ml import PipelineML
+
+# size of the chunks read when hashing the artifacts files
+CHUNK_SIZE = 2 ** 20
+
+
+def _compute_model_fingerprint(
+    pipeline: PipelineML, artifacts: Dict[str, str], conda_env: Dict[str, Any]
+) -> str:
+    """Compute a hash which identifies the model which would be logged
+    for a ``PipelineML``. It relies on the content of the artifacts
+    files, on the structure and source code of the inference nodes
+    and on the conda environment of the model.
+
+    The modification time of the artifacts is not used on purpose:
+    the artifacts are always saved again when a ``PipelineML`` is run
+    (they must be outputs of its training pipeline), even if
+    their content is unchanged.
+
+    Arguments:
+        pipeline {PipelineML} -- The pipeline whose model is logged.
+        artifacts {Dict[str, str]} -- The uris of the artifacts of the model
+            (i.e. the output of ``pipeline.extract_pipeline_artifacts``).
+        conda_env {Dict[str, Any]} -- The conda environment of the model.
+
+    Returns:
+        str -- The fingerprint of the model.
+    """
+
+    def describe_node(node):
+        try:
+            source = inspect.getsource(node._func)
+        except (OSError, TypeError):
+            # e.g. functools.partial or function defined interactively
+            source = ""
+        return [str(node), hashlib.sha1(source.encode()).hexdigest()]
+
+    def hash_file(filepath):
+        hasher = hashlib.sha1()
+        with open(filepath, mode="rb") as file_handler:
+            for chunk in iter(lambda: file_handler.read(CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def describe_artifact(uri):
+        path = Path(url2pathname(urlparse(uri).path))
+        files = sorted(path.rglob("*")) if path.is_dir() else [path]
+        return [
+            [file.relative_to(path).as_posix(), file.stat().st_size, hash_file(file)]
+            for file in files
+            if file.is_file()
+        ]
+
+    description = dict(
+        model_name=pipeline.model_name,
+        input_name=pipeline.input_name,
+        inference={
+            inference_name: sorted(describe_node(node) for node in inference.nodes)
+            for inference_name, inference in pipeline.inference_pipelines.items()
+        },
+        artifacts={name: describe_artifact(uri) for name, uri in artifacts.items()},
+        conda_env=conda_env,
+    )
+    return hashlib.sha1(
+        json.dumps(description, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _get_logged_model_uri(model_fingerprint: str, model_name: str) -> Optional[str]:
+    """Retrieve the uri of the last model logged with the given
+    fingerprint in the experiment of the active run.
+
+    Arguments:
+        model_fingerprint {str} -- The fingerprint of the model.
+        model_name {str} -- The artifact path of the model in the run.
+
+    Returns:
+        Optional[str] -- The uri of the model, or None if no run of the experiment
+            has logged this model.
+    """
+    runs = MlflowClient().search_runs(
+        experiment_ids=[mlflow.active_run().info.experiment_id],
+        filter_string=f"tags.model_fingerprint = '{model_fingerprint}'",
+        max_results=1,
+        order_by=["attribute.start_time DESC"],
+    )
+    if len(runs) == 0:
+        return None
+    return f"runs:/{runs[0].info.run_id}/{model_name}"
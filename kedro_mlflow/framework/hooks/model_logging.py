@@ -0,0 +1,126 @@
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import mlflow
+import pandas as pd
+from mlflow.exceptions import MlflowException
+from mlflow.models import Model
+from mlflow.models.signature import ModelSignature
+from mlflow.tracking import MlflowClient
+
+from kedro_mlflow.mlflow import KedroPipelineModel
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _log_model(
+    artifact_path: str,
+    python_model: KedroPipelineModel,
+    artifacts: Dict[str, str],
+    conda_env: Dict[str, Any],
+    signature: Optional[ModelSignature] = None,
+    input_example: Optional[pd.DataFrame] = None,
+) -> None:
+    """Log a ``KedroPipelineModel`` as a mlflow model in the active run.
+
+    This is equivalent to ``mlflow.pyfunc.log_model``, but the files
+    of the model (which are mostly its artifacts) are uploaded in parallel
+    instead of one after the other. The model folder is created
+    by ``mlflow.pyfunc.save_model``.
+
+    Arguments:
+        artifact_path {str} -- The run relative path of the model.
+        python_model {KedroPipelineModel} -- The model to log.
+        artifacts {Dict[str, str]} -- The uris of the local artifacts of the model.
+        conda_env {Dict[str, Any]} -- The conda environment of the model.
+
+    Keyword Arguments:
+        signature {Optional[ModelSignature]} -- The signature of the model (default: {None})
+        input_example {Optional[pd.DataFrame]} -- An example of input (default: {None})
+    """
+    _check_artifacts_basenames(artifacts)
+    run_id = mlflow.active_run().info.run_id
+    mlflow_model = Model(artifact_path=artifact_path, run_id=run_id)
+    with TemporaryDirectory() as tmp_dir:
+        local_path = Path(tmp_dir) / "model"
+        mlflow.pyfunc.save_model(
+            path=local_path.as_posix(),
+            python_model=python_model,
+            artifacts=artifacts,
+            conda_env=conda_env,
+            mlflow_model=mlflow_model,
+            signature=signature,
+            input_example=input_example,
+        )
+        _log_artifacts_in_parallel(
+            run_id=run_id, local_dir=local_path, artifact_path=artifact_path
+        )
+
+    try:
+        # there is no public function to record the model in the run
+        # metadata, which mlflow.pyfunc.log_model does after the upload
+        mlflow.tracking.fluent._record_logged_model(mlflow_model)
+    except (AttributeError, MlflowException):
+        # old tracking servers cannot record model metadata
+        # the model is logged anyway, as with mlflow.pyfunc.log_model
+        LOGGER.warning(
+            "Logging model metadata to the tracking server has failed. The model artifacts have been logged successfully."
+        )
+
+
+def _check_artifacts_basenames(artifacts: Dict[str, str]) -> None:
+    """Raise an error if several artifacts have the same file name:
+    mlflow stores all the artifacts of a model in the same folder,
+    hence they would overwrite each other.
+
+    Arguments:
+        artifacts {Dict[str, str]} -- The uris of the local artifacts of the model.
+    """
+    names_by_basename = {}
+    for name, uri in artifacts.items():
+        basename = Path(url2pathname(urlparse(uri).path)).name
+        names_by_basename.setdefault(basename, []).append(name)
+    collisions = {
+        basename: names
+        for basename, names in names_by_basename.items()
+        if len(names) > 1
+    }
+    if collisions:
+        raise ValueError(
+            f"The artifacts of a model must have different file names, but several artifacts have the same: {collisions}"
+        )
+
+
+def _log_artifacts_in_parallel(
+    run_id: str, local_dir: Path, artifact_path: str
+) -> None:
+    """Log all the files of a local folder in a run,
+    with one upload per thread.
+
+    Arguments:
+        run_id {str} -- The id of the run.
+        local_dir {Path} -- The folder to log.
+        artifact_path {str} -- The run relative path where the folder is logged.
+    """
+    client = MlflowClient()
+
+    def log_file(local_file):
+        relative_dir = local_file.parent.relative_to(local_dir).as_posix()
+        client.log_artifact(
+            run_id=run_id,
+            local_path=local_file.as_posix(),
+            artifact_path=artifact_path
+            if relative_dir == "."
+            else posixpath.join(artifact_path, relative_dir),
+        )
+
+    local_files = [path for path in local_dir.rglob("*") if path.is_file()]
+    with ThreadPoolExecutor() as executor:
+        # list() forces to raise the exceptions of the threads
+        list(executor.map(log_file, local_files))
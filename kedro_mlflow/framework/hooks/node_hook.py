@@ -1,11 +1,32 @@
-from typing import Any, Dict
+import cProfile
+import io
+import json
+import pstats
+import re
+import sys
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List
 
 import mlflow
 from kedro.framework.hooks import hook_impl
 from kedro.io import DataCatalog
+from kedro.pipeline import Pipeline
 from kedro.pipeline.node import Node
+from mlflow.entities import Metric, Param
 
 from kedro_mlflow.framework.context import get_mlflow_config
+from kedro_mlflow.framework.tracking.policy import get_tracking_policy
+
+# the number of functions displayed in the text reports of the profiles
+PROFILE_REPORT_SIZE = 50
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    # the module is not available on Windows
+    resource = None
 
 
 class MlflowNodeHook:
@@ -16,6 +37,11 @@ class MlflowNodeHook:
         self.flatten = config.node_hook_opts["flatten_dict_params"]
         self.recursive = config.node_hook_opts["recursive"]
         self.sep = config.node_hook_opts["sep"]
+        self.log_performance = config.node_hook_opts["log_performance"]
+        self.profile = set(config.node_hook_opts["profile"] or [])
+        self._nodes_starts = {}
+        self._nodes_performance = {}
+        self._nodes_profilers = {}
 
     @hook_impl
     def before_node_run(
@@ -50,13 +76,222 @@ class MlflowNodeHook:
                 d=params_inputs, recursive=self.recursive, sep=self.sep
             )
 
-        mlflow.log_params(params_inputs)
+        if params_inputs:
+            run = mlflow.active_run() or mlflow.start_run()
+            get_tracking_policy().log_batch(
+                run.info.run_id,
+                params=[Param(k, str(v)) for k, v in params_inputs.items()],
+            )
+
+        # the measures start as late as possible to exclude the hook itself
+        if self.log_performance:
+            self._nodes_starts[node.name] = _measure()
+        if self.profile & (node.tags | {node.name, node.short_name}):
+            profiler = cProfile.Profile()
+            self._nodes_profilers[node.name] = profiler
+            profiler.enable()
+
+    @hook_impl
+    def after_node_run(
+        self,
+        node: Node,
+        catalog: DataCatalog,
+        inputs: Dict[str, Any],
+        outputs: Dict[str, Any],
+        is_async: bool,
+        run_id: str,
+    ) -> None:
+        """Hook to be invoked after a node runs.
+        This hook stores the performance of the node,
+        which are logged at the end of the pipeline,
+        and logs the profile of the node if it is profiled.
+        Args:
+            node: The ``Node`` that ran.
+            catalog: A ``DataCatalog`` containing the node's inputs and outputs.
+            inputs: The dictionary of inputs dataset.
+            outputs: The dictionary of outputs dataset.
+            is_async: Whether the node was run in ``async`` mode.
+            run_id: The id of the run.
+        """
+        # the measures end before the profile is logged
+        start = self._nodes_starts.pop(node.name, None)
+        if start is not None:
+            end = _measure()
+            self._nodes_performance[node.name] = dict(
+                timestamp=int(time.time() * 1000),
+                duration_s=end["wall_time"] - start["wall_time"],
+                cpu_time_s=end["cpu_time"] - start["cpu_time"],
+                max_rss_delta_mb=end["max_rss_mb"] - start["max_rss_mb"],
+            )
+        self._log_node_profile(node)
+
+    @hook_impl
+    def on_node_error(
+        self,
+        error: Exception,
+        node: Node,
+        catalog: DataCatalog,
+        inputs: Dict[str, Any],
+        is_async: bool,
+        run_id: str,
+    ):
+        """Hook to be invoked if a node run throws an uncaught error.
+        The profile of the node is logged, if any, since it is
+        useful to investigate the failure.
+        Args:
+            error: The uncaught exception thrown during the node run.
+            node: The ``Node`` that failed.
+            catalog: A ``DataCatalog`` containing the node's inputs and outputs.
+            inputs: The dictionary of inputs dataset.
+            is_async: Whether the node was run in ``async`` mode.
+            run_id: The id of the run.
+        """
+        self._log_node_profile(node)
+
+    def _log_node_profile(self, node: Node) -> None:
+        profiler = self._nodes_profilers.pop(node.name, None)
+        if profiler is None:
+            return
+        profiler.disable()
+
+        # the raw profile can be explored with any pstats
+        # compatible tool (snakeviz, flameprof, gprof2dot...) and
+        # a text report is logged to be read directly in the mlflow ui
+        file_name = _sanitize_metric_key(node.name)
+        with TemporaryDirectory() as tmp_dir:
+            stats_path = Path(tmp_dir) / f"{file_name}.pstats"
+            profiler.dump_stats(str(stats_path))
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(
+                PROFILE_REPORT_SIZE
+            )
+            report_path = Path(tmp_dir) / f"{file_name}.txt"
+            report_path.write_text(report.getvalue())
+            get_tracking_policy().call(
+                "log_artifacts",
+                run_id=mlflow.active_run().info.run_id,
+                local_dir=tmp_dir,
+                artifact_path="profiles",
+            )
+
+    # the performance must be logged before
+    # the MlflowPipelineHook ends the mlflow run
+    @hook_impl(tryfirst=True)
+    def after_pipeline_run(
+        self, run_params: Dict[str, Any], pipeline: Pipeline, catalog: DataCatalog
+    ) -> None:
+        """Hook to be invoked after a pipeline runs.
+        This hook logs the performance of the nodes in mlflow.
+        Args:
+            run_params: The params needed for the given run.
+            pipeline: The ``Pipeline`` that was run.
+            catalog: The ``DataCatalog`` used during the run.
+        """
+        self._log_nodes_performance()
+
+    @hook_impl(tryfirst=True)
+    def on_pipeline_error(
+        self,
+        error: Exception,
+        run_params: Dict[str, Any],
+        pipeline: Pipeline,
+        catalog: DataCatalog,
+    ):
+        """Hook invoked when the pipeline execution fails.
+        The performance of the nodes which succeeded are logged
+        in mlflow, since they are useful to investigate the failure.
+        Args:
+            error: The uncaught exception thrown during the pipeline run.
+            run_params: The params needed for the given run.
+            pipeline: The ``Pipeline`` that was run.
+            catalog: The ``DataCatalog`` used during the run.
+        """
+        self._log_nodes_performance()
+
+    def _log_nodes_performance(self) -> None:
+        nodes_performance = self._nodes_performance
+        self._nodes_starts = {}
+        self._nodes_performance = {}
+        if not nodes_performance or mlflow.active_run() is None:
+            return
+
+        # all the metrics are sent in a few requests instead of one per metric
+        metrics = [
+            Metric(
+                key=f"node.{_sanitize_metric_key(node_name)}.{measure}",
+                value=value,
+                timestamp=performance["timestamp"],
+                step=0,
+            )
+            for node_name, performance in nodes_performance.items()
+            for measure, value in performance.items()
+            if measure != "timestamp"
+        ]
+        run_id = mlflow.active_run().info.run_id
+        policy = get_tracking_policy()
+        policy.log_batch(run_id, metrics=metrics)
+
+        summary = _summarize_nodes_performance(nodes_performance)
+        with TemporaryDirectory() as tmp_dir:
+            summary_path = Path(tmp_dir) / "nodes.json"
+            with open(summary_path, mode="w") as file_handler:
+                json.dump(summary, file_handler, indent=2)
+            policy.call(
+                "log_artifact",
+                run_id=run_id,
+                local_path=summary_path,
+                artifact_path="performance",
+            )
+
+
+def _measure() -> Dict[str, float]:
+    # the peak resident memory is the only memory measure
+    # which is available without extra dependency. Its increase
+    # during a node shows how much the node raised the memory peak
+    max_rss_mb = 0.0
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+        max_rss_mb = (
+            max_rss / 2 ** 20 if sys.platform == "darwin" else max_rss / 2 ** 10
+        )
+    return dict(
+        wall_time=time.perf_counter(),
+        cpu_time=time.process_time(),
+        max_rss_mb=max_rss_mb,
+    )
+
+
+def _sanitize_metric_key(name: str) -> str:
+    # kedro node names contain characters which are not
+    # allowed in mlflow keys (e.g. "predict([model,data]) -> [predictions]")
+    return re.sub(r"[^\w\-.]+", "_", name).strip("_")
+
+
+def _summarize_nodes_performance(
+    nodes_performance: Dict[str, Dict[str, float]]
+) -> List[Dict[str, Any]]:
+    total_duration = sum(perf["duration_s"] for perf in nodes_performance.values())
+    summary = [
+        dict(
+            node=node_name,
+            duration_s=perf["duration_s"],
+            duration_share=perf["duration_s"] / total_duration
+            if total_duration
+            else 0.0,
+            cpu_time_s=perf["cpu_time_s"],
+            max_rss_delta_mb=perf["max_rss_delta_mb"],
+        )
+        for node_name, perf in nodes_performance.items()
+    ]
+    # the slowest nodes first since they are the bottlenecks
+    return sorted(summary, key=lambda x: x["duration_s"], reverse=True)
 
 
 def flatten_dict(d, recursive: bool = True, sep="."):
     def expand(key, value):
         if isinstance(value, dict):
-            new_value = flatten_dict(value) if recursive else value
+            new_value = flatten_dict(value, sep=sep) if recursive else value
             return [(key + sep + k, v) for k, v in new_value.items()]
         else:
             return [(key, value)]
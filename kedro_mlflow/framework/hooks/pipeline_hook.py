@@ -1,22 +1,64 @@
+import logging
 import sys
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
 import mlflow
+import pandas as pd
 import yaml
 from kedro.framework.hooks import hook_impl
-from kedro.io import DataCatalog
+from kedro.io import DataCatalog, MemoryDataSet
 from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
 from kedro.versioning.journal import _git_sha
+from mlflow.entities import RunTag
+from mlflow.models.signature import ModelSignature, infer_signature
 
 from kedro_mlflow.framework.context import get_mlflow_config
+from kedro_mlflow.framework.context.config import KedroMlflowConfig
+from kedro_mlflow.framework.hooks.datasets_performance import (
+    DatasetsPerformanceTransformer,
+)
+from kedro_mlflow.framework.hooks.model_dependencies import _get_inference_dependencies
+from kedro_mlflow.framework.hooks.model_fingerprint import (
+    _compute_model_fingerprint,
+    _get_logged_model_uri,
+)
+from kedro_mlflow.framework.hooks.model_logging import _log_model
+from kedro_mlflow.framework.hooks.resources_sampler import ResourcesSampler
+from kedro_mlflow.framework.hooks.timeline import (
+    NodesTimeline,
+    _record_node_end,
+    _record_node_start,
+)
+from kedro_mlflow.framework.tracking.policy import (
+    TrackingPolicy,
+    get_tracking_policy,
+    set_tracking_policy,
+)
+from kedro_mlflow.framework.tracking.spool import start_background_sync, sync_spool
 from kedro_mlflow.io import MlflowMetricsDataSet
 from kedro_mlflow.mlflow import KedroPipelineModel
 from kedro_mlflow.pipeline.pipeline_ml import PipelineML
 from kedro_mlflow.utils import _parse_requirements
 
+LOGGER = logging.getLogger(__name__)
+
+# number of rows of the input data used to infer the model signature
+SIGNATURE_SAMPLE_SIZE = 5
+
 
 class MlflowPipelineHook:
+    def __init__(self):
+        # the options are retrieved from the mlflow.yml
+        # of the project when the pipeline is run
+        self.pipeline_hook_opts = KedroMlflowConfig.PIPELINE_HOOK_OPTS.copy()
+        self.datasets_performance_transformer = None
+        self.nodes_timeline = None
+        self.resources_sampler = None
+        # the spool to synchronize at the end of the run, if any
+        self.spool_sync = None
+
     @hook_impl
     def after_catalog_created(
         self,
@@ -65,7 +107,21 @@ class MlflowPipelineHook:
         mlflow_conf = get_mlflow_config(
             project_path=run_params["project_path"], env=run_params["env"]
         )
-        mlflow.set_tracking_uri(mlflow_conf.mlflow_tracking_uri)
+        # the runs are recorded in the local spool in offline mode
+        mlflow.set_tracking_uri(mlflow_conf.runs_tracking_uri)
+        # the calls to the tracking server of the hooks and the
+        # datasets during the run go through this policy
+        set_tracking_policy(mlflow_conf.tracking_policy)
+        self.pipeline_hook_opts = mlflow_conf.pipeline_hook_opts
+        self.spool_sync = (
+            dict(
+                mode=mlflow_conf.spool_opts["sync"],
+                spool_uri=mlflow_conf.spool_uri,
+                tracking_uri=mlflow_conf.mlflow_tracking_uri,
+            )
+            if mlflow_conf.spool_opts["enabled"] and mlflow_conf.spool_opts["sync"]
+            else None
+        )
         # TODO : if the pipeline fails, we need to be able to end stop the mlflow run
         # cannot figure out how to do this within hooks
         run_name = (
@@ -73,30 +129,72 @@ class MlflowPipelineHook:
             if mlflow_conf.run_opts["name"] is not None
             else run_params["pipeline_name"]
         )
-        mlflow.start_run(
+        policy = get_tracking_policy()
+        run = policy.execute(
+            mlflow.start_run,
             run_id=mlflow_conf.run_opts["id"],
             experiment_id=mlflow_conf.experiment.experiment_id,
             run_name=run_name,
             nested=mlflow_conf.run_opts["nested"],
         )
         # Set tags only for run parameters that have values.
-        mlflow.set_tags({k: v for k, v in run_params.items() if v})
+        tags = {k: v for k, v in run_params.items() if v}
         # add manually git sha for consistency with the journal
         # TODO : this does not take into account not committed files, so it
         # does not ensure reproducibility. Define what to do.
-        mlflow.set_tag("git_sha", _git_sha(run_params["project_path"]))
-        mlflow.set_tag(
-            "kedro_command",
-            _generate_kedro_command(
-                tags=run_params["tags"],
-                node_names=run_params["node_names"],
-                from_nodes=run_params["from_nodes"],
-                to_nodes=run_params["to_nodes"],
-                from_inputs=run_params["from_inputs"],
-                load_versions=run_params["load_versions"],
-                pipeline_name=run_params["pipeline_name"],
-            ),
+        tags["git_sha"] = _git_sha(run_params["project_path"])
+        tags["kedro_command"] = _generate_kedro_command(
+            tags=run_params["tags"],
+            node_names=run_params["node_names"],
+            from_nodes=run_params["from_nodes"],
+            to_nodes=run_params["to_nodes"],
+            from_inputs=run_params["from_inputs"],
+            load_versions=run_params["load_versions"],
+            pipeline_name=run_params["pipeline_name"],
+        )
+        # all the tags are sent in a single call
+        policy.log_batch(
+            run.info.run_id, tags=[RunTag(k, str(v)) for k, v in tags.items()]
         )
+        if self.pipeline_hook_opts["log_datasets_performance"]:
+            self.datasets_performance_transformer = DatasetsPerformanceTransformer()
+            self.datasets_performance_transformer.instrument(catalog)
+        if self.pipeline_hook_opts["log_timeline"]:
+            self.nodes_timeline = NodesTimeline()
+            self.nodes_timeline.start()
+        if self.pipeline_hook_opts["resources_sampling_interval"]:
+            self.resources_sampler = ResourcesSampler(
+                interval=self.pipeline_hook_opts["resources_sampling_interval"]
+            )
+            self.resources_sampler.start()
+
+    @hook_impl
+    def before_node_run(self, node: Node) -> None:
+        """Hook to be invoked before a node runs.
+        This hook records the start of the node for the timeline of the run.
+        Args:
+            node: The ``Node`` to run.
+        """
+        _record_node_start(node)
+
+    @hook_impl
+    def after_node_run(self, node: Node) -> None:
+        """Hook to be invoked after a node runs.
+        This hook records the end of the node for the timeline of the run.
+        Args:
+            node: The ``Node`` that ran.
+        """
+        _record_node_end(node)
+
+    @hook_impl
+    def on_node_error(self, error: Exception, node: Node) -> None:
+        """Hook to be invoked if a node run throws an uncaught error.
+        This hook records the end of the node for the timeline of the run.
+        Args:
+            error: The uncaught exception thrown during the node run.
+            node: The ``Node`` that failed.
+        """
+        _record_node_end(node, error=error)
 
     @hook_impl
     def after_pipeline_run(
@@ -124,20 +222,74 @@ class MlflowPipelineHook:
             pipeline: The ``Pipeline`` that was run.
             catalog: The ``DataCatalog`` used during the run.
         """
+        # the catalog is restored first, the datasets
+        # loaded to log the model must not be timed
+        self._log_datasets_performance()
+        self._log_timeline()
+        self._log_resources()
 
         if isinstance(pipeline, PipelineML):
             pipeline_catalog = pipeline.extract_pipeline_catalog(catalog)
             artifacts = pipeline.extract_pipeline_artifacts(pipeline_catalog)
-            mlflow.pyfunc.log_model(
-                artifact_path=pipeline.model_name,
-                python_model=KedroPipelineModel(
-                    pipeline_ml=pipeline, catalog=pipeline_catalog
-                ),
-                artifacts=artifacts,
-                conda_env=_format_conda_env(pipeline.conda_env),
-            )
+            conda_env = _format_conda_env(pipeline.conda_env)
+            if pipeline.conda_env is None:
+                # the environment is resolved with the packages
+                # installed at training time
+                conda_env["dependencies"] = _get_inference_dependencies(
+                    pipeline=pipeline, catalog=pipeline_catalog
+                )
+            # the fingerprint reads all the artifacts: it is only computed
+            # when the model may not be logged again
+            model_fingerprint, previous_model_uri = None, None
+            if self.pipeline_hook_opts["skip_unchanged_model"]:
+                model_fingerprint = _compute_model_fingerprint(
+                    pipeline=pipeline, artifacts=artifacts, conda_env=conda_env
+                )
+                previous_model_uri = _get_logged_model_uri(
+                    model_fingerprint=model_fingerprint, model_name=pipeline.model_name
+                )
+            if previous_model_uri is not None:
+                # nothing has changed since the last logged model:
+                # the run only references it instead of logging it again
+                LOGGER.info(
+                    f"The model is unchanged since its last logging, it is not logged again. It is available at '{previous_model_uri}'"
+                )
+                get_tracking_policy().call(
+                    "set_tag",
+                    run_id=mlflow.active_run().info.run_id,
+                    key="model_uri",
+                    value=previous_model_uri,
+                )
+            else:
+                signature, input_example = _infer_model_signature(
+                    pipeline=pipeline,
+                    catalog=pipeline_catalog,
+                    load_persisted_input=self.pipeline_hook_opts[
+                        "signature_from_persisted_input"
+                    ],
+                )
+                _log_model(
+                    artifact_path=pipeline.model_name,
+                    python_model=KedroPipelineModel(
+                        pipeline_ml=pipeline, catalog=pipeline_catalog
+                    ),
+                    artifacts=artifacts,
+                    conda_env=conda_env,
+                    signature=signature,
+                    input_example=input_example,
+                )
+                if model_fingerprint is not None:
+                    get_tracking_policy().call(
+                        "set_tag",
+                        run_id=mlflow.active_run().info.run_id,
+                        key="model_fingerprint",
+                        value=model_fingerprint,
+                    )
         # Close the mlflow active run at the end of the pipeline to avoid interactions with further runs
-        mlflow.end_run()
+        get_tracking_policy().end_run()
+        # the circuit breaker of the run must not affect the following calls
+        set_tracking_policy(TrackingPolicy())
+        self._sync_spool()
 
     @hook_impl
     def on_pipeline_error(
@@ -172,9 +324,57 @@ class MlflowPipelineHook:
             pipeline: (Not used) The ``Pipeline`` that will was run.
             catalog: (Not used) The ``DataCatalog`` used during the run.
         """
+        self._log_datasets_performance()
+        self._log_timeline()
+        self._log_resources()
 
+        policy = get_tracking_policy()
         while mlflow.active_run():
-            mlflow.end_run()
+            try:
+                policy.end_run("FAILED")
+            except Exception as tracking_error:
+                # the pipeline error must be raised, not the tracking one
+                LOGGER.warning(f"The mlflow run cannot be ended: {tracking_error}")
+        set_tracking_policy(TrackingPolicy())
+        self._sync_spool()
+
+    def _log_datasets_performance(self) -> None:
+        if self.datasets_performance_transformer is not None:
+            self.datasets_performance_transformer.restore()
+            self.datasets_performance_transformer.log()
+            self.datasets_performance_transformer = None
+
+    def _log_timeline(self) -> None:
+        if self.nodes_timeline is not None:
+            self.nodes_timeline.log()
+            self.nodes_timeline = None
+
+    def _log_resources(self) -> None:
+        if self.resources_sampler is not None:
+            self.resources_sampler.log()
+            self.resources_sampler = None
+
+    def _sync_spool(self) -> None:
+        # the run is already ended: a failed synchronization
+        # must not fail it, the runs stay in the spool
+        if self.spool_sync is None:
+            return
+        spool_sync, self.spool_sync = self.spool_sync, None
+        if spool_sync["mode"] == "background":
+            start_background_sync(
+                spool_uri=spool_sync["spool_uri"],
+                tracking_uri=spool_sync["tracking_uri"],
+            )
+            return
+        try:
+            sync_spool(
+                spool_uri=spool_sync["spool_uri"],
+                tracking_uri=spool_sync["tracking_uri"],
+            )
+        except Exception as error:
+            LOGGER.warning(
+                f"The synchronization of the spool has failed, the runs are kept in '{spool_sync['spool_uri']}' and can be synchronized later with 'kedro mlflow sync': {error}"
+            )
 
 
 def _generate_kedro_command(
@@ -204,6 +404,89 @@ def _generate_kedro_command(
     return kedro_cmd
 
 
+def _infer_model_signature(
+    pipeline: PipelineML, catalog: DataCatalog, load_persisted_input: bool = False
+) -> Tuple[Optional[ModelSignature], Optional[pd.DataFrame]]:
+    """Best effort to infer the signature of the model and
+    an input example from the training data.
+
+    The inference pipeline is run on a small sample of the data
+    of the ``input_name`` dataset to infer the output schema.
+    The signature is only inferred when this data is a
+    ``pandas.DataFrame`` since it is the input format expected
+    by mlflow when the model has a signature, and when
+    the pipeline has a single inference pipeline.
+
+    Arguments:
+        pipeline {PipelineML} -- The pipeline whose model is logged.
+        catalog {DataCatalog} -- The catalog of the inference pipeline
+            (i.e. the output of ``pipeline.extract_pipeline_catalog``).
+        load_persisted_input {bool} -- Load the ``input_name`` dataset
+            when it is not a ``MemoryDataSet``. Datasets cannot be partially
+            loaded, hence all the data is read only to take a sample.
+
+    Returns:
+        Tuple[Optional[ModelSignature], Optional[pd.DataFrame]] -- The signature
+            and the input example, or (None, None) if they cannot be inferred.
+    """
+    if len(pipeline.inference_pipelines) > 1:
+        # the input of the model is not a dataframe when there are
+        # several inference pipelines since it contains the name of
+        # the one to run, and it would be rejected by the signature
+        return None, None
+
+    if not load_persisted_input and not isinstance(
+        catalog._data_sets.get(pipeline.input_name), MemoryDataSet
+    ):
+        return None, None
+
+    try:
+        input_data = catalog.load(pipeline.input_name)
+    except Exception:  # the input data may not be persisted nor fed
+        return None, None
+
+    if not isinstance(input_data, pd.DataFrame):
+        return None, None
+
+    input_example = input_data.head(SIGNATURE_SAMPLE_SIZE)
+    try:
+        sample_catalog = catalog.shallow_copy()
+        sample_catalog.add(
+            data_set_name=pipeline.input_name,
+            data_set=MemoryDataSet(input_example),
+            replace=True,
+        )
+        outputs = _run_without_hooks(
+            pipeline=pipeline.inference, catalog=sample_catalog
+        )
+        # the output schema can only be described if there is a single output
+        model_output = list(outputs.values())[0] if len(outputs) == 1 else None
+        try:
+            signature = infer_signature(input_example, model_output)
+        except Exception as error:
+            LOGGER.warning(
+                f"The output schema of the model cannot be inferred, only its input schema is logged: {error}"
+            )
+            signature = infer_signature(input_example)
+    except Exception as error:
+        LOGGER.warning(
+            f"The signature of the model cannot be inferred and is not logged: {error}"
+        )
+        return None, None
+
+    return signature, input_example
+
+
+def _run_without_hooks(pipeline: Pipeline, catalog: DataCatalog) -> Dict[str, Any]:
+    # a runner would call the hooks registered by the project (including
+    # the ones of kedro-mlflow) for this sample run: the nodes are run
+    # directly, in topological order
+    data = {name: catalog.load(name) for name in pipeline.inputs()}
+    for node in pipeline.nodes:
+        data.update(node.run({name: data[name] for name in node.inputs}))
+    return {name: data[name] for name in pipeline.outputs()}
+
+
 def _format_conda_env(
     conda_env: Union[str, Path, Dict[str, Any]] = None
 ) -> Dict[str, Any]:
@@ -216,7 +499,7 @@ def _format_conda_env(
             your current python_version and these dependencies is returned
             - a path to an "environment.yml" : data is loaded and used as they are
             - a Dict : used as the environment
-            - None: a base conda environment with your current python version and your project version at training time.
+            - None: a base conda environment with your current python version.
             Defaults to None.
 
     Returns:
@@ -0,0 +1,188 @@
+import os
+import sys
+import threading
+import time
+from typing import Dict, List
+
+import mlflow
+from mlflow.entities import Metric
+
+from kedro_mlflow.framework.tracking.policy import get_tracking_policy
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    # the module is not available on Windows
+    resource = None
+
+# the maximum number of samples kept in memory. When it is reached,
+# the samples are averaged two by two, hence the memory is bounded
+# whatever the duration of the run and the resolution decreases instead
+MAX_RESOURCES_SAMPLES = 1000
+
+MB = 2 ** 20
+
+
+class ResourcesSampler:
+    """Sample the resources used by the process of the run (and its
+    subprocesses, e.g. the workers of the ``ParallelRunner``)
+    and by the system in a background thread.
+
+    If ``psutil`` is installed, the cpu and memory usage of the process
+    and of the system, and the disk and network throughputs are sampled.
+    Otherwise, only the cpu usage and the peak memory of the process
+    are available.
+    """
+
+    def __init__(self, interval: float, max_samples: int = MAX_RESOURCES_SAMPLES):
+        self.interval = interval
+        self.max_samples = max_samples
+        self.samples = []
+        # the number of raw samples averaged in each stored sample
+        self._stride = 1
+        self._pending = []
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._previous = None
+
+    def start(self) -> None:
+        self._previous = _read_counters()
+        self._thread = threading.Thread(
+            target=self._run, name="kedro_mlflow_resources_sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.add_sample(self._sample())
+
+    def _sample(self) -> Dict[str, float]:
+        current = _read_counters()
+        sample = _compute_sample(self._previous, current)
+        self._previous = current
+        return sample
+
+    def add_sample(self, sample: Dict[str, float]) -> None:
+        self._pending.append(sample)
+        if len(self._pending) < self._stride:
+            return
+        self.samples.append(_average(self._pending))
+        self._pending = []
+        if len(self.samples) >= self.max_samples:
+            # downsampling: the memory is bounded and the resolution halves
+            self.samples = [
+                _average(self.samples[i : i + 2])
+                for i in range(0, len(self.samples), 2)
+            ]
+            self._stride *= 2
+
+    def log(self) -> None:
+        """Stop the sampling and log the samples as metrics of the active
+        mlflow run, e.g. "resources.process_cpu_percent", with the index
+        of the sample as step.
+        """
+        self.stop()
+        samples = self.samples
+        self.samples = []
+        if not samples or mlflow.active_run() is None:
+            return
+
+        metrics = [
+            Metric(
+                key=f"resources.{key}",
+                value=value,
+                timestamp=int(sample["timestamp"] * 1000),
+                step=step,
+            )
+            for step, sample in enumerate(samples)
+            for key, value in sample.items()
+            if key != "timestamp"
+        ]
+        run_id = mlflow.active_run().info.run_id
+        policy = get_tracking_policy()
+        policy.log_batch(run_id, metrics=metrics)
+
+
+def _read_counters() -> Dict[str, float]:
+    counters = dict(wall_time=time.time())
+    if psutil is None:
+        counters["cpu_time"] = time.process_time()
+        if resource is not None:
+            counters["max_rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return counters
+
+    process = psutil.Process(os.getpid())
+    processes = [process]
+    try:
+        processes += process.children(recursive=True)
+    except psutil.Error:  # pragma: no cover
+        pass
+    cpu_time, rss = 0.0, 0
+    for proc in processes:
+        try:
+            with proc.oneshot():
+                cpu_times = proc.cpu_times()
+                cpu_time += cpu_times.user + cpu_times.system
+                rss += proc.memory_info().rss
+        except psutil.Error:  # the subprocess may have ended
+            continue
+    counters.update(
+        cpu_time=cpu_time,
+        rss=rss,
+        system_cpu_percent=psutil.cpu_percent(),
+        system_memory_percent=psutil.virtual_memory().percent,
+    )
+    disk_io = psutil.disk_io_counters()
+    if disk_io is not None:
+        counters.update(disk_read=disk_io.read_bytes, disk_write=disk_io.write_bytes)
+    net_io = psutil.net_io_counters()
+    if net_io is not None:
+        counters.update(net_sent=net_io.bytes_sent, net_recv=net_io.bytes_recv)
+    return counters
+
+
+def _compute_sample(
+    previous: Dict[str, float], current: Dict[str, float]
+) -> Dict[str, float]:
+    elapsed = max(current["wall_time"] - previous["wall_time"], 1e-9)
+    sample = dict(
+        timestamp=current["wall_time"],
+        # the cpu time of the subprocesses which ended is lost
+        process_cpu_percent=max(
+            100 * (current["cpu_time"] - previous["cpu_time"]) / elapsed, 0.0
+        ),
+    )
+    if "max_rss" in current:
+        # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+        unit = 1 if sys.platform == "darwin" else 1024
+        sample["process_max_rss_mb"] = current["max_rss"] * unit / MB
+    if "rss" in current:
+        sample["process_rss_mb"] = current["rss"] / MB
+    for key in ("system_cpu_percent", "system_memory_percent"):
+        if key in current:
+            sample[key] = current[key]
+    for key in ("disk_read", "disk_write", "net_sent", "net_recv"):
+        if key in current and key in previous:
+            sample[f"{key}_mb_s"] = (current[key] - previous[key]) / MB / elapsed
+    return sample
+
+
+def _average(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    keys = set.intersection(*(set(sample) for sample in samples))
+    averaged = {
+        key: sum(sample[key] for sample in samples) / len(samples) for key in keys
+    }
+    # the last timestamp is kept, like for a single sample
+    averaged["timestamp"] = samples[-1]["timestamp"]
+    return averaged
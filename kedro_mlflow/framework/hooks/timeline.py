@@ -0,0 +1,119 @@
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory, mkdtemp
+from typing import Any, Dict, List, Optional
+
+import mlflow
+from kedro.pipeline.node import Node
+
+from kedro_mlflow.framework.tracking.policy import get_tracking_policy
+
+# the nodes may run in subprocesses (ParallelRunner) which are either forked
+# or spawned: the folder where the events are written is shared through
+# an environment variable since it is inherited in both cases
+TIMELINE_DIR_ENV_VAR = "KEDRO_MLFLOW_TIMELINE_DIR"
+
+# the start of the nodes which are running in the current process
+_NODES_STARTS = {}
+
+
+class NodesTimeline:
+    """Collect the start and the end of each node of a run, with the
+    process and the thread where it runs, and log them as a timeline
+    in the Chrome trace event format. The timeline can be opened
+    in ``chrome://tracing`` or https://ui.perfetto.dev.
+
+    Each process writes its events in its own files, which are gathered
+    at the end of the run, so that the timeline works with all the runners.
+    """
+
+    def __init__(self):
+        self.events_dir = None
+
+    def start(self) -> None:
+        self.events_dir = mkdtemp(prefix="kedro_mlflow_timeline_")
+        os.environ[TIMELINE_DIR_ENV_VAR] = self.events_dir
+
+    def stop(self) -> List[Dict[str, Any]]:
+        os.environ.pop(TIMELINE_DIR_ENV_VAR, None)
+        if self.events_dir is None:
+            return []
+        events = []
+        for events_file in sorted(Path(self.events_dir).glob("*.jsonl")):
+            with open(events_file, mode="r") as file_handler:
+                events.extend(json.loads(line) for line in file_handler)
+        shutil.rmtree(self.events_dir, ignore_errors=True)
+        self.events_dir = None
+        return events
+
+    def log(self) -> None:
+        """Log the timeline of the run in the
+        "performance/timeline.json" artifact of the active mlflow run.
+        """
+        events = self.stop()
+        if not events or mlflow.active_run() is None:
+            return
+
+        trace = dict(traceEvents=_name_processes(events) + events, displayTimeUnit="ms")
+        with TemporaryDirectory() as tmp_dir:
+            trace_path = Path(tmp_dir) / "timeline.json"
+            with open(trace_path, mode="w") as file_handler:
+                json.dump(trace, file_handler)
+            get_tracking_policy().call(
+                "log_artifact",
+                run_id=mlflow.active_run().info.run_id,
+                local_path=trace_path,
+                artifact_path="performance",
+            )
+
+
+def _record_node_start(node: Node) -> None:
+    if TIMELINE_DIR_ENV_VAR in os.environ:
+        # the wall clock is used since it is shared by all the processes
+        _NODES_STARTS[node.name] = time.time()
+
+
+def _record_node_end(node: Node, error: Optional[Exception] = None) -> None:
+    events_dir = os.environ.get(TIMELINE_DIR_ENV_VAR)
+    start = _NODES_STARTS.pop(node.name, None)
+    if events_dir is None or start is None:
+        return
+    end = time.time()
+    thread = threading.current_thread()
+    args = dict(tags=sorted(node.tags), thread_name=thread.name)
+    if error is not None:
+        args["error"] = repr(error)
+    event = dict(
+        name=node.name,
+        cat="node",
+        ph="X",  # a "complete" event, with a start and a duration
+        ts=int(start * 1e6),
+        dur=int((end - start) * 1e6),
+        pid=os.getpid(),
+        tid=thread.ident,
+        args=args,
+    )
+    # one file per thread, so that the lines are never interleaved
+    events_path = Path(events_dir) / f"{os.getpid()}-{thread.ident}.jsonl"
+    with open(events_path, mode="a") as file_handler:
+        file_handler.write(json.dumps(event) + "\n")
+
+
+def _name_processes(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # metadata events to display the process of the run
+    # and its workers (e.g. ParallelRunner) with explicit names
+    main_pid = os.getpid()
+    pids = sorted({event["pid"] for event in events})
+    return [
+        dict(
+            name="process_name",
+            ph="M",
+            pid=pid,
+            args=dict(name="kedro run" if pid == main_pid else f"worker {pid}"),
+        )
+        for pid in pids
+    ]
@@ -0,0 +1,5 @@
+"""kedro-mlflow tracking utilities
+"""
+
+from .policy import TrackingPolicy, get_tracking_policy  # noqa: F401
+from .spool import sync_spool  # noqa: F401
@@ -0,0 +1,411 @@
+import re
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+from mlflow.entities import LifecycleStage, Run, RunStatus, ViewType
+from mlflow.exceptions import MlflowException
+from mlflow.tracking import MlflowClient
+
+# the number of runs fetched from the tracking server in a single search
+RUNS_INDEX_PAGE_SIZE = 1000
+
+# sqlite accepts at most 999 variables in a query
+_SQLITE_MAX_VARIABLES = 900
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS experiments (
+    experiment_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    updated_since INTEGER
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    experiment_id TEXT NOT NULL,
+    status TEXT,
+    start_time INTEGER,
+    end_time INTEGER,
+    user_id TEXT,
+    artifact_uri TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_experiment_start_time
+    ON runs (experiment_id, start_time);
+CREATE TABLE IF NOT EXISTS tags (
+    run_id TEXT, key TEXT, value TEXT, PRIMARY KEY (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS tags_key_value ON tags (key, value);
+CREATE TABLE IF NOT EXISTS params (
+    run_id TEXT, key TEXT, value TEXT, PRIMARY KEY (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS params_key_value ON params (key, value);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT, key TEXT, value REAL, PRIMARY KEY (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS metrics_key_value ON metrics (key, value);
+"""
+
+_ATTRIBUTES = (
+    "run_id",
+    "experiment_id",
+    "status",
+    "start_time",
+    "end_time",
+    "user_id",
+    "artifact_uri",
+)
+
+# the same prefixes as the filters of mlflow search
+_TABLES = {
+    "attribute": "runs",
+    "attributes": "runs",
+    "attr": "runs",
+    "run": "runs",
+    "tag": "tags",
+    "tags": "tags",
+    "param": "params",
+    "params": "params",
+    "metric": "metrics",
+    "metrics": "metrics",
+}
+
+_FILTER_PATTERN = re.compile(
+    r"^\s*(?P<prefix>\w+)\.(?P<key>.+?)\s*(?P<comparator>!=|<=|>=|=|<|>|\s+LIKE\s+)\s*(?P<value>.*?)\s*$",
+    flags=re.IGNORECASE,
+)
+_ORDER_BY_PATTERN = re.compile(
+    r"^\s*(?P<prefix>\w+)\.(?P<key>.+?)(?:\s+(?P<direction>ASC|DESC))?\s*$",
+    flags=re.IGNORECASE,
+)
+
+
+class RunsIndex:
+    """A local index of the runs metadata (attributes, tags, params and
+    latest metrics) of a tracking server, stored in a sqlite database.
+
+    The runs are searched in the index instead of the tracking server.
+    ``sync`` updates it incrementally: mlflow 1.x does not record when a run
+    was updated, hence only the runs started since the last synchronization
+    and the runs which were not terminated then are fetched again. A full
+    synchronization also catches the tags added to old runs and the deleted runs.
+    """
+
+    def __init__(self, index_path: Union[str, Path], tracking_uri: str):
+        self.index_path = Path(index_path)
+        self.tracking_uri = tracking_uri
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(_SCHEMA)
+            row = connection.execute(
+                "SELECT value FROM meta WHERE key = 'tracking_uri'"
+            ).fetchone()
+            if row is not None and row[0] != tracking_uri:
+                # the index of another tracking server is rebuilt
+                for table in ("experiments", "runs", "tags", "params", "metrics"):
+                    connection.execute(f"DELETE FROM {table}")
+            connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('tracking_uri', ?)",
+                (tracking_uri,),
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.index_path.as_posix())
+
+    def sync(
+        self, experiment_names: Optional[Sequence[str]] = None, full: bool = False
+    ) -> int:
+        """Fetch the runs which changed since the last synchronization.
+
+        Arguments:
+            experiment_names {Sequence[str]} -- The experiments to synchronize.
+                Defaults to all the active experiments.
+            full {bool} -- Fetch all the runs again instead of the new ones.
+
+        Returns:
+            int -- The number of runs fetched from the tracking server.
+        """
+        client = MlflowClient(self.tracking_uri)
+        experiments = [
+            experiment
+            for experiment in client.list_experiments(view_type=ViewType.ACTIVE_ONLY)
+            if experiment_names is None or experiment.name in experiment_names
+        ]
+        nb_fetched_runs = 0
+        for experiment in experiments:
+            with closing(self._connect()) as connection, connection:
+                row = connection.execute(
+                    "SELECT updated_since FROM experiments WHERE experiment_id = ?",
+                    (experiment.experiment_id,),
+                ).fetchone()
+                updated_since = None if full or row is None else row[0]
+                pending_run_ids = {
+                    run_id
+                    for run_id, in connection.execute(
+                        "SELECT run_id FROM runs WHERE experiment_id = ? AND status IN (?, ?)",
+                        (
+                            experiment.experiment_id,
+                            RunStatus.to_string(RunStatus.RUNNING),
+                            RunStatus.to_string(RunStatus.SCHEDULED),
+                        ),
+                    )
+                }
+
+            runs = _search_runs_since(client, experiment.experiment_id, updated_since)
+            deleted_run_ids = set()
+            # the runs which were not terminated may have been updated since
+            for run_id in pending_run_ids - {run.info.run_id for run in runs}:
+                try:
+                    run = client.get_run(run_id)
+                except MlflowException:
+                    run = None
+                if run is None or run.info.lifecycle_stage == LifecycleStage.DELETED:
+                    deleted_run_ids.add(run_id)
+                else:
+                    runs.append(run)
+
+            with closing(self._connect()) as connection, connection:
+                if full:
+                    _delete_runs(
+                        connection,
+                        [
+                            run_id
+                            for run_id, in connection.execute(
+                                "SELECT run_id FROM runs WHERE experiment_id = ?",
+                                (experiment.experiment_id,),
+                            )
+                        ],
+                    )
+                _delete_runs(
+                    connection,
+                    list(deleted_run_ids | {run.info.run_id for run in runs}),
+                )
+                _insert_runs(connection, runs)
+                # the runs started at the same millisecond as the most recent
+                # one are fetched again at the next synchronization
+                start_times = [run.info.start_time or 0 for run in runs] + [
+                    updated_since or 0
+                ]
+                connection.execute(
+                    "INSERT OR REPLACE INTO experiments VALUES (?, ?, ?)",
+                    (experiment.experiment_id, experiment.name, max(start_times)),
+                )
+            nb_fetched_runs += len(runs)
+        return nb_fetched_runs
+
+    def search(
+        self,
+        experiment_names: Optional[Sequence[str]] = None,
+        filters: Iterable[str] = (),
+        order_by: Optional[str] = None,
+        max_results: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Search the runs in the index.
+
+        Arguments:
+            experiment_names {Sequence[str]} -- The experiments of the runs.
+                Defaults to all the experiments of the index.
+            filters {Iterable[str]} -- Conditions which the runs must all
+                match, with the syntax of mlflow search:
+                "<prefix>.<key> <comparator> <value>", e.g.
+                "tags.pipeline_name = 'training'" or "metrics.rmse < 0.5".
+                The comparators are =, !=, <, <=, >, >= and LIKE.
+            order_by {str} -- The sort key, e.g. "metrics.rmse ASC".
+                Defaults to "attributes.start_time DESC".
+            max_results {int} -- The maximum number of runs.
+
+        Returns:
+            pd.DataFrame -- A row per run, with the columns of
+                ``mlflow.search_runs``: the attributes and a
+                "metrics.<key>", "params.<key>" and "tags.<key>" column per key.
+        """
+        where, where_params = ["1 = 1"], []
+        if experiment_names is not None:
+            where.append(
+                f"runs.experiment_id IN (SELECT experiment_id FROM experiments WHERE name IN ({', '.join('?' * len(experiment_names))}))"
+            )
+            where_params.extend(experiment_names)
+        for filter_string in filters:
+            condition, condition_params = _parse_filter(filter_string)
+            where.append(condition)
+            where_params.extend(condition_params)
+
+        join, join_params, order = _parse_order_by(
+            order_by or "attributes.start_time DESC"
+        )
+        query = f"SELECT runs.* FROM runs {join} WHERE {' AND '.join(where)} ORDER BY {order}, runs.run_id"
+        query_params = join_params + where_params
+        if max_results is not None:
+            query += " LIMIT ?"
+            query_params.append(max_results)
+
+        with closing(self._connect()) as connection:
+            runs = pd.read_sql_query(query, connection, params=query_params)
+            columns = {}
+            run_ids = runs["run_id"].tolist()
+            for prefix, table in (
+                ("metrics", "metrics"),
+                ("params", "params"),
+                ("tags", "tags"),
+            ):
+                values = _select_by_run_ids(connection, table, run_ids)
+                for key in sorted(values):
+                    columns[f"{prefix}.{key}"] = runs["run_id"].map(values[key])
+
+        for attribute in ("start_time", "end_time"):
+            runs[attribute] = pd.to_datetime(runs[attribute], unit="ms", utc=True)
+        return pd.concat([runs, pd.DataFrame(columns, index=runs.index)], axis=1)
+
+
+def export_runs(runs: pd.DataFrame, filepath: Union[str, Path]) -> None:
+    """Write the result of ``RunsIndex.search`` in a csv
+    or a parquet file, depending on its extension.
+    """
+    filepath = Path(filepath)
+    if filepath.suffix == ".csv":
+        runs.to_csv(filepath, index=False)
+    elif filepath.suffix == ".parquet":
+        # a column of params or tags which are all missing has no type
+        runs.astype(
+            {column: "object" for column in runs.columns if runs[column].isna().all()}
+        ).to_parquet(filepath, index=False)
+    else:
+        raise ValueError(
+            f"The runs can only be exported to a '.csv' or a '.parquet' file, got '{filepath}'"
+        )
+
+
+def _search_runs_since(
+    client: MlflowClient, experiment_id: str, updated_since: Optional[int]
+) -> List[Run]:
+    # the attributes of the runs cannot be filtered on their start time
+    # with mlflow 1.x: the most recent runs are fetched first until
+    # the runs started before the last synchronization are reached
+    runs = []
+    page_token = None
+    while True:
+        page = client.search_runs(
+            experiment_ids=[experiment_id],
+            run_view_type=ViewType.ACTIVE_ONLY,
+            max_results=RUNS_INDEX_PAGE_SIZE,
+            order_by=["attributes.start_time DESC"],
+            page_token=page_token,
+        )
+        for run in page:
+            if updated_since is not None and (run.info.start_time or 0) < updated_since:
+                return runs
+            runs.append(run)
+        page_token = page.token
+        if not page_token:
+            return runs
+
+
+def _delete_runs(connection: sqlite3.Connection, run_ids: List[str]) -> None:
+    for i in range(0, len(run_ids), _SQLITE_MAX_VARIABLES):
+        chunk = run_ids[i : i + _SQLITE_MAX_VARIABLES]
+        for table in ("runs", "tags", "params", "metrics"):
+            connection.execute(
+                f"DELETE FROM {table} WHERE run_id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+
+
+def _insert_runs(connection: sqlite3.Connection, runs: List[Run]) -> None:
+    connection.executemany(
+        "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                run.info.run_id,
+                run.info.experiment_id,
+                run.info.status,
+                run.info.start_time,
+                run.info.end_time,
+                run.info.user_id,
+                run.info.artifact_uri,
+            )
+            for run in runs
+        ],
+    )
+    for table, attribute in (
+        ("tags", "tags"),
+        ("params", "params"),
+        ("metrics", "metrics"),
+    ):
+        connection.executemany(
+            f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?)",
+            [
+                (run.info.run_id, key, value)
+                for run in runs
+                for key, value in getattr(run.data, attribute).items()
+            ],
+        )
+
+
+def _select_by_run_ids(
+    connection: sqlite3.Connection, table: str, run_ids: List[str]
+) -> Dict[str, Dict[str, Union[str, float]]]:
+    values = {}
+    for i in range(0, len(run_ids), _SQLITE_MAX_VARIABLES):
+        chunk = run_ids[i : i + _SQLITE_MAX_VARIABLES]
+        rows = connection.execute(
+            f"SELECT run_id, key, value FROM {table} WHERE run_id IN ({', '.join('?' * len(chunk))})",
+            chunk,
+        )
+        for run_id, key, value in rows:
+            values.setdefault(key, {})[run_id] = value
+    return values
+
+
+def _parse_identifier(prefix: str, key: str, string: str) -> Tuple[str, str]:
+    table = _TABLES.get(prefix.lower())
+    key = key.strip().strip("`\"'")
+    if table is None or (table == "runs" and key not in _ATTRIBUTES):
+        raise ValueError(
+            f"Invalid key in '{string}': it must be 'metrics.<key>', 'params.<key>', 'tags.<key>' or 'attributes.<{'|'.join(_ATTRIBUTES)}>'"
+        )
+    return table, key
+
+
+def _parse_filter(filter_string: str) -> Tuple[str, list]:
+    match = _FILTER_PATTERN.match(filter_string)
+    if match is None:
+        raise ValueError(
+            f"Invalid filter '{filter_string}', it must be '<prefix>.<key> <comparator> <value>'"
+        )
+    table, key = _parse_identifier(match["prefix"], match["key"], filter_string)
+    comparator = match["comparator"].strip().upper()
+    value = match["value"]
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        value = value[1:-1]
+    if table == "metrics" or key in ("start_time", "end_time"):
+        try:
+            value = float(value)
+        except ValueError:
+            raise ValueError(
+                f"Invalid filter '{filter_string}', '{match['value']}' is not a number"
+            )
+
+    if table == "runs":
+        return f"runs.{key} {comparator} ?", [value]
+    return (
+        f"EXISTS (SELECT 1 FROM {table} WHERE {table}.run_id = runs.run_id AND {table}.key = ? AND {table}.value {comparator} ?)",
+        [key, value],
+    )
+
+
+def _parse_order_by(order_by: str) -> Tuple[str, list, str]:
+    match = _ORDER_BY_PATTERN.match(order_by)
+    if match is None:
+        raise ValueError(
+            f"Invalid order_by '{order_by}', it must be '<prefix>.<key> [ASC|DESC]'"
+        )
+    table, key = _parse_identifier(match["prefix"], match["key"], order_by)
+    direction = (match["direction"] or "ASC").upper()
+    if table == "runs":
+        return "", [], f"runs.{key} IS NULL, runs.{key} {direction}"
+    # the runs without the key come last
+    return (
+        f"LEFT JOIN {table} AS sort_key ON sort_key.run_id = runs.run_id AND sort_key.key = ?",
+        [key],
+        f"sort_key.value IS NULL, sort_key.value {direction}",
+    )
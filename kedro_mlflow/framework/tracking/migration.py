@@ -0,0 +1,190 @@
+import math
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from mlflow.entities import Run, ViewType
+from mlflow.store.tracking.dbmodels.models import (
+    SqlExperiment,
+    SqlExperimentTag,
+    SqlLatestMetric,
+    SqlMetric,
+    SqlParam,
+    SqlRun,
+    SqlTag,
+)
+from mlflow.store.tracking.file_store import FileStore
+from mlflow.store.tracking.sqlalchemy_store import SqlAlchemyStore
+from mlflow.utils.mlflow_tags import (
+    MLFLOW_RUN_NAME,
+    MLFLOW_SOURCE_NAME,
+    MLFLOW_SOURCE_TYPE,
+)
+
+# the number of runs inserted in the database in a single transaction
+MIGRATION_BATCH_SIZE = 100
+
+# the sql stores cannot represent infinite values
+_MAX_FLOAT = 1.7976931348623157e308
+
+
+def migrate_file_store(
+    file_store_uri: str,
+    db_uri: str,
+    batch_size: int = MIGRATION_BATCH_SIZE,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, int]:
+    """Copy the experiments and the runs of a file store (e.g. the "mlruns"
+    folder) in a database supported by mlflow (e.g. "sqlite:///mlflow.db").
+
+    The ids of the experiments and of the runs, the metrics history, the params,
+    the tags and the artifact locations are preserved: the artifacts are not
+    copied and stay in the file store. The runs are inserted in batches, and
+    the runs which are already in the database are skipped, hence an
+    interrupted migration can be run again.
+
+    Arguments:
+        file_store_uri {str} -- The uri of the file store.
+        db_uri {str} -- The SQLAlchemy uri of the database, which is
+            created if needed.
+        batch_size {int} -- The number of runs inserted in a single transaction.
+        progress {Callable[[int, int], None]} -- Called after each batch with
+            the number of runs processed so far and the total number of runs.
+
+    Returns:
+        Dict[str, int] -- The number of migrated "experiments", "runs"
+            and "metrics" (the values of the metrics history), and the number
+            of runs which were "skipped" since they were already migrated.
+    """
+    parsed_uri = urlparse(file_store_uri)
+    if parsed_uri.scheme not in ("", "file"):
+        raise ValueError(f"'{file_store_uri}' is not the uri of a file store")
+    file_store = FileStore(url2pathname(parsed_uri.path))
+    # new experiments of the database store their artifacts next to the old ones
+    db_store = SqlAlchemyStore(db_uri, default_artifact_root=file_store_uri)
+
+    experiments = file_store.list_experiments(view_type=ViewType.ALL)
+    summary = dict(experiments=len(experiments), runs=0, metrics=0, skipped=0)
+    with db_store.ManagedSessionMaker() as session:
+        # the default experiment "0" is created with the database
+        for experiment in experiments:
+            session.merge(
+                SqlExperiment(
+                    experiment_id=int(experiment.experiment_id),
+                    name=experiment.name,
+                    artifact_location=experiment.artifact_location,
+                    lifecycle_stage=experiment.lifecycle_stage,
+                )
+            )
+            for key, value in experiment.tags.items():
+                session.merge(
+                    SqlExperimentTag(
+                        experiment_id=int(experiment.experiment_id),
+                        key=key,
+                        value=value,
+                    )
+                )
+        migrated_run_ids = {run_uuid for run_uuid, in session.query(SqlRun.run_uuid)}
+
+    runs = _list_all_runs(file_store, [exp.experiment_id for exp in experiments])
+    for i in range(0, len(runs), batch_size):
+        batch = runs[i : i + batch_size]
+        rows = dict(runs=[], tags=[], params=[], metrics=[], latest_metrics=[])
+        for run in batch:
+            if run.info.run_id in migrated_run_ids:
+                summary["skipped"] += 1
+                continue
+            _add_run_rows(rows, run, file_store)
+        # the tables are filled in the order of their foreign keys
+        with db_store.ManagedSessionMaker() as session:
+            session.bulk_insert_mappings(SqlRun, rows["runs"])
+            session.bulk_insert_mappings(SqlTag, rows["tags"])
+            session.bulk_insert_mappings(SqlParam, rows["params"])
+            session.bulk_insert_mappings(SqlMetric, rows["metrics"])
+            session.bulk_insert_mappings(SqlLatestMetric, rows["latest_metrics"])
+        summary["runs"] += len(rows["runs"])
+        summary["metrics"] += len(rows["metrics"])
+        if progress is not None:
+            progress(i + len(batch), len(runs))
+    return summary
+
+
+def _list_all_runs(file_store: FileStore, experiment_ids: List[str]) -> List[Run]:
+    runs = []
+    page_token = None
+    while True:
+        page = file_store.search_runs(
+            experiment_ids=experiment_ids,
+            filter_string="",
+            run_view_type=ViewType.ALL,
+            max_results=1000,
+            page_token=page_token,
+        )
+        runs.extend(page)
+        page_token = page.token
+        if not page_token:
+            return runs
+
+
+def _add_run_rows(rows: Dict[str, List[Dict]], run: Run, file_store: FileStore):
+    run_id = run.info.run_id
+    tags = run.data.tags
+    rows["runs"].append(
+        dict(
+            run_uuid=run_id,
+            name=tags.get(MLFLOW_RUN_NAME, ""),
+            source_type=tags.get(MLFLOW_SOURCE_TYPE, "UNKNOWN"),
+            source_name=tags.get(MLFLOW_SOURCE_NAME, ""),
+            entry_point_name="",
+            user_id=run.info.user_id,
+            status=run.info.status,
+            start_time=run.info.start_time,
+            end_time=run.info.end_time,
+            source_version="",
+            lifecycle_stage=run.info.lifecycle_stage,
+            artifact_uri=run.info.artifact_uri,
+            experiment_id=int(run.info.experiment_id),
+        )
+    )
+    rows["tags"].extend(
+        dict(run_uuid=run_id, key=key, value=value) for key, value in tags.items()
+    )
+    rows["params"].extend(
+        dict(run_uuid=run_id, key=key, value=value)
+        for key, value in run.data.params.items()
+    )
+    for key in run.data.metrics:
+        # the file store keeps the values which were logged twice,
+        # they are the primary key of the table of the sql store
+        history = list(
+            {
+                tuple(sorted(row.items())): row
+                for row in (
+                    _metric_row(run_id, metric)
+                    for metric in file_store.get_metric_history(run_id, key)
+                )
+            }.values()
+        )
+        rows["metrics"].extend(history)
+        # the same order as the sql store to find the latest value
+        rows["latest_metrics"].append(
+            max(history, key=lambda row: (row["step"], row["timestamp"], row["value"]))
+        )
+
+
+def _metric_row(run_id: str, metric) -> Dict:
+    is_nan = math.isnan(metric.value)
+    if is_nan:
+        value = 0
+    elif math.isinf(metric.value):
+        value = _MAX_FLOAT if metric.value > 0 else -_MAX_FLOAT
+    else:
+        value = metric.value
+    return dict(
+        run_uuid=run_id,
+        key=metric.key,
+        value=value,
+        timestamp=metric.timestamp,
+        step=metric.step,
+        is_nan=is_nan,
+    )
@@ -0,0 +1,245 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional, Sequence
+
+import mlflow
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.exceptions import MlflowException
+from mlflow.tracking import MlflowClient
+from mlflow.utils.validation import MAX_METRICS_PER_BATCH, MAX_PARAMS_TAGS_PER_BATCH
+
+from kedro_mlflow.framework.tracking.spool import _append_to_journal
+
+LOGGER = logging.getLogger(__name__)
+
+# returned by the calls which are written in the spool
+SPOOLED = object()
+
+# the errors of the tracking server which may succeed if the call is retried.
+# The other errors (e.g. an invalid parameter) are raised immediately
+RETRYABLE_ERROR_CODES = {
+    "INTERNAL_ERROR",
+    "TEMPORARILY_UNAVAILABLE",
+    "REQUEST_LIMIT_EXCEEDED",
+}
+
+
+class TrackingUnavailableError(Exception):
+    """Error raised when the circuit breaker is open: the tracking
+    server failed too many times in a row and is not called anymore.
+    """
+
+
+class TrackingPolicy:
+    """Apply a timeout, retries with an exponential backoff and
+    a circuit breaker to the calls to the tracking server.
+
+    When ``failures_threshold`` is set, the calls which still fail after
+    their retries are written in the journal of the spool instead of
+    failing the pipeline, and they are sent to the tracking server
+    with ``kedro mlflow sync``. After ``failures_threshold`` failures
+    in a row, the circuit breaker opens: the tracking server is not called
+    anymore during the run and all the calls go to the journal.
+
+    The default policy calls the tracking server once, without timeout.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        max_retries: int = 0,
+        backoff_factor: float = 1.0,
+        failures_threshold: Optional[int] = None,
+        spool_uri: Optional[str] = None,
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.failures_threshold = failures_threshold
+        self.spool_uri = spool_uri
+        self._failures = 0
+        self._lock = threading.Lock()
+
+    @property
+    def fallback_to_spool(self) -> bool:
+        return self.failures_threshold is not None and self.spool_uri is not None
+
+    @property
+    def circuit_open(self) -> bool:
+        return (
+            self.failures_threshold is not None
+            and self._failures >= self.failures_threshold
+        )
+
+    def execute(self, func: Callable, *args, **kwargs) -> Any:
+        """Call a function which interacts with the tracking server
+        with the timeout, the retries and the circuit breaker of the policy.
+
+        Raises:
+            TrackingUnavailableError: If the circuit breaker is open.
+        """
+        if self.circuit_open:
+            raise TrackingUnavailableError(
+                f"The tracking server failed {self._failures} times in a row, it is not called anymore during this run"
+            )
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = _call_with_timeout(func, args, kwargs, self.timeout)
+            except Exception as error:
+                if not _is_retryable(error):
+                    raise
+                if attempt == self.max_retries:
+                    with self._lock:
+                        self._failures += 1
+                    raise
+                delay = self.backoff_factor * 2 ** attempt
+                LOGGER.warning(
+                    f"Call to the tracking server failed ({error}), retrying in {delay}s"
+                )
+                time.sleep(delay)
+            else:
+                with self._lock:
+                    self._failures = 0
+                return result
+
+    def call(self, method: str, **kwargs) -> Any:
+        """Call a method of the ``MlflowClient`` of the current tracking uri
+        with the policy. The call is written in the journal of the spool
+        if the tracking server is unavailable and ``failures_threshold`` is set.
+
+        Arguments:
+            method {str} -- The name of the method, e.g. "log_batch".
+            kwargs -- The arguments of the method (including the run_id).
+        """
+        try:
+            return self.execute(lambda: getattr(MlflowClient(), method)(**kwargs))
+        except Exception as error:
+            if not self.fallback_to_spool or not (
+                isinstance(error, TrackingUnavailableError) or _is_retryable(error)
+            ):
+                raise
+            LOGGER.warning(
+                f"'{method}' cannot be sent to the tracking server ({error}). It is written in the spool, run 'kedro mlflow sync' to send it later."
+            )
+            _append_to_journal(self.spool_uri, method, kwargs)
+            return SPOOLED
+
+    def log_batch(
+        self,
+        run_id: str,
+        metrics: Sequence[Metric] = (),
+        params: Sequence[Param] = (),
+        tags: Sequence[RunTag] = (),
+    ) -> None:
+        """Log metrics, params and tags in as few calls as the
+        limits of the tracking server allow.
+        """
+        for i in range(0, len(params), MAX_PARAMS_TAGS_PER_BATCH):
+            self.call(
+                "log_batch",
+                run_id=run_id,
+                params=list(params[i : i + MAX_PARAMS_TAGS_PER_BATCH]),
+            )
+        for i in range(0, len(tags), MAX_PARAMS_TAGS_PER_BATCH):
+            self.call(
+                "log_batch",
+                run_id=run_id,
+                tags=list(tags[i : i + MAX_PARAMS_TAGS_PER_BATCH]),
+            )
+        for i in range(0, len(metrics), MAX_METRICS_PER_BATCH):
+            self.call(
+                "log_batch",
+                run_id=run_id,
+                metrics=list(metrics[i : i + MAX_METRICS_PER_BATCH]),
+            )
+
+    def end_run(self, status: str = "FINISHED") -> None:
+        """End the active mlflow run with the policy."""
+        run = mlflow.active_run()
+        if run is None:
+            return
+        try:
+            sent = self.call("set_terminated", run_id=run.info.run_id, status=status)
+        except Exception:
+            _end_run_locally(run.info.run_id, status)
+            raise
+        if sent is SPOOLED:
+            _end_run_locally(run.info.run_id, status)
+        else:
+            try:
+                mlflow.end_run(status)
+            except Exception:  # the end of the run is already recorded
+                pass
+
+
+_TRACKING_POLICY = TrackingPolicy()
+
+
+def get_tracking_policy() -> TrackingPolicy:
+    """The policy of the current run, set by the ``MlflowPipelineHook``."""
+    return _TRACKING_POLICY
+
+
+def set_tracking_policy(policy: TrackingPolicy) -> None:
+    global _TRACKING_POLICY
+    _TRACKING_POLICY = policy
+
+
+def _is_retryable(error: Exception) -> bool:
+    # connection errors and timeouts are OSError
+    if isinstance(error, (OSError, TimeoutError)):
+        return True
+    return (
+        isinstance(error, MlflowException) and error.error_code in RETRYABLE_ERROR_CODES
+    )
+
+
+def _call_with_timeout(
+    func: Callable, args: tuple, kwargs: dict, timeout: Optional[float]
+) -> Any:
+    if timeout is None:
+        return func(*args, **kwargs)
+
+    # the call runs in a daemon thread which is abandoned after the timeout:
+    # mlflow 1.x http requests have no timeout. The call may still succeed
+    # after the timeout (e.g. it is retried and recorded twice)
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = func(*args, **kwargs)
+        except Exception as error:
+            outcome["error"] = error
+
+    thread = threading.Thread(target=target, name="kedro_mlflow_tracking_call")
+    thread.daemon = True
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"The call to the tracking server took more than {timeout}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("result")
+
+
+def _end_run_locally(run_id: str, status: str) -> None:
+    """Remove a run from the active runs of mlflow when the tracking server
+    is unavailable. ``mlflow.end_run`` removes the run before sending its end
+    (again): it is called in a thread which is not waited for.
+    """
+
+    def end_run():
+        try:
+            mlflow.end_run(status)
+        except Exception:
+            pass
+
+    thread = threading.Thread(target=end_run, name="kedro_mlflow_end_run")
+    thread.daemon = True
+    thread.start()
+    while thread.is_alive():
+        active_run = mlflow.active_run()
+        if active_run is None or active_run.info.run_id != run_id:
+            return
+        time.sleep(0.01)
@@ -0,0 +1,339 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from mlflow.entities import Metric, Param, RunStatus, RunTag, ViewType
+from mlflow.tracking import MlflowClient
+from mlflow.utils.mlflow_tags import MLFLOW_PARENT_RUN_ID
+from mlflow.utils.validation import MAX_METRICS_PER_BATCH, MAX_PARAMS_TAGS_PER_BATCH
+
+LOGGER = logging.getLogger(__name__)
+
+# the tag of a synchronized run of the tracking server
+# which contains the id of the run of the spool it comes from
+SPOOL_RUN_ID_TAG = "kedro_mlflow.spool_run_id"
+
+# the tag of a run of the spool which contains the id of
+# its copy on the tracking server once it is synchronized
+SYNCED_RUN_ID_TAG = "kedro_mlflow.synced_run_id"
+
+# only one synchronization at a time in a process, e.g. if the
+# background synchronization of a run is still running at the next run
+_SYNC_LOCK = threading.Lock()
+
+# the calls to the tracking server which failed during a run on the tracking
+# server are written in a journal next to the spool (the folders in the
+# spool would be read as experiments by mlflow), one file per process
+JOURNAL_SUFFIX = "_journal"
+
+_JOURNAL_LOCK = threading.Lock()
+
+
+def sync_spool(spool_uri: str, tracking_uri: str) -> Dict[str, str]:
+    """Replay the ended runs of a spool (a local file store) to a tracking
+    server: their tags, params, metrics history and artifacts are logged in
+    batches in a run of the experiment with the same name.
+
+    The synchronization is idempotent: the runs of the spool are tagged once
+    synchronized and are skipped afterwards. A run whose synchronization
+    was interrupted is deleted from the tracking server and replayed.
+    The runs which are still running are not synchronized.
+
+    The calls to runs of the tracking server which were written in the
+    journal of the spool (see ``TrackingPolicy``) are replayed afterwards.
+
+    Arguments:
+        spool_uri {str} -- The uri of the local file store of the spool.
+        tracking_uri {str} -- The uri of the tracking server.
+
+    Returns:
+        Dict[str, str] -- The ids of the runs synchronized by this call,
+            with the ids of the spool as keys and the ones of the
+            tracking server as values.
+    """
+    spool_path = Path(url2pathname(urlparse(spool_uri).path))
+    with _SYNC_LOCK:
+        _replay_journal(_get_journal_path(spool_uri), MlflowClient(tracking_uri))
+        if not spool_path.is_dir():
+            # the client of a file store would create it
+            return {}
+
+        spool_client = MlflowClient(spool_uri)
+        remote_client = MlflowClient(tracking_uri)
+        experiments = spool_client.list_experiments(view_type=ViewType.ACTIVE_ONLY)
+        runs = [
+            run
+            for experiment in experiments
+            for run in _search_all_runs(spool_client, experiment.experiment_id)
+        ]
+        # the ids of the parents of nested runs are replaced with the ids
+        # of their synchronized copy (the parent may be in another experiment)
+        remote_run_ids = {
+            run.info.run_id: run.data.tags[SYNCED_RUN_ID_TAG]
+            for run in runs
+            if SYNCED_RUN_ID_TAG in run.data.tags
+        }
+        runs_to_sync = _sort_parents_first(
+            [
+                run
+                for run in runs
+                if SYNCED_RUN_ID_TAG not in run.data.tags
+                and _is_terminated(run.info.status)
+            ]
+        )
+        experiments_names = {
+            experiment.experiment_id: experiment.name for experiment in experiments
+        }
+        remote_experiments_ids = {}
+        synced_run_ids = {}
+        for run in runs_to_sync:
+            experiment_id = run.info.experiment_id
+            if experiment_id not in remote_experiments_ids:
+                remote_experiments_ids[experiment_id] = _get_or_create_experiment_id(
+                    remote_client, experiments_names[experiment_id]
+                )
+            remote_run_id = _sync_run(
+                spool_client=spool_client,
+                remote_client=remote_client,
+                run=run,
+                remote_experiment_id=remote_experiments_ids[experiment_id],
+                remote_run_ids=remote_run_ids,
+            )
+            remote_run_ids[run.info.run_id] = remote_run_id
+            synced_run_ids[run.info.run_id] = remote_run_id
+    return synced_run_ids
+
+
+def start_background_sync(spool_uri: str, tracking_uri: str) -> threading.Thread:
+    """Synchronize the spool in a thread. The thread is not a daemon:
+    the python process waits for the end of the synchronization before exiting.
+    """
+
+    def sync():
+        try:
+            sync_spool(spool_uri=spool_uri, tracking_uri=tracking_uri)
+        except Exception as error:
+            LOGGER.warning(
+                f"The synchronization of the spool has failed, the runs are kept in '{spool_uri}' and can be synchronized later with 'kedro mlflow sync': {error}"
+            )
+
+    thread = threading.Thread(target=sync, name="kedro_mlflow_spool_sync")
+    thread.start()
+    return thread
+
+
+def _sync_run(
+    spool_client: MlflowClient,
+    remote_client: MlflowClient,
+    run,
+    remote_experiment_id: str,
+    remote_run_ids: Dict[str, str],
+) -> str:
+    run_id = run.info.run_id
+    remote_run_id = _get_remote_run_id(remote_client, remote_experiment_id, run_id)
+    if remote_run_id is None:
+        tags = dict(run.data.tags)
+        tags[SPOOL_RUN_ID_TAG] = run_id
+        if tags.get(MLFLOW_PARENT_RUN_ID) in remote_run_ids:
+            tags[MLFLOW_PARENT_RUN_ID] = remote_run_ids[tags[MLFLOW_PARENT_RUN_ID]]
+        remote_run_id = remote_client.create_run(
+            experiment_id=remote_experiment_id,
+            start_time=run.info.start_time,
+            tags=tags,
+        ).info.run_id
+
+        params = [Param(key, value) for key, value in run.data.params.items()]
+        for i in range(0, len(params), MAX_PARAMS_TAGS_PER_BATCH):
+            remote_client.log_batch(
+                remote_run_id, params=params[i : i + MAX_PARAMS_TAGS_PER_BATCH]
+            )
+        metrics = [
+            metric
+            for key in run.data.metrics
+            for metric in spool_client.get_metric_history(run_id, key)
+        ]
+        for i in range(0, len(metrics), MAX_METRICS_PER_BATCH):
+            remote_client.log_batch(
+                remote_run_id, metrics=metrics[i : i + MAX_METRICS_PER_BATCH]
+            )
+        artifacts_path = Path(url2pathname(urlparse(run.info.artifact_uri).path))
+        if artifacts_path.is_dir() and any(artifacts_path.iterdir()):
+            remote_client.log_artifacts(remote_run_id, artifacts_path.as_posix())
+        # the run is terminated last: a run which is still running
+        # on the tracking server has not been fully synchronized
+        remote_client.set_terminated(
+            remote_run_id, status=run.info.status, end_time=run.info.end_time,
+        )
+        LOGGER.info(f"Run '{run_id}' synchronized as run '{remote_run_id}'")
+    spool_client.set_tag(run_id, SYNCED_RUN_ID_TAG, remote_run_id)
+    return remote_run_id
+
+
+def _get_remote_run_id(
+    remote_client: MlflowClient, remote_experiment_id: str, run_id: str
+) -> Optional[str]:
+    """Retrieve the copy of a run of the spool which was fully synchronized
+    by a previous call, and delete the partial copies.
+    """
+    remote_runs = remote_client.search_runs(
+        experiment_ids=[remote_experiment_id],
+        filter_string=f"tags.`{SPOOL_RUN_ID_TAG}` = '{run_id}'",
+    )
+    remote_run_id = None
+    for remote_run in remote_runs:
+        if remote_run_id is None and _is_terminated(remote_run.info.status):
+            remote_run_id = remote_run.info.run_id
+        else:
+            remote_client.delete_run(remote_run.info.run_id)
+    return remote_run_id
+
+
+def _sort_parents_first(runs: List) -> List:
+    # nested runs may start in the same millisecond as their parent,
+    # or be in an experiment which is synchronized before the one of their parent
+    runs_by_id = {run.info.run_id: run for run in runs}
+
+    def depth(run):
+        depth = 0
+        parent_run_id = run.data.tags.get(MLFLOW_PARENT_RUN_ID)
+        while parent_run_id in runs_by_id:
+            depth += 1
+            parent_run_id = runs_by_id[parent_run_id].data.tags.get(
+                MLFLOW_PARENT_RUN_ID
+            )
+        return depth
+
+    # the sort is stable: the runs of the same depth keep their order
+    return sorted(runs, key=depth)
+
+
+def _is_terminated(status: str) -> bool:
+    return RunStatus.is_terminated(RunStatus.from_string(status))
+
+
+def _get_or_create_experiment_id(client: MlflowClient, name: str) -> str:
+    experiment = client.get_experiment_by_name(name)
+    if experiment is None:
+        return client.create_experiment(name)
+    if experiment.lifecycle_stage == "deleted":
+        client.restore_experiment(experiment.experiment_id)
+    return experiment.experiment_id
+
+
+def _search_all_runs(client: MlflowClient, experiment_id: str) -> List:
+    # the oldest runs first
+    runs = []
+    page_token = None
+    while True:
+        page = client.search_runs(
+            experiment_ids=[experiment_id],
+            run_view_type=ViewType.ACTIVE_ONLY,
+            order_by=["attribute.start_time ASC"],
+            page_token=page_token,
+        )
+        runs.extend(page)
+        page_token = page.token
+        if not page_token:
+            return runs
+
+
+def _get_journal_path(spool_uri: str) -> Path:
+    spool_path = Path(url2pathname(urlparse(spool_uri).path))
+    return spool_path.with_name(spool_path.name + JOURNAL_SUFFIX)
+
+
+def _append_to_journal(spool_uri: str, method: str, kwargs: Dict[str, Any]) -> None:
+    """Write a call to a ``MlflowClient`` method in the journal of the spool.
+    The artifacts are copied in the journal since their
+    local file may be modified before the synchronization.
+    """
+    journal_path = _get_journal_path(spool_uri)
+    journal_path.mkdir(parents=True, exist_ok=True)
+    kwargs = dict(kwargs)
+    for key in ("metrics", "params", "tags"):
+        if key in kwargs:
+            kwargs[key] = [_entity_to_dict(entity) for entity in kwargs[key]]
+    for key in ("local_path", "local_dir"):
+        if key in kwargs:
+            src = Path(kwargs[key])
+            dst = journal_path / "artifacts" / uuid.uuid4().hex / src.name
+            dst.parent.mkdir(parents=True)
+            if src.is_dir():
+                shutil.copytree(src, dst)
+            else:
+                shutil.copy2(src, dst)
+            kwargs[key] = dst.as_posix()
+    entry = json.dumps(dict(method=method, kwargs=kwargs), default=str)
+    with _JOURNAL_LOCK:
+        with open(journal_path / f"{os.getpid()}.jsonl", mode="a") as file_handler:
+            file_handler.write(entry + "\n")
+
+
+def _replay_journal(journal_path: Path, client: MlflowClient) -> int:
+    """Send the calls of the journal to the tracking server, in order.
+    The calls which are replayed are removed from the journal, hence
+    a replay which fails can be resumed.
+
+    Returns:
+        int -- The number of calls which are replayed.
+    """
+    nb_calls = 0
+    for journal_file in sorted(journal_path.glob("*.jsonl")):
+        # the file is renamed before it is read, so that
+        # the calls of a running process go to a new file
+        replayed_file = journal_file.with_suffix(f".{uuid.uuid4().hex}.replay")
+        journal_file.rename(replayed_file)
+        nb_calls += _replay_journal_file(replayed_file, client)
+    for replayed_file in sorted(journal_path.glob("*.replay")):
+        # the files of a previous replay which failed
+        nb_calls += _replay_journal_file(replayed_file, client)
+    return nb_calls
+
+
+def _replay_journal_file(journal_file: Path, client: MlflowClient) -> int:
+    with open(journal_file, mode="r") as file_handler:
+        entries = [json.loads(line) for line in file_handler if line.strip()]
+    for i, entry in enumerate(entries):
+        try:
+            kwargs = dict(entry["kwargs"])
+            kwargs.update(
+                {
+                    key: [entity_class(**entity) for entity in kwargs[key]]
+                    for key, entity_class in _ENTITIES_CLASSES.items()
+                    if key in kwargs
+                }
+            )
+            getattr(client, entry["method"])(**kwargs)
+        except Exception:
+            # the remaining calls are kept for the next synchronization
+            with open(journal_file, mode="w") as file_handler:
+                file_handler.writelines(
+                    json.dumps(entry) + "\n" for entry in entries[i:]
+                )
+            raise
+        for key in ("local_path", "local_dir"):
+            if key in entry["kwargs"]:
+                shutil.rmtree(Path(entry["kwargs"][key]).parent, ignore_errors=True)
+    journal_file.unlink()
+    return len(entries)
+
+
+_ENTITIES_CLASSES = {"metrics": Metric, "params": Param, "tags": RunTag}
+
+
+def _entity_to_dict(entity) -> Dict[str, Any]:
+    if isinstance(entity, Metric):
+        return dict(
+            key=entity.key,
+            value=entity.value,
+            timestamp=entity.timestamp,
+            step=entity.step,
+        )
+    return dict(key=entity.key, value=entity.value)
@@ -1,2 +1,4 @@
 from .mlflow_dataset import MlflowDataSet
+from .mlflow_experiment_metrics_dataset import MlflowExperimentMetricsDataSet
 from .mlflow_metrics_dataset import MlflowMetricsDataSet
+from .mlflow_params_dataset import MlflowParamsDataSet
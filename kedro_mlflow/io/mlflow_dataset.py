@@ -3,7 +3,8 @@ from typing import Any, Dict, Union
 import mlflow
 from kedro.io import AbstractVersionedDataSet
 from kedro.io.core import parse_dataset_definition
-from mlflow.tracking import MlflowClient
+
+from kedro_mlflow.framework.tracking.policy import get_tracking_policy
 
 
 class MlflowDataSet(AbstractVersionedDataSet):
@@ -42,17 +43,26 @@ class MlflowDataSet(AbstractVersionedDataSet):
                 )
 
                 super()._save(data)
+                policy = get_tracking_policy()
                 if self.run_id:
                     # if a run id is specified, we have to use mlflow client
                     # to avoid potential conflicts with an already active run
-                    mlflow_client = MlflowClient()
-                    mlflow_client.log_artifact(
+                    policy.call(
+                        "log_artifact",
                         run_id=self.run_id,
                         local_path=local_path,
                         artifact_path=self.artifact_path,
                     )
+                elif mlflow.active_run():
+                    policy.call(
+                        "log_artifact",
+                        run_id=mlflow.active_run().info.run_id,
+                        local_path=local_path,
+                        artifact_path=self.artifact_path,
+                    )
                 else:
-                    mlflow.log_artifact(local_path, self.artifact_path)
+                    # mlflow starts a run
+                    policy.execute(mlflow.log_artifact, local_path, self.artifact_path)
 
         # rename the class
         parent_name = data_set.__name__
@@ -0,0 +1,204 @@
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from kedro.io import AbstractDataSet, DataSetError
+from mlflow.entities import Run, RunStatus, ViewType
+from mlflow.tracking import MlflowClient
+
+# the columns of the metrics history, the run id is the partition
+_COLUMNS = ["run_id", "key", "value", "timestamp", "step"]
+
+
+class MlflowExperimentMetricsDataSet(AbstractDataSet):
+    """This class represents the metrics history of all the runs of an
+    experiment, exported in a local parquet dataset partitioned by run id.
+
+    Loading the dataset first updates the export: only the runs which changed
+    since the previous export are fetched, concurrently, and the runs which were
+    deleted or which do not match the filter anymore are removed. ``pyarrow``
+    is required to write and read the parquet files.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        experiment_name: str,
+        filter_string: str = "",
+        metrics: Optional[List[str]] = None,
+        max_workers: int = 8,
+        update: bool = True,
+        tracking_uri: Optional[str] = None,
+    ):
+        """Initialise MlflowExperimentMetricsDataSet.
+
+        Args:
+            filepath (str): The local directory of the parquet dataset.
+            experiment_name (str): The name of the MLflow experiment.
+            filter_string (str): A filter of the runs, with the syntax of
+                ``mlflow.search_runs``, e.g. "tags.pipeline_name = 'training'".
+            metrics (Optional[List[str]]): The keys of the metrics to export.
+                Defaults to all the metrics of the runs.
+            max_workers (int): The number of runs fetched concurrently.
+            update (bool): Update the export from the tracking server on load.
+                If False, the existing export is loaded as is.
+            tracking_uri (Optional[str]): Defaults to the current tracking uri.
+        """
+        self._filepath = Path(filepath)
+        self._experiment_name = experiment_name
+        self._filter_string = filter_string
+        self._metrics = metrics
+        self._max_workers = max_workers
+        self._update = update
+        self._tracking_uri = tracking_uri
+
+    @property
+    def _state_path(self) -> Path:
+        # the files starting with "_" are ignored by the parquet readers
+        return self._filepath / "_export_state.json"
+
+    def export(self) -> Dict[str, int]:
+        """Update the export with the runs which changed on the tracking server.
+
+        Returns:
+            Dict[str, int]: The number of runs "exported", "unchanged"
+                and "removed", and the number of metric "values" exported.
+        """
+        client = MlflowClient(self._tracking_uri)
+        experiment = client.get_experiment_by_name(self._experiment_name)
+        if experiment is None:
+            raise DataSetError(
+                f"The experiment '{self._experiment_name}' does not exist"
+            )
+        runs = _search_all_runs(client, experiment.experiment_id, self._filter_string)
+
+        self._filepath.mkdir(parents=True, exist_ok=True)
+        state = (
+            json.loads(self._state_path.read_text())
+            if self._state_path.is_file()
+            else {}
+        )
+        # the export of a run is only updated when its latest metrics
+        # or its status changed, or when it was still running
+        new_state = {run.info.run_id: self._run_state(run) for run in runs}
+        changed_runs = [
+            run
+            for run in runs
+            if state.get(run.info.run_id) != new_state[run.info.run_id]
+            or run.info.status == RunStatus.to_string(RunStatus.RUNNING)
+        ]
+        removed_run_ids = set(state) - set(new_state)
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            nb_values = sum(
+                executor.map(lambda run: self._export_run(client, run), changed_runs)
+            )
+        for run_id in removed_run_ids:
+            shutil.rmtree(self._partition_path(run_id), ignore_errors=True)
+
+        # the state is written last: an interrupted export is updated again
+        tmp_state_path = self._state_path.with_suffix(".tmp")
+        tmp_state_path.write_text(json.dumps(new_state))
+        os.replace(tmp_state_path, self._state_path)
+        return dict(
+            exported=len(changed_runs),
+            unchanged=len(runs) - len(changed_runs),
+            removed=len(removed_run_ids),
+            values=nb_values,
+        )
+
+    def _load(self) -> pd.DataFrame:
+        """Load MlflowExperimentMetricsDataSet.
+
+        Returns:
+            pd.DataFrame: A row per value of the metrics history, with the
+                "run_id", "key", "value", "timestamp" and "step" columns.
+        """
+        if self._update:
+            self.export()
+        if not any(self._filepath.glob("run_id=*")):
+            return pd.DataFrame(columns=_COLUMNS)
+        data = pd.read_parquet(self._filepath.as_posix(), engine="pyarrow")
+        # the partition column is read as a category
+        data["run_id"] = data["run_id"].astype(str)
+        return data[_COLUMNS]
+
+    def _save(self, data: Any) -> None:
+        raise DataSetError(
+            "MlflowExperimentMetricsDataSet is read only, use MlflowMetricsDataSet to log metrics"
+        )
+
+    def _exists(self) -> bool:
+        return self._state_path.is_file()
+
+    def _describe(self) -> Dict[str, Any]:
+        """Describe MLflow experiment metrics dataset.
+
+        Returns:
+            Dict[str, Any]: Dictionary with MLflow experiment metrics dataset description.
+        """
+        return {
+            "filepath": self._filepath,
+            "experiment_name": self._experiment_name,
+            "filter_string": self._filter_string,
+            "metrics": self._metrics,
+        }
+
+    def _partition_path(self, run_id: str) -> Path:
+        return self._filepath / f"run_id={run_id}"
+
+    def _metrics_keys(self, run: Run) -> List[str]:
+        return sorted(
+            key
+            for key in run.data.metrics
+            if self._metrics is None or key in self._metrics
+        )
+
+    def _run_state(self, run: Run) -> Dict[str, Any]:
+        return dict(
+            status=run.info.status,
+            end_time=run.info.end_time,
+            metrics={
+                key: repr(run.data.metrics[key]) for key in self._metrics_keys(run)
+            },
+        )
+
+    def _export_run(self, client: MlflowClient, run: Run) -> int:
+        history = [
+            (metric.key, metric.value, metric.timestamp, metric.step)
+            for key in self._metrics_keys(run)
+            for metric in client.get_metric_history(run.info.run_id, key)
+        ]
+        data = pd.DataFrame(history, columns=_COLUMNS[1:]).astype(
+            {"key": str, "value": float, "timestamp": "int64", "step": "int64"}
+        )
+        partition_path = self._partition_path(run.info.run_id)
+        partition_path.mkdir(exist_ok=True)
+        # the partition is replaced at once, it is never read half written
+        tmp_path = partition_path / "_metrics.parquet.tmp"
+        data.to_parquet(tmp_path.as_posix(), engine="pyarrow", index=False)
+        os.replace(tmp_path, partition_path / "metrics.parquet")
+        return len(data)
+
+
+def _search_all_runs(
+    client: MlflowClient, experiment_id: str, filter_string: str
+) -> List[Run]:
+    runs = []
+    page_token = None
+    while True:
+        page = client.search_runs(
+            experiment_ids=[experiment_id],
+            filter_string=filter_string,
+            run_view_type=ViewType.ACTIVE_ONLY,
+            max_results=1000,
+            page_token=page_token,
+        )
+        runs.extend(page)
+        page_token = page.token
+        if not page_token:
+            return runs
@@ -1,4 +1,5 @@
-from functools import partial, reduce
+import time
+from functools import reduce
 from itertools import chain
 from typing import Any, Dict, Generator, List, Optional, Tuple, Union
 
@@ -6,6 +7,8 @@ import mlflow
 from kedro.io import AbstractDataSet, DataSetError
 from mlflow.tracking import MlflowClient
 
+from kedro_mlflow.framework.tracking.policy import get_tracking_policy
+
 MetricItem = Union[Dict[str, float], List[Dict[str, float]]]
 MetricTuple = Tuple[str, float, int]
 MetricsDict = Dict[str, MetricItem]
@@ -34,16 +37,17 @@ class MlflowMetricsDataSet(AbstractDataSet):
         """
         client = MlflowClient()
         run_id = self._get_run_id()
-        all_metrics = client._tracking_client.store.get_all_metrics(run_uuid=run_id)
-        dataset_metrics = filter(self._is_dataset_metric, all_metrics)
+        # the run holds the keys of the metrics of all tracking stores
+        all_metrics_keys = client.get_run(run_id).data.metrics.keys()
+        dataset_metrics_keys = filter(self._is_dataset_metric, all_metrics_keys)
         dataset = reduce(
-            lambda xs, x: self._update_metric(
-                # get_all_metrics returns last saved values per metric key.
+            lambda xs, key: self._update_metric(
+                # the run only holds the last saved value per metric key.
                 # All values are required here.
-                client.get_metric_history(run_id, x.key),
+                client.get_metric_history(run_id, key),
                 xs,
             ),
-            dataset_metrics,
+            dataset_metrics_keys,
             {},
         )
         return dataset
@@ -54,23 +58,27 @@ class MlflowMetricsDataSet(AbstractDataSet):
         Args:
             data (MetricsDict): MLflow metrics dataset.
         """
-        client = MlflowClient()
         try:
             run_id = self._get_run_id()
         except DataSetError:
             # If run_id can't be found log_metric would create new run.
-            run_id = None
+            run_id = mlflow.start_run().info.run_id
 
-        log_metric = (
-            partial(client.log_metric, run_id)
-            if run_id is not None
-            else mlflow.log_metric
-        )
+        policy = get_tracking_policy()
         metrics = (
             self._build_args_list_from_metric_item(k, v) for k, v, in data.items()
         )
         for k, v, i in chain.from_iterable(metrics):
-            log_metric(k, v, step=i)
+            # the timestamp is the one of the save even if
+            # the metric is sent later from the spool
+            policy.call(
+                "log_metric",
+                run_id=run_id,
+                key=k,
+                value=v,
+                timestamp=int(time.time() * 1000),
+                step=i,
+            )
 
     def _exists(self) -> bool:
         """Check if MLflow metrics dataset exists.
@@ -80,8 +88,8 @@ class MlflowMetricsDataSet(AbstractDataSet):
         """
         client = MlflowClient()
         run_id = self._get_run_id()
-        all_metrics = client._tracking_client.store.get_all_metrics(run_uuid=run_id)
-        return any(self._is_dataset_metric(x) for x in all_metrics)
+        all_metrics_keys = client.get_run(run_id).data.metrics.keys()
+        return any(self._is_dataset_metric(key) for key in all_metrics_keys)
 
     def _describe(self) -> Dict[str, Any]:
         """Describe MLflow metrics dataset.
@@ -111,15 +119,13 @@ class MlflowMetricsDataSet(AbstractDataSet):
             return run.info.run_id
         raise DataSetError("Cannot find run id.")
 
-    def _is_dataset_metric(self, metric: mlflow.entities.Metric) -> bool:
+    def _is_dataset_metric(self, key: str) -> bool:
         """Check if given metric belongs to dataset.
 
         Args:
-            metric (mlflow.entities.Metric): MLflow metric instance.
+            key (str): The key of a MLflow metric.
         """
-        return self._prefix is None or (
-            self._prefix and metric.key.startswith(self._prefix)
-        )
+        return self._prefix is None or (self._prefix and key.startswith(self._prefix))
 
     @staticmethod
     def _update_metric(
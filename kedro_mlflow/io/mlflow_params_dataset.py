@@ -0,0 +1,182 @@
+import ast
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import mlflow
+from kedro.io import AbstractDataSet, DataSetError
+from mlflow.entities import Param, RunStatus
+from mlflow.tracking import MlflowClient
+
+from kedro_mlflow.framework.hooks.node_hook import flatten_dict
+from kedro_mlflow.framework.tracking.policy import get_tracking_policy
+
+ParamsDict = Dict[str, Any]
+
+
+class MlflowParamsDataSet(AbstractDataSet):
+    """This class represents the parameters of a MLflow run,
+    e.g. the parameters logged by the ``MlflowNodeHook``.
+    """
+
+    # the params of the terminated runs cannot change, they are
+    # cached per tracking uri and run id and shared between the datasets
+    _cache: Dict[Tuple[str, str], Dict[str, str]] = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(
+        self,
+        run_id: str = None,
+        prefix: Optional[str] = None,
+        sep: str = ".",
+        unflatten: bool = True,
+    ):
+        """Initialise MlflowParamsDataSet.
+
+        Args:
+            run_id (str): ID of MLflow run. Defaults to the active run.
+            prefix (Optional[str]): Only load the params whose key starts
+                with "<prefix><sep>", and remove it from their key.
+                It is added to the keys of the saved params.
+            sep (str): The separator of the keys of the flattened
+                dictionaries, the ``hooks.node.sep`` of ``mlflow.yml``.
+            unflatten (bool): Rebuild the nested dictionaries from the
+                flattened keys on load, and flatten them on save.
+        """
+        self._run_id = run_id
+        self._prefix = prefix
+        self._sep = sep
+        self._unflatten = unflatten
+
+    def _load(self) -> ParamsDict:
+        """Load MlflowParamsDataSet.
+
+        The values are logged as strings by MLflow: they are converted back
+        to python literals (numbers, booleans, lists, None...) when possible.
+
+        Returns:
+            ParamsDict: Dictionary with the params of the run.
+        """
+        params = {
+            key: _parse_value(value)
+            for key, value in self._get_params(self._get_run_id()).items()
+            if self._is_dataset_param(key)
+        }
+        if self._prefix:
+            params = {
+                key[len(self._prefix) + len(self._sep) :]: value
+                for key, value in params.items()
+            }
+        return _unflatten_dict(params, self._sep) if self._unflatten else params
+
+    def _save(self, data: ParamsDict) -> None:
+        """Log given params in MLflow.
+
+        Args:
+            data (ParamsDict): The params, which may be nested dictionaries.
+        """
+        try:
+            run_id = self._get_run_id()
+        except DataSetError:
+            # If run_id can't be found log_batch would create new run.
+            run_id = mlflow.start_run().info.run_id
+
+        if self._unflatten:
+            data = flatten_dict(data, recursive=True, sep=self._sep)
+        if self._prefix:
+            data = {f"{self._prefix}{self._sep}{k}": v for k, v in data.items()}
+        get_tracking_policy().log_batch(
+            run_id, params=[Param(k, str(v)) for k, v in data.items()]
+        )
+        with self._cache_lock:
+            self._cache.pop((mlflow.get_tracking_uri(), run_id), None)
+
+    def _exists(self) -> bool:
+        """Check if MLflow params dataset exists.
+
+        Returns:
+            bool: Is MLflow params dataset exists?
+        """
+        return any(
+            self._is_dataset_param(key) for key in self._get_params(self._get_run_id())
+        )
+
+    def _describe(self) -> Dict[str, Any]:
+        """Describe MLflow params dataset.
+
+        Returns:
+            Dict[str, Any]: Dictionary with MLflow params dataset description.
+        """
+        return {
+            "run_id": self._run_id,
+            "prefix": self._prefix,
+            "sep": self._sep,
+            "unflatten": self._unflatten,
+        }
+
+    def _get_run_id(self) -> str:
+        """Get run id.
+
+        Raise `DataSetError` exception if run id can't be found.
+
+        Returns:
+            str: String contains run_id.
+        """
+        if self._run_id is not None:
+            return self._run_id
+        run = mlflow.active_run()
+        if run:
+            return run.info.run_id
+        raise DataSetError("Cannot find run id.")
+
+    def _get_params(self, run_id: str) -> Dict[str, str]:
+        """Get all the params of a run in a single call to the tracking server.
+
+        Args:
+            run_id (str): ID of MLflow run.
+
+        Returns:
+            Dict[str, str]: The params as logged in MLflow.
+        """
+        cache_key = (mlflow.get_tracking_uri(), run_id)
+        with self._cache_lock:
+            if cache_key in self._cache:
+                return self._cache[cache_key]
+        run = MlflowClient().get_run(run_id)
+        # new params can still be logged in a running run
+        if run.info.status != RunStatus.to_string(RunStatus.RUNNING):
+            with self._cache_lock:
+                self._cache[cache_key] = run.data.params
+        return run.data.params
+
+    def _is_dataset_param(self, key: str) -> bool:
+        """Check if given param belongs to dataset.
+
+        Args:
+            key (str): The key of a MLflow param.
+        """
+        return self._prefix is None or key.startswith(f"{self._prefix}{self._sep}")
+
+
+def _parse_value(value: str) -> Any:
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        # e.g. a string which was logged without its quotes
+        return value
+
+
+def _unflatten_dict(params: ParamsDict, sep: str) -> ParamsDict:
+    unflattened = {}
+    # the shortest keys first: a param which is also the prefix of
+    # other params is found before them, whatever the order of the keys
+    for key in sorted(params, key=lambda key: key.count(sep)):
+        *parents, leaf = key.split(sep)
+        node = unflattened
+        for i, parent in enumerate(parents):
+            node = node.setdefault(parent, {})
+            if not isinstance(node, dict):
+                raise DataSetError(
+                    f"The param '{key}' cannot be unflattened, '{sep.join(parents[: i + 1])}' is also a param. Use 'unflatten: False' to load it."
+                )
+        node[leaf] = params[key]
+    return unflattened
@@ -1,4 +1,4 @@
-from copy import deepcopy
+from copy import copy
 from pathlib import Path
 
 from kedro.io import DataCatalog, MemoryDataSet
@@ -7,14 +7,50 @@ from mlflow.pyfunc import PythonModel
 
 from kedro_mlflow.pipeline.pipeline_ml import PipelineML
 
+# the keys of the input of 'predict' to run another
+# inference pipeline than the default one, e.g.:
+# {"inference_name": "predict_with_explanations", "model_input": data}
+INFERENCE_NAME_KEY = "inference_name"
+MODEL_INPUT_KEY = "model_input"
+
 
 class KedroPipelineModel(PythonModel):
-    def __init__(self, pipeline_ml: PipelineML, catalog: DataCatalog):
+    def __init__(
+        self,
+        pipeline_ml: PipelineML,
+        catalog: DataCatalog,
+        preload_artifacts: bool = False,
+    ):
+        """Store the inference pipeline and the datasets of its artifacts.
+
+        Args:
+            pipeline_ml (PipelineML): The PipelineML whose inference
+                pipeline is run at each prediction.
+            catalog (DataCatalog): The catalog of the training run. Only
+                the datasets of the artifacts are stored in the model.
+            preload_artifacts (bool, optional): Load the artifacts once
+                when the model is loaded instead of reading them at each
+                'predict' call. The same objects are then given to all the
+                predictions, so the inference nodes must not modify them
+                in place. Defaults to False.
+        """
 
         self.pipeline_ml = pipeline_ml
-        self.initial_catalog = pipeline_ml.extract_pipeline_catalog(catalog)
+        self.preload_artifacts = preload_artifacts
+        self.initial_catalog = self._extract_artifacts_catalog(catalog)
         self.loaded_catalog = DataCatalog()
 
+    def _extract_artifacts_catalog(self, catalog: DataCatalog) -> DataCatalog:
+        # only the artifacts datasets are stored in the model: the dataset
+        # of the input_name may be a MemoryDataSet which holds the whole
+        # training data and must not be pickled with the model
+        pipeline_catalog = self.pipeline_ml.extract_pipeline_catalog(catalog)
+        artifacts_catalog = DataCatalog()
+        for name, data_set in pipeline_catalog._data_sets.items():
+            if name != self.pipeline_ml.input_name:
+                artifacts_catalog.add(data_set_name=name, data_set=data_set)
+        return artifacts_catalog
+
     def load_context(self, context):
 
         # a consistency check is made when loading the model
@@ -23,7 +59,7 @@ class KedroPipelineModel(PythonModel):
         # pipeline structure
         mlflow_artifacts_keys = set(context.artifacts.keys())
         kedro_artifacts_keys = set(
-            self.pipeline_ml.inference.inputs() - {self.pipeline_ml.input_name}
+            self.pipeline_ml._get_inference_inputs() - {self.pipeline_ml.input_name}
         )
         if mlflow_artifacts_keys != kedro_artifacts_keys:
             in_artifacts_but_not_inference = (
@@ -36,14 +72,30 @@ class KedroPipelineModel(PythonModel):
                 f"Provided artifacts do not match catalog entries:\n- 'artifacts - inference.inputs()' = : {in_artifacts_but_not_inference}'\n- 'inference.inputs() - artifacts' = : {in_inference_but_not_artifacts}'"
             )
 
-        self.loaded_catalog = deepcopy(self.initial_catalog)
+        # the datasets are shallow copied to point to the artifacts instead
+        # of deep copying the whole catalog, which is much faster at load time
+        self.loaded_catalog = DataCatalog()
         for name, uri in context.artifacts.items():
-            self.loaded_catalog._data_sets[name]._filepath = Path(uri)
+            data_set = copy(self.initial_catalog._data_sets[name])
+            data_set._filepath = Path(uri)
+            # the models logged before this option do not have the attribute
+            if getattr(self, "preload_artifacts", False):
+                # the "assign" copy mode does not copy the artifacts
+                # in each prediction, they are shared between predictions
+                data_set = MemoryDataSet(data=data_set.load(), copy_mode="assign")
+            self.loaded_catalog.add(data_set_name=name, data_set=data_set)
 
     def predict(self, context, model_input):
         # TODO : checkout out how to pass extra args in predict
         # for instance, to enable parallelization
 
+        # mlflow does not allow to pass parameters to 'predict',
+        # so the inference pipeline to run is given with the input
+        inference_name = None
+        if isinstance(model_input, dict) and INFERENCE_NAME_KEY in model_input:
+            inference_name = model_input[INFERENCE_NAME_KEY]
+            model_input = model_input[MODEL_INPUT_KEY]
+
         self.loaded_catalog.add(
             data_set_name=self.pipeline_ml.input_name,
             data_set=MemoryDataSet(model_input),
@@ -51,6 +103,7 @@ class KedroPipelineModel(PythonModel):
         )
         runner = SequentialRunner()
         run_outputs = runner.run(
-            pipeline=self.pipeline_ml.inference, catalog=self.loaded_catalog
+            pipeline=self.pipeline_ml.get_inference_pipeline(inference_name),
+            catalog=self.loaded_catalog,
         )
         return run_outputs
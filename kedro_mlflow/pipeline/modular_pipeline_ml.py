@@ -8,7 +8,7 @@ from kedro_mlflow.pipeline.pipeline_ml import PipelineML
 
 def pipeline_ml(
     training: Pipeline,
-    inference: Pipeline,
+    inference: Union[Pipeline, Dict[str, Pipeline]],
     input_name: str = None,
     conda_env: Optional[Union[str, Path, Dict[str, Any]]] = None,
     model_name: Optional[str] = "model",
@@ -20,13 +20,17 @@ def pipeline_ml(
             all mlflow artifacts for prediction (the model,
             but also encoders, binarizers, tokenizers...).
             These artifacts must be persisted in the catalog.yml.
-        inference (Pipeline): A `Pipeline` object which will be
-            stored in mlflow and use the output(s)
+        inference (Union[Pipeline, Dict[str, Pipeline]]): A `Pipeline`
+            object which will be stored in mlflow and use the output(s)
             of the training pipeline (namely, the model)
-            to predict the outcome.
+            to predict the outcome. It can also be a dictionary of
+            named inference pipelines which share the artifacts
+            of the training pipeline: they are all stored in the same
+            mlflow model, and the first one is the default one.
         input_name (str, optional): The name of the dataset in
             the catalog.yml which the model's user must provide
-            for prediction (i.e. the data). Defaults to None.
+            for prediction (i.e. the data). It must be an input
+            of all the inference pipelines. Defaults to None.
         conda_env (Union[str, Path, Dict[str, Any]], optional):
             The minimal conda environment necessary for the
             inference `Pipeline`. It can be either :
@@ -38,8 +42,9 @@ def pipeline_ml(
                     uploaded "as is".
                 - a Dict : used as the environment
                 - None: a base conda environment with your
-                    current python version and your project
-                    version at training time.
+                    current python version and the exact versions
+                    of the packages used by the inference pipeline
+                    at training time.
             Defaults to None.
         model_name (Union[str, None], optional): The name of
             the folder where the model will be stored in
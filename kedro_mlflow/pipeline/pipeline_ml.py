@@ -1,5 +1,6 @@
+import weakref
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, Optional, Union
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Union
 
 from kedro.io import DataCatalog, MemoryDataSet
 from kedro.pipeline import Pipeline
@@ -7,6 +8,15 @@ from kedro.pipeline.node import Node
 
 MSG_NOT_IMPLEMENTED = "This method is not implemented because it does not make sens for 'PipelineML'. Manipulate directly the training pipeline and recreate the 'PipelineML' with 'pipeline_ml' factory"
 
+# kedro computes the inputs of a pipeline by scanning all its nodes.
+# They are memoized for each inference pipeline, and shared by all the
+# PipelineML created from one another by filtering (from_nodes, tag...)
+# since they keep the same inference pipeline
+_INFERENCE_INPUTS_CACHE = weakref.WeakKeyDictionary()
+
+# the name of the inference pipeline when a single one is provided
+DEFAULT_INFERENCE_NAME = "inference"
+
 
 class PipelineML(Pipeline):
     """
@@ -33,7 +43,7 @@ class PipelineML(Pipeline):
         nodes: Iterable[Union[Node, Pipeline]],
         *args,
         tags: Optional[Union[str, Iterable[str]]] = None,
-        inference: Pipeline,
+        inference: Union[Pipeline, Dict[str, Pipeline]],
         input_name: str,
         conda_env: Optional[Union[str, Path, Dict[str, Any]]] = None,
         model_name: Optional[str] = "model",
@@ -47,13 +57,19 @@ class PipelineML(Pipeline):
             tags (Union[str, Iterable[str]], optional): Optional
                 set of tags to be applied to all the pipeline
                 nodes. Defaults to None.
-            inference (Pipeline): A `Pipeline` object which will be
-                stored in mlflow and use the output(s)
+            inference (Union[Pipeline, Dict[str, Pipeline]]): A `Pipeline`
+                object which will be stored in mlflow and use the output(s)
                 of the training pipeline (namely, the model)
-                to predict the outcome.
+                to predict the outcome. It can also be a dictionary of
+                named inference pipelines which share the artifacts
+                of the training pipeline (e.g. {"predict": ...,
+                "predict_with_explanations": ...}): they are all stored
+                in the same mlflow model, and the first one is
+                the default one.
             input_name (str, optional): The name of the dataset in
                 the catalog.yml which the model's user must provide
-                for prediction (i.e. the data). Defaults to None.
+                for prediction (i.e. the data). It must be an input
+                of all the inference pipelines. Defaults to None.
             conda_env (Union[str, Path, Dict[str, Any]], optional):
                 The minimal conda environment necessary for the
                 inference `Pipeline`. It can be either :
@@ -65,8 +81,9 @@ class PipelineML(Pipeline):
                         uploaded "as is".
                     - a Dict : used as the environment
                     - None: a base conda environment with your
-                        current python version and your project
-                        version at training time.
+                        current python version and the exact versions
+                        of the packages used by the inference pipeline
+                        at training time.
                 Defaults to None.
             model_name (Union[str, None], optional): The name of
                 the folder where the model will be stored in
@@ -75,16 +92,67 @@ class PipelineML(Pipeline):
 
         super().__init__(nodes, *args, tags=tags)
 
-        self.inference = inference
+        self._set_inference_pipelines(inference)
         self.conda_env = conda_env
         self.model_name = model_name
 
         self._check_input_name(input_name)
         self.input_name = input_name
 
+    def __setstate__(self, state):
+        # the models logged with an older version of kedro-mlflow
+        # hold a single inference pipeline
+        state.setdefault(
+            "inference_pipelines", {DEFAULT_INFERENCE_NAME: state["inference"]}
+        )
+        state.setdefault(
+            "default_inference_name", next(iter(state["inference_pipelines"]))
+        )
+        self.__dict__.update(state)
+
+    def _set_inference_pipelines(
+        self, inference: Union[Pipeline, Dict[str, Pipeline]]
+    ) -> None:
+        if isinstance(inference, Pipeline):
+            inference = {DEFAULT_INFERENCE_NAME: inference}
+        if not inference:
+            raise KedroMlflowPipelineMLInputsError(
+                "At least one inference pipeline must be provided."
+            )
+        self.inference_pipelines = dict(inference)
+        self.default_inference_name = next(iter(self.inference_pipelines))
+        self.inference = self.inference_pipelines[self.default_inference_name]
+
+    def get_inference_pipeline(self, inference_name: Optional[str] = None) -> Pipeline:
+        """Get an inference pipeline by its name,
+        or the default one if no name is given.
+        """
+        if inference_name is None:
+            return self.inference
+        try:
+            return self.inference_pipelines[inference_name]
+        except KeyError:
+            raise KedroMlflowPipelineMLInputsError(
+                f"inference_name='{inference_name}' but it must be one of: {list(self.inference_pipelines)}"
+            )
+
+    def _get_inference_inputs(self, inference_name: Optional[str] = None) -> Set[str]:
+        # the inputs of all the inference pipelines are returned
+        # if no name is given, since they share the same artifacts
+        if inference_name is None:
+            return set().union(
+                *(self._get_inference_inputs(name) for name in self.inference_pipelines)
+            )
+        inference = self.inference_pipelines[inference_name]
+        inference_inputs = _INFERENCE_INPUTS_CACHE.get(inference)
+        if inference_inputs is None:
+            inference_inputs = inference.inputs()
+            _INFERENCE_INPUTS_CACHE[inference] = inference_inputs
+        return inference_inputs
+
     def extract_pipeline_catalog(self, catalog: DataCatalog) -> DataCatalog:
         sub_catalog = DataCatalog()
-        for data_set_name in self.inference.inputs():
+        for data_set_name in self._get_inference_inputs():
             if data_set_name == self.input_name:
                 # there is no obligation that this dataset is persisted
                 # thus it is allowed to be an empty memory dataset
@@ -133,33 +201,40 @@ class PipelineML(Pipeline):
         return Pipeline(self.nodes)
 
     def _check_input_name(self, input_name: str) -> str:
-        allowed_names = self.inference.inputs()
-        pp_allowed_names = "\n - ".join(allowed_names)
-        if input_name not in allowed_names:
-            raise KedroMlflowPipelineMLInputsError(
-                f"input_name='{input_name}' but it must be an input of inference, i.e. one of: {pp_allowed_names}"
-            )
-        else:
-            free_inputs_set = (
-                self.inference.inputs() - {input_name} - self.all_outputs()
-            )
-            if len(free_inputs_set) > 0:
+        for inference_name in self.inference_pipelines:
+            allowed_names = self._get_inference_inputs(inference_name)
+            pp_allowed_names = "\n - ".join(allowed_names)
+            if input_name not in allowed_names:
                 raise KedroMlflowPipelineMLInputsError(
-                    """
-                    The following inputs are free for the inference pipeline:
-                    - {inputs}.
-                    No free input is allowed.
-                    Please make sure that 'inference.pipeline.inputs()' are all in 'training.pipeline.all_outputs()',
-                    except eventually 'input_name'.""".format(
-                        inputs="\n     - ".join(free_inputs_set)
-                    )
+                    f"input_name='{input_name}' but it must be an input of inference '{inference_name}', i.e. one of: {pp_allowed_names}"
                 )
+        free_inputs_set = (
+            self._get_inference_inputs() - {input_name} - self.all_outputs()
+        )
+        if len(free_inputs_set) > 0:
+            raise KedroMlflowPipelineMLInputsError(
+                """
+                The following inputs are free for the inference pipeline:
+                - {inputs}.
+                No free input is allowed.
+                Please make sure that 'inference.pipeline.inputs()' are all in 'training.pipeline.all_outputs()',
+                except eventually 'input_name'.""".format(
+                    inputs="\n     - ".join(free_inputs_set)
+                )
+            )
 
         return None
 
     def _turn_pipeline_to_ml(self, pipeline):
+        # the validation of the new PipelineML reuses the memoized inputs
+        # of the inference pipeline: only the training outputs, which are
+        # modified by the filtering, are scanned again
         return PipelineML(
-            nodes=pipeline.nodes, inference=self.inference, input_name=self.input_name
+            nodes=pipeline.nodes,
+            inference=self.inference_pipelines,
+            input_name=self.input_name,
+            conda_env=self.conda_env,
+            model_name=self.model_name,
         )
 
     def only_nodes_with_inputs(self, *inputs: str) -> "PipelineML":  # pragma: no cover
@@ -1,10 +1,9 @@
+import ast
 import re
 from pathlib import Path
-from typing import Dict, Union
+from typing import Dict, Optional, Union
 
-import yaml
 from kedro import __version__ as KEDRO_VERSION
-from kedro.framework.context import load_context
 
 KEDRO_YML = ".kedro.yml"
 
@@ -25,11 +24,16 @@ def _get_project_globals(project_path: Union[str, Path, None] = None) -> Dict[st
 
     if project_path is None:
         project_path = Path.cwd()
-    # for the project name, we have to load the context : it is the only place where it is recorded
-    project_context = load_context(project_path)
-    project_name = project_context.project_name
-
     kedro_yml = _read_kedro_yml(project_path)
+    # the project name is only recorded in the context: it is read in its source
+    # code first, since loading the context imports the whole project
+    project_name = _read_project_name(project_path, kedro_yml)
+    if project_name is None:
+        from kedro.framework.context import load_context
+
+        project_context = load_context(project_path)
+        project_name = project_context.project_name
+
     python_package = re.search(
         pattern=r"^(\w+)(?=\.)", string=kedro_yml["context_path"]
     ).group(1)
@@ -42,7 +46,44 @@ def _get_project_globals(project_path: Union[str, Path, None] = None) -> Dict[st
     )
 
 
+def _read_project_name(
+    project_path: Union[str, Path], kedro_yml: Dict[str, str]
+) -> Optional[str]:
+    """Read the ``project_name`` attribute of the context class
+    in its source file, without importing it.
+
+    Returns:
+        Optional[str] -- The name of the project, or None if it is
+            not a string literal of the context class.
+    """
+    module_name, _, class_name = kedro_yml["context_path"].rpartition(".")
+    source_path = (
+        Path(project_path)
+        / kedro_yml.get("source_dir", "src")
+        / (module_name.replace(".", "/") + ".py")
+    )
+    if not source_path.is_file():
+        return None
+    tree = ast.parse(source_path.read_text(encoding="utf-8"))
+    for class_node in tree.body:
+        if isinstance(class_node, ast.ClassDef) and class_node.name == class_name:
+            for statement in class_node.body:
+                if isinstance(statement, ast.Assign) and any(
+                    isinstance(target, ast.Name) and target.id == "project_name"
+                    for target in statement.targets
+                ):
+                    try:
+                        project_name = ast.literal_eval(statement.value)
+                    except ValueError:
+                        # e.g. the name is computed
+                        return None
+                    return project_name if isinstance(project_name, str) else None
+    return None
+
+
 def _read_kedro_yml(project_path: Union[str, Path, None] = None) -> Dict[str, str]:
+    import yaml
+
     project_path = _validate_project_path(project_path)
     kedro_yml_path = project_path / KEDRO_YML
 
@@ -69,9 +110,32 @@ def _already_updated(project_path: Union[str, Path, None] = None) -> bool:
     return flag
 
 
-def _parse_requirements(path, encoding="utf-8"):
+def _parse_requirements(path, encoding="utf-8", _visited=None):
+    """Parse a pip requirements file. The included files
+    ("-r other_requirements.txt") are parsed recursively, relatively
+    to the directory of the file which includes them, and the comments
+    are ignored. A file which is included several times (e.g. when
+    two files include each other) is only parsed once.
+    """
+    path = Path(path)
+    _visited = set() if _visited is None else _visited
+    if path.resolve() in _visited:
+        return []
+    _visited.add(path.resolve())
+    requirements = []
     with open(path, mode="r", encoding=encoding) as file_handler:
-        requirements = [
-            x.strip() for x in file_handler if x.strip() and not x.startswith("-r")
-        ]
+        for line in file_handler:
+            # like pip, "#" only starts a comment after a whitespace
+            line = re.sub(r"(^|\s)#.*$", "", line).strip()
+            if not line:
+                continue
+            include = re.match(r"^(-r|--requirement)[\s=]*(\S+)$", line)
+            if include:
+                requirements.extend(
+                    _parse_requirements(
+                        path.parent / include.group(2), encoding, _visited
+                    )
+                )
+            else:
+                requirements.append(line)
     return requirements
@@ -0,0 +1,33 @@
+from collections import namedtuple
+
+import mlflow
+import pytest
+from mlflow.tracking import MlflowClient
+
+TrackingStore = namedtuple("TrackingStore", ["name", "uri", "experiment_id", "path"])
+
+
+@pytest.fixture(params=["file", "sqlite"], scope="module")
+def tracking_store(request, tmp_path_factory):
+    """The benchmarks are run against a local file store and a sqlite store,
+    which stands in for a tracking server backed by a database.
+    """
+    tmp_path = tmp_path_factory.mktemp(f"{request.param}_store")
+    if request.param == "file":
+        tracking_uri = (tmp_path / "mlruns").as_uri()
+    else:
+        tracking_uri = f"sqlite:///{(tmp_path / 'mlruns.db').as_posix()}"
+
+    # the artifacts of the sqlite store would be stored
+    # in the current directory with the default experiment
+    experiment_id = MlflowClient(tracking_uri).create_experiment(
+        "benchmarks", artifact_location=(tmp_path / "artifacts").as_uri()
+    )
+    mlflow.set_tracking_uri(tracking_uri)
+    yield TrackingStore(
+        name=request.param,
+        uri=tracking_uri,
+        experiment_id=experiment_id,
+        path=tmp_path,
+    )
+    mlflow.set_tracking_uri(None)
@@ -0,0 +1,12 @@
+import subprocess
+import sys
+
+
+def test_benchmark_cli_import(benchmark):
+    # the plugin is imported by every kedro command, "kedro --help" included
+    benchmark.pedantic(
+        subprocess.check_call,
+        args=([sys.executable, "-c", "import kedro_mlflow.framework.cli.cli"],),
+        rounds=10,
+        iterations=1,
+    )
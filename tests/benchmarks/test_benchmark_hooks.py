@@ -0,0 +1,92 @@
+from itertools import count
+
+import mlflow
+import pytest
+import yaml
+from kedro.io import DataCatalog, MemoryDataSet
+from kedro.pipeline import Pipeline, node
+
+from kedro_mlflow.framework.hooks import MlflowNodeHook, MlflowPipelineHook
+
+
+def identity(*args):
+    return args
+
+
+@pytest.fixture
+def kedro_project(tmp_path, tracking_store):
+    (tmp_path / ".kedro.yml").write_text("")
+    (tmp_path / "conf" / "local").mkdir(parents=True)
+    (tmp_path / "conf" / "base").mkdir()
+    (tmp_path / "conf" / "base" / "mlflow.yml").write_text(
+        yaml.dump(
+            dict(
+                mlflow_tracking_uri=tracking_store.uri,
+                experiment=dict(name="benchmarks", create=False),
+            )
+        )
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def run_params(kedro_project):
+    return {
+        "run_id": "abcdef",
+        "project_path": kedro_project.as_posix(),
+        "env": "local",
+        "kedro_version": "0.16.4",
+        "tags": [],
+        "from_nodes": [],
+        "to_nodes": [],
+        "node_names": [],
+        "from_inputs": [],
+        "load_versions": [],
+        "pipeline_name": "__default__",
+        "extra_params": [],
+    }
+
+
+def test_pipeline_hook_run_start_end(benchmark, run_params):
+    pipeline = Pipeline([node(identity, inputs="a", outputs="b")])
+    catalog = DataCatalog({"a": MemoryDataSet(1)})
+    pipeline_hook = MlflowPipelineHook()
+
+    def start_and_end_run():
+        pipeline_hook.before_pipeline_run(
+            run_params=run_params, pipeline=pipeline, catalog=catalog
+        )
+        pipeline_hook.after_pipeline_run(
+            run_params=run_params, pipeline=pipeline, catalog=catalog
+        )
+
+    benchmark.pedantic(start_and_end_run, rounds=10, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("nb_params", [1, 100])
+def test_node_hook_params_logging(
+    benchmark, monkeypatch, tracking_store, kedro_project, nb_params
+):
+    monkeypatch.chdir(kedro_project)
+    node_hook = MlflowNodeHook()
+    # mlflow forbids to log a parameter twice with another value,
+    # so new parameters are logged at each round
+    rounds = count()
+
+    def setup():
+        i = next(rounds)
+        inputs = {f"params:param_{i}_{j}": j for j in range(nb_params)}
+        params_node = node(identity, inputs=list(inputs), outputs=f"out_{i}")
+        return (), dict(node=params_node, inputs=inputs)
+
+    def log_params(node, inputs):
+        node_hook.before_node_run(
+            node=node,
+            catalog=DataCatalog(),
+            inputs=inputs,
+            is_async=False,
+            run_id="abcdef",
+        )
+
+    with mlflow.start_run(experiment_id=tracking_store.experiment_id):
+        benchmark.pedantic(log_params, setup=setup, rounds=10)
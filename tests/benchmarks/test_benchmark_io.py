@@ -0,0 +1,57 @@
+import mlflow
+import pytest
+from kedro.extras.datasets.pickle import PickleDataSet
+
+from kedro_mlflow.io import MlflowDataSet, MlflowMetricsDataSet
+
+METRICS_SIZES = [10, 1000, 100000]
+
+
+def _metrics(nb_points):
+    return {"metric": [{"value": float(i), "step": i} for i in range(nb_points)]}
+
+
+@pytest.mark.parametrize("nb_points", METRICS_SIZES)
+def test_metrics_dataset_save(benchmark, tracking_store, nb_points):
+    if nb_points > 1000 and tracking_store.name != "file":
+        # each point is a call to the store, which takes ~15 minutes with sqlite
+        pytest.skip("The largest metrics are only saved in a file store")
+    metrics = _metrics(nb_points)
+
+    def setup():
+        # each round saves the metrics in a new run
+        run_id = mlflow.start_run(
+            experiment_id=tracking_store.experiment_id
+        ).info.run_id
+        mlflow.end_run()
+        return (MlflowMetricsDataSet(run_id=run_id, prefix="bench"),), {}
+
+    benchmark.pedantic(
+        lambda dataset: dataset.save(metrics),
+        setup=setup,
+        rounds=max(1, 1000 // nb_points),
+    )
+
+
+@pytest.mark.parametrize("nb_points", METRICS_SIZES)
+def test_metrics_dataset_load(benchmark, tracking_store, nb_points):
+    if tracking_store.name != "file" and nb_points > 1000:
+        pytest.skip("The largest metrics are only saved in a file store")
+    with mlflow.start_run(experiment_id=tracking_store.experiment_id):
+        run_id = mlflow.active_run().info.run_id
+    dataset = MlflowMetricsDataSet(run_id=run_id, prefix="bench")
+    dataset.save(_metrics(nb_points))
+
+    benchmark.pedantic(dataset.load, rounds=max(1, 1000 // nb_points))
+
+
+@pytest.mark.parametrize("size_mb", [0.001, 100])
+def test_mlflow_dataset_save(benchmark, tmp_path, tracking_store, size_mb):
+    data = b"0" * int(size_mb * 2 ** 20)
+    dataset = MlflowDataSet(
+        data_set=dict(type=PickleDataSet, filepath=(tmp_path / "data.pkl").as_posix()),
+        artifact_path="benchmark",
+    )
+
+    with mlflow.start_run(experiment_id=tracking_store.experiment_id):
+        benchmark.pedantic(dataset.save, args=(data,), rounds=5)
@@ -0,0 +1,56 @@
+import mlflow
+import pandas as pd
+import pytest
+from kedro.extras.datasets.pickle import PickleDataSet
+from kedro.io import DataCatalog, MemoryDataSet
+from kedro.pipeline import Pipeline, node
+
+from kedro_mlflow.framework.hooks.model_logging import _log_model
+from kedro_mlflow.mlflow import KedroPipelineModel
+from kedro_mlflow.pipeline import pipeline_ml
+
+
+def fit_fun(data):
+    return data.mean()
+
+
+def predict_fun(model, data):
+    return data - model
+
+
+@pytest.fixture
+def loaded_model(tmp_path, tracking_store):
+    pipeline = pipeline_ml(
+        training=Pipeline([node(fit_fun, inputs="data", outputs="model")]),
+        inference=Pipeline(
+            [node(predict_fun, inputs=["model", "data"], outputs="predictions")]
+        ),
+        input_name="data",
+    )
+    catalog = DataCatalog(
+        {
+            "data": MemoryDataSet(),
+            "model": PickleDataSet((tmp_path / "model.pkl").as_posix()),
+        }
+    )
+    catalog.save("model", pd.Series({"a": 1.0, "b": 2.0}))
+
+    with mlflow.start_run(experiment_id=tracking_store.experiment_id):
+        _log_model(
+            artifact_path="model",
+            python_model=KedroPipelineModel(pipeline_ml=pipeline, catalog=catalog),
+            artifacts=pipeline.extract_pipeline_artifacts(catalog),
+            conda_env={"python": "3.7.0"},
+        )
+        run_id = mlflow.active_run().info.run_id
+
+    return mlflow.pyfunc.load_model(f"runs:/{run_id}/model")
+
+
+@pytest.mark.parametrize("nb_rows", [1, 100000])
+def test_pipeline_model_predict(benchmark, loaded_model, nb_rows):
+    data = pd.DataFrame({"a": range(nb_rows), "b": range(nb_rows)})
+    # the latency is measured with a single row,
+    # and the throughput (rows per second) with many rows
+    benchmark.extra_info["rows"] = nb_rows
+    benchmark(loaded_model.predict, data)
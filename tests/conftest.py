@@ -5,6 +5,21 @@ import pytest
 import yaml
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmarks",
+        action="store_true",
+        help="Run the benchmarks of tests/benchmarks (requires pytest-benchmark).",
+    )
+
+
+def pytest_ignore_collect(path, config):
+    # the benchmarks are slow and need pytest-benchmark: they are only
+    # collected on demand, so that the default test run is unchanged
+    if path.basename == "benchmarks" and not config.getoption("--benchmarks"):
+        return True
+
+
 def _write_yaml(filepath: Path, config: Dict):
     filepath.parent.mkdir(parents=True, exist_ok=True)
     yaml_str = yaml.dump(config)
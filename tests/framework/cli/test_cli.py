@@ -1,15 +1,25 @@
 import re
+import socket
 import subprocess
+import sys
 
 import pytest
+import yaml
 from click.testing import CliRunner
 from cookiecutter.main import cookiecutter
 from kedro import __version__ as kedro_version
 from kedro.framework.cli.cli import TEMPLATE_PATH, info
+from mlflow.tracking import MlflowClient
 
+from kedro_mlflow.framework.cli.cli import _find_free_port
+from kedro_mlflow.framework.cli.cli import export_metrics as cli_export_metrics
 from kedro_mlflow.framework.cli.cli import init as cli_init
+from kedro_mlflow.framework.cli.cli import migrate_store as cli_migrate_store
 from kedro_mlflow.framework.cli.cli import mlflow_commands as cli_mlflow
+from kedro_mlflow.framework.cli.cli import runs as cli_runs
 from kedro_mlflow.framework.cli.cli import ui as cli_ui
+from kedro_mlflow.framework.context import get_mlflow_config
+from kedro_mlflow.utils import _get_project_globals
 
 
 @pytest.fixture
@@ -81,7 +91,9 @@ def test_mlflow_commands_inside_initialized_kedro_project(
     subprocess.call(["kedro", "mlflow", "init"])
     cli_runner = CliRunner()
     result = cli_runner.invoke(cli_mlflow)
-    assert {"init", "ui"} == set(extract_cmd_from_help(result.output))
+    assert {"init", "ui", "sync", "migrate-store", "runs", "export-metrics"} == set(
+        extract_cmd_from_help(result.output)
+    )
     assert "You have not updated your template yet" not in result.output
 
 
@@ -162,3 +174,235 @@ def test_ui_is_up(monkeypatch, mocker, tmp_path, kedro_project):
     #     raise err
     # print(thread)
     # assert thread.is_alive()
+
+
+def test_cli_import_is_lazy():
+    # the plugin is imported by every kedro command through its entry
+    # points: the heavy dependencies must only be imported by the commands
+    script = (
+        "import sys; import kedro_mlflow.framework.cli.cli;"
+        "print(' '.join(sorted({m.split('.')[0] for m in sys.modules})))"
+    )
+    imported_modules = (
+        subprocess.check_output([sys.executable, "-c", script]).decode().split()
+    )
+    for module in ["mlflow", "jinja2", "yaml", "pandas"]:
+        assert module not in imported_modules
+
+
+def test_mlflow_commands_inspect_project_once(mocker, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    is_kedro_project = mocker.patch(
+        "kedro_mlflow.framework.cli.cli._is_kedro_project", return_value=False
+    )
+    cli_runner = CliRunner()
+    result = cli_runner.invoke(cli_mlflow, ["--help"])
+    assert {"new"} == set(extract_cmd_from_help(result.output))
+    # the help lists the commands then gets each of them
+    assert is_kedro_project.call_count == 1
+
+
+def test_get_project_globals_does_not_load_context(mocker, tmp_path, kedro_project):
+    load_context = mocker.patch("kedro.framework.context.load_context")
+    project_globals = _get_project_globals(tmp_path / "fake-project")
+    assert project_globals == dict(
+        context_path="fake_project/run/ProjectContext",
+        project_name="This is a fake project",
+        python_package="fake_project",
+        kedro_version=kedro_version,
+    )
+    load_context.assert_not_called()
+
+
+def test_get_project_globals_with_computed_project_name(
+    mocker, tmp_path, kedro_project
+):
+    runpy_path = tmp_path / "fake-project" / "src" / "fake_project" / "run.py"
+    runpy_path.write_text(
+        runpy_path.read_text().replace(
+            'project_name = "This is a fake project"',
+            'project_name = " ".join(["This", "is", "a", "fake", "project"])',
+        )
+    )
+    load_context = mocker.patch("kedro.framework.context.load_context")
+    load_context.return_value.project_name = "This is a fake project"
+    project_globals = _get_project_globals(tmp_path / "fake-project")
+    # the context is loaded when the name cannot be read statically
+    assert project_globals["project_name"] == "This is a fake project"
+    load_context.assert_called_once()
+
+
+def test_ui_honours_mlflow_yml(monkeypatch, mocker, tmp_path, kedro_project):
+    project_path = tmp_path / "fake-project"
+    monkeypatch.chdir(project_path)
+    cli_runner = CliRunner()
+    cli_runner.invoke(cli_init)
+    (project_path / "conf" / "local" / "mlflow.yml").write_text(
+        yaml.dump(dict(ui=dict(port=5151, host="0.0.0.0")))
+    )
+
+    ui_mocker = mocker.patch("subprocess.call")
+    result = cli_runner.invoke(cli_ui)
+    assert result.exit_code == 0
+    assert ui_mocker.call_args[0][0] == [
+        "mlflow",
+        "ui",
+        "--backend-store-uri",
+        (project_path / "mlruns").as_uri(),
+        "--host",
+        "0.0.0.0",
+        "--port",
+        "5151",
+    ]
+
+
+def test_ui_server_mode(monkeypatch, mocker, tmp_path, kedro_project):
+    project_path = tmp_path / "fake-project"
+    monkeypatch.chdir(project_path)
+    cli_runner = CliRunner()
+    cli_runner.invoke(cli_init)
+    (project_path / "conf" / "local" / "mlflow.yml").write_text(
+        yaml.dump(
+            dict(
+                mlflow_tracking_uri=f"sqlite:///{(project_path / 'mlflow.db').as_posix()}",
+                ui=dict(port=5151, server=True),
+            )
+        )
+    )
+
+    ui_mocker = mocker.patch("subprocess.call")
+    # the command line overrides mlflow.yml
+    result = cli_runner.invoke(cli_ui, ["--port", "5252", "--workers", "8"])
+    assert result.exit_code == 0
+    assert ui_mocker.call_args[0][0] == [
+        "mlflow",
+        "server",
+        "--backend-store-uri",
+        f"sqlite:///{(project_path / 'mlflow.db').as_posix()}",
+        "--default-artifact-root",
+        (project_path / "mlruns").as_uri(),
+        "--workers",
+        "8",
+        "--host",
+        "localhost",
+        "--port",
+        "5252",
+    ]
+
+
+def test_ui_workers_without_server(monkeypatch, mocker, tmp_path, kedro_project):
+    project_path = tmp_path / "fake-project"
+    monkeypatch.chdir(project_path)
+    cli_runner = CliRunner()
+    cli_runner.invoke(cli_init)
+
+    ui_mocker = mocker.patch("subprocess.call")
+    result = cli_runner.invoke(cli_ui, ["--workers", "8"])
+    assert result.exit_code != 0
+    assert "'--workers' can only be used with '--server'" in result.output
+    ui_mocker.assert_not_called()
+
+
+def test_find_free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("localhost", 0))
+        busy_port = sock.getsockname()[1]
+        port = _find_free_port("localhost", default_port=busy_port)
+    assert port != busy_port
+
+
+def test_cli_migrate_store(monkeypatch, tmp_path, kedro_project):
+    project_path = tmp_path / "fake-project"
+    monkeypatch.chdir(project_path)
+    cli_runner = CliRunner()
+    cli_runner.invoke(cli_init)
+    mlflow_client = MlflowClient((project_path / "mlruns").as_uri())
+    run_id = mlflow_client.create_run("0").info.run_id
+    mlflow_client.log_param(run_id, "alpha", "0.1")
+    mlflow_client.set_terminated(run_id)
+
+    db_uri = f"sqlite:///{(tmp_path / 'mlflow.db').as_posix()}"
+    result = cli_runner.invoke(cli_migrate_store, ["--db-uri", db_uri])
+
+    assert result.exit_code == 0
+    assert "1 run(s) of 2 experiment(s) migrated" in result.output
+    assert MlflowClient(db_uri).get_run(run_id).data.params == {"alpha": "0.1"}
+    # the configuration of the project now uses the database, its comments are kept
+    mlflow_yml = (project_path / "conf" / "base" / "mlflow.yml").read_text()
+    assert f"mlflow_tracking_uri: {db_uri}\n" in mlflow_yml
+    assert "# GLOBAL CONFIGURATION" in mlflow_yml
+    assert get_mlflow_config(project_path).mlflow_tracking_uri == db_uri
+
+    # the runs are not migrated from a database
+    result = cli_runner.invoke(cli_migrate_store, ["--db-uri", db_uri])
+    assert result.exit_code != 0
+    assert "must be a file store to be migrated" in str(result.exception)
+
+
+def test_cli_runs(monkeypatch, tmp_path, kedro_project):
+    project_path = tmp_path / "fake-project"
+    monkeypatch.chdir(project_path)
+    cli_runner = CliRunner()
+    cli_runner.invoke(cli_init)
+    mlflow_conf = get_mlflow_config(project_path)
+    mlflow_client = MlflowClient(mlflow_conf.mlflow_tracking_uri)
+    run_ids = []
+    for pipeline_name, rmse in [
+        ("training", 0.5),
+        ("inference", 0.2),
+        ("training", 0.1),
+    ]:
+        run_id = mlflow_client.create_run(
+            mlflow_conf.experiment.experiment_id
+        ).info.run_id
+        mlflow_client.set_tag(run_id, "pipeline_name", pipeline_name)
+        mlflow_client.log_metric(run_id, "rmse", rmse)
+        mlflow_client.set_terminated(run_id)
+        run_ids.append(run_id)
+
+    result = cli_runner.invoke(
+        cli_runs,
+        ["--filter", "tags.pipeline_name = training", "--order-by", "metrics.rmse"],
+    )
+    assert result.exit_code == 0
+    assert "3 run(s) fetched from the tracking server" in result.output
+    lines = result.output.splitlines()
+    assert "metrics.rmse" in lines[1]
+    assert [line.split()[0] for line in lines[2:]] == [run_ids[2], run_ids[0]]
+    assert (project_path / "mlflow_runs_index.db").is_file()
+
+    result = cli_runner.invoke(
+        cli_runs, ["--no-sync", "--export", (tmp_path / "runs.csv").as_posix()]
+    )
+    assert result.exit_code == 0
+    assert "fetched" not in result.output
+    assert "3 run(s) exported" in result.output
+
+    result = cli_runner.invoke(cli_runs, ["--no-sync", "--filter", "metrics.rmse"])
+    assert result.exit_code != 0
+    assert "Invalid filter" in result.output
+
+
+def test_cli_export_metrics(monkeypatch, tmp_path, kedro_project):
+    pytest.importorskip("pyarrow")
+    project_path = tmp_path / "fake-project"
+    monkeypatch.chdir(project_path)
+    cli_runner = CliRunner()
+    cli_runner.invoke(cli_init)
+    mlflow_conf = get_mlflow_config(project_path)
+    mlflow_client = MlflowClient(mlflow_conf.mlflow_tracking_uri)
+    run_id = mlflow_client.create_run(mlflow_conf.experiment.experiment_id).info.run_id
+    for step in range(3):
+        mlflow_client.log_metric(run_id, "loss", 1 / (step + 1), step=step)
+    mlflow_client.set_terminated(run_id)
+
+    output = (tmp_path / "metrics").as_posix()
+    result = cli_runner.invoke(cli_export_metrics, ["--output", output])
+    assert result.exit_code == 0
+    assert f"1 run(s) exported to '{output}' (3 metric values" in result.output
+    assert (tmp_path / "metrics" / f"run_id={run_id}" / "metrics.parquet").is_file()
+
+    result = cli_runner.invoke(cli_export_metrics, ["--output", output])
+    assert result.exit_code == 0
+    assert "0 run(s) exported" in result.output
+    assert "1 run(s) unchanged" in result.output
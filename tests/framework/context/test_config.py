@@ -55,7 +55,12 @@ def test_kedro_mlflow_config_init(tmp_path):
         experiments=KedroMlflowConfig.EXPERIMENT_OPTS,
         run=KedroMlflowConfig.RUN_OPTS,
         ui=KedroMlflowConfig.UI_OPTS,
-        hooks=dict(node=KedroMlflowConfig.NODE_HOOK_OPTS),
+        spool=KedroMlflowConfig.SPOOL_OPTS,
+        tracking_policy=KedroMlflowConfig.TRACKING_POLICY_OPTS,
+        hooks=dict(
+            node=KedroMlflowConfig.NODE_HOOK_OPTS,
+            pipeline=KedroMlflowConfig.PIPELINE_HOOK_OPTS,
+        ),
     )
 
 
@@ -140,3 +145,108 @@ def test_from_dict_to_dict_idempotent(mocker, tmp_path):
     # modify config
     config.from_dict(original_config_dict)
     assert config.to_dict() == original_config_dict
+
+
+def test_kedro_mlflow_config_with_spool(mocker, tmp_path):
+    mocker.patch("kedro_mlflow.utils._is_kedro_project", return_value=True)
+
+    config = KedroMlflowConfig(
+        project_path=tmp_path,
+        mlflow_tracking_uri="http://unreachable-server:5000",
+        experiment_opts=dict(name="exp1"),
+        spool_opts=dict(enabled=True),
+    )
+    # the tracking server is not called, the experiment is created in the spool
+    assert config.runs_tracking_uri == (tmp_path / "mlruns_spool").as_uri()
+    assert config.mlflow_tracking_uri == "http://unreachable-server:5000"
+    assert "exp1" in [
+        exp.name for exp in MlflowClient(config.runs_tracking_uri).list_experiments()
+    ]
+
+
+def test_kedro_mlflow_config_invalid_spool_sync(mocker, tmp_path):
+    mocker.patch("kedro_mlflow.utils._is_kedro_project", return_value=True)
+
+    with pytest.raises(KedroMlflowConfigError, match="'spool.sync' must be one of"):
+        KedroMlflowConfig(
+            project_path=tmp_path, spool_opts=dict(enabled=True, sync="sometimes"),
+        )
+
+
+def test_kedro_mlflow_config_unavailable_server_falls_back_to_spool(mocker, tmp_path):
+    mocker.patch("kedro_mlflow.utils._is_kedro_project", return_value=True)
+    get_or_create_experiment = KedroMlflowConfig._get_or_create_experiment
+
+    def fail_on_server(self):
+        if not self.offline:
+            raise ConnectionError("Connection refused")
+        return get_or_create_experiment(self)
+
+    mocker.patch.object(KedroMlflowConfig, "_get_or_create_experiment", fail_on_server)
+
+    config = KedroMlflowConfig(
+        project_path=tmp_path,
+        mlflow_tracking_uri="http://unreachable-server:5000",
+        experiment_opts=dict(name="exp1"),
+        tracking_policy_opts=dict(failures_threshold=3),
+    )
+    assert config.offline
+    assert config.runs_tracking_uri == (tmp_path / "mlruns_spool").as_uri()
+    assert config.experiment.name == "exp1"
+
+
+def test_kedro_mlflow_config_unavailable_server_without_fallback(mocker, tmp_path):
+    mocker.patch("kedro_mlflow.utils._is_kedro_project", return_value=True)
+    mocker.patch.object(
+        KedroMlflowConfig,
+        "_get_or_create_experiment",
+        side_effect=ConnectionError("Connection refused"),
+    )
+
+    with pytest.raises(ConnectionError, match="Connection refused"):
+        KedroMlflowConfig(
+            project_path=tmp_path, mlflow_tracking_uri="http://unreachable-server:5000",
+        )
+
+
+@pytest.mark.parametrize(
+    "tracking_policy_opts",
+    [
+        dict(timeout=0),
+        dict(max_retries=-1),
+        dict(max_retries=1.5),
+        dict(backoff_factor=-1),
+        dict(failures_threshold=0),
+    ],
+)
+def test_kedro_mlflow_config_invalid_tracking_policy(
+    mocker, tmp_path, tracking_policy_opts
+):
+    mocker.patch("kedro_mlflow.utils._is_kedro_project", return_value=True)
+
+    with pytest.raises(KedroMlflowConfigError, match="'tracking_policy."):
+        KedroMlflowConfig(
+            project_path=tmp_path, tracking_policy_opts=tracking_policy_opts
+        )
+
+
+def test_kedro_mlflow_config_ui_workers_without_server(mocker, tmp_path):
+    mocker.patch("kedro_mlflow.utils._is_kedro_project", return_value=True)
+
+    with pytest.raises(KedroMlflowConfigError, match="'ui.workers' can only be set"):
+        KedroMlflowConfig(project_path=tmp_path, ui_opts=dict(workers=4))
+
+
+@pytest.mark.parametrize("interval", [0, -1, "1s"])
+def test_kedro_mlflow_config_invalid_resources_sampling_interval(
+    mocker, tmp_path, interval
+):
+    mocker.patch("kedro_mlflow.utils._is_kedro_project", return_value=True)
+
+    with pytest.raises(
+        KedroMlflowConfigError, match="'hooks.pipeline.resources_sampling_interval'"
+    ):
+        KedroMlflowConfig(
+            project_path=tmp_path,
+            pipeline_hook_opts=dict(resources_sampling_interval=interval),
+        )
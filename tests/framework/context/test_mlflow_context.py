@@ -23,16 +23,39 @@ def test_get_mlflow_config(mocker, tmp_path, config_dir):
             experiment=dict(name="fake_package", create=True),
             run=dict(id="123456789", name="my_run", nested=True),
             ui=dict(port="5151", host="localhost"),
-            hooks=dict(node=dict(flatten_dict_params=True, recursive=False, sep="-")),
+            hooks=dict(
+                node=dict(flatten_dict_params=True, recursive=False, sep="-"),
+                pipeline=dict(skip_unchanged_model=True),
+            ),
         ),
     )
     expected = {
         "mlflow_tracking_uri": (tmp_path / "mlruns").as_uri(),
         "experiments": {"name": "fake_package", "create": True},
         "run": {"id": "123456789", "name": "my_run", "nested": True},
-        "ui": {"port": "5151", "host": "localhost"},
+        "ui": {"port": "5151", "host": "localhost", "server": False, "workers": None},
+        "spool": {"enabled": False, "path": "mlruns_spool", "sync": None},
+        "tracking_policy": {
+            "timeout": None,
+            "max_retries": 0,
+            "backoff_factor": 1,
+            "failures_threshold": None,
+        },
         "hooks": {
-            "node": {"flatten_dict_params": True, "recursive": False, "sep": "-"}
+            "node": {
+                "flatten_dict_params": True,
+                "recursive": False,
+                "sep": "-",
+                "log_performance": False,
+                "profile": [],
+            },
+            "pipeline": {
+                "skip_unchanged_model": True,
+                "signature_from_persisted_input": False,
+                "log_datasets_performance": False,
+                "log_timeline": False,
+                "resources_sampling_interval": None,
+            },
         },
     }
     assert get_mlflow_config(project_path=tmp_path, env="local").to_dict() == expected
@@ -0,0 +1,79 @@
+import csv
+import pickle
+
+import mlflow
+from kedro.extras.datasets.pickle import PickleDataSet
+from kedro.io import DataCatalog, MemoryDataSet
+from kedro.pipeline import Pipeline, node
+from kedro.runner import SequentialRunner
+from mlflow.tracking import MlflowClient
+
+from kedro_mlflow.framework.hooks.datasets_performance import (
+    DatasetsPerformanceTransformer,
+)
+
+
+def fit_fun(data):
+    return data * 2
+
+
+def predict_fun(model, data):
+    return model + data
+
+
+def test_datasets_performance_transformer(tmp_path):
+    pipeline = Pipeline(
+        [
+            node(func=fit_fun, inputs="data", outputs="model"),
+            node(func=predict_fun, inputs=["model", "data"], outputs="predictions"),
+        ]
+    )
+    catalog = DataCatalog(
+        {
+            "data": MemoryDataSet(1),
+            "model": PickleDataSet((tmp_path / "model.pkl").as_posix()),
+        }
+    )
+
+    transformer = DatasetsPerformanceTransformer()
+    transformer.instrument(catalog)
+    SequentialRunner().run(pipeline, catalog)
+    transformer.restore()
+
+    # the transformer is removed from the catalog
+    assert all(transformer not in t for t in catalog._transformers.values())
+    assert transformer not in catalog._default_transformers
+    summary = {row["dataset"]: row for row in transformer.summarize()}
+    assert summary["data"]["load_count"] == 2
+    assert summary["data"]["size_bytes"] is None
+    assert summary["model"]["save_count"] == 1
+    assert summary["model"]["size_bytes"] == (tmp_path / "model.pkl").stat().st_size
+
+    mlflow_tracking_uri = (tmp_path / "mlruns").as_uri()
+    mlflow.set_tracking_uri(mlflow_tracking_uri)
+    with mlflow.start_run():
+        transformer.log()
+        run_id = mlflow.active_run().info.run_id
+
+    mlflow_client = MlflowClient(mlflow_tracking_uri)
+    metrics = mlflow_client.get_run(run_id).data.metrics
+    assert "dataset.model.save_time_s" in metrics
+    assert "dataset.model.size_bytes" in metrics
+    table_path = mlflow_client.download_artifacts(
+        run_id, "performance/datasets.csv", tmp_path
+    )
+    with open(table_path, mode="r") as file_handler:
+        rows = list(csv.DictReader(file_handler))
+    assert {row["dataset"] for row in rows} == {"data", "model", "predictions"}
+
+
+def test_instrumented_catalog_can_be_pickled(tmp_path):
+    # the ParallelRunner pickles the catalog to send it to its subprocesses
+    catalog = DataCatalog({"data": MemoryDataSet(1)})
+    transformer = DatasetsPerformanceTransformer()
+    transformer.instrument(catalog)
+
+    unpickled_catalog = pickle.loads(pickle.dumps(catalog))
+    assert unpickled_catalog.load("data") == 1
+    assert catalog.load("data") == 1
+    assert transformer.records["data"]["load_count"] == 1
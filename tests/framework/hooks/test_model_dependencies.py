@@ -0,0 +1,106 @@
+import mlflow
+import pandas as pd
+import pkg_resources
+import yaml
+from kedro.extras.datasets.pickle import PickleDataSet
+from kedro.io import DataCatalog, MemoryDataSet
+from kedro.pipeline import Pipeline, node
+
+from kedro_mlflow.framework.hooks.model_dependencies import (
+    _get_distributions_by_module,
+    _get_inference_dependencies,
+)
+from kedro_mlflow.pipeline import pipeline_ml
+
+
+def test_get_inference_dependencies():
+    inference = Pipeline([node(func=pd.concat, inputs="data", outputs="predictions")])
+    pipeline = pipeline_ml(
+        training=Pipeline([node(func=lambda x: x, inputs="data", outputs="model")]),
+        inference=inference,
+        input_name="data",
+    )
+    dependencies = _get_inference_dependencies(pipeline)
+
+    # the modules of the inference nodes are pinned
+    assert f"pandas=={pd.__version__}" in dependencies
+    # the packages needed to load the model are always pinned
+    assert f"mlflow=={mlflow.__version__}" in dependencies
+    assert any(dep.startswith("kedro==") for dep in dependencies)
+    # the standard library is ignored
+    assert all("==" in dep for dep in dependencies)
+
+
+def predict_with_yaml(model, data):
+    return yaml.safe_dump(data)
+
+
+def test_get_inference_dependencies_from_globals_and_artifacts(tmp_path):
+    pipeline = pipeline_ml(
+        training=Pipeline([node(func=lambda x: x, inputs="data", outputs="model")]),
+        inference=Pipeline(
+            [
+                node(
+                    func=predict_with_yaml,
+                    inputs=["model", "data"],
+                    outputs="predictions",
+                )
+            ]
+        ),
+        input_name="data",
+    )
+    catalog = DataCatalog(
+        {
+            "data": MemoryDataSet(),
+            "model": PickleDataSet((tmp_path / "model.pkl").as_posix()),
+        }
+    )
+    dependencies = _get_inference_dependencies(pipeline, catalog)
+    dependencies_names = {dep.split("==")[0].lower() for dep in dependencies}
+
+    # the module referred to by the node function
+    assert "pyyaml" in dependencies_names
+    # the module imported by the artifact dataset
+    assert "fsspec" in dependencies_names
+    # the module of the node function is not the one of pandas
+    assert "pandas" not in dependencies_names
+
+
+def test_get_distributions_by_module_ignores_local_distributions(
+    mocker, monkeypatch, tmp_path
+):
+    def make_distribution(name, direct_url=None):
+        metadata_dir = tmp_path / f"{name}.dist-info"
+        metadata_dir.mkdir()
+        if direct_url is not None:
+            (metadata_dir / "direct_url.json").write_text(direct_url)
+        return pkg_resources.Distribution(
+            project_name=name,
+            version="1.0.0",
+            metadata=pkg_resources.PathMetadata(tmp_path, str(metadata_dir)),
+        )
+
+    (tmp_path / "develop.egg-link").write_text("/home/me/develop\n.")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    mocker.patch.object(
+        pkg_resources,
+        "working_set",
+        [
+            make_distribution("indexed"),
+            make_distribution("vcs", '{"url": "https://github.com/org/vcs.git"}'),
+            make_distribution(
+                "myproject", '{"url": "file:///home/me/myproject", "dir_info": {}}'
+            ),
+            make_distribution(
+                "editable",
+                '{"url": "file:///home/me/editable", "dir_info": {"editable": true}}',
+            ),
+            make_distribution("develop"),
+        ],
+    )
+
+    assert _get_distributions_by_module() == {
+        "indexed": "indexed==1.0.0",
+        "vcs": "vcs==1.0.0",
+    }
@@ -0,0 +1,111 @@
+import mlflow
+import pytest
+from kedro.extras.datasets.pickle import PickleDataSet
+from kedro.io import DataCatalog, MemoryDataSet
+from kedro.pipeline import Pipeline, node
+from mlflow.tracking import MlflowClient
+
+from kedro_mlflow.framework.hooks.model_logging import _log_model
+from kedro_mlflow.mlflow import KedroPipelineModel
+from kedro_mlflow.pipeline import pipeline_ml
+
+
+def fit_fun(data):
+    return 2
+
+
+def predict_fun(model, data):
+    return data * model
+
+
+@pytest.fixture
+def pipeline_ml_obj():
+    return pipeline_ml(
+        training=Pipeline([node(fit_fun, inputs="raw_data", outputs="model")]),
+        inference=Pipeline(
+            [node(predict_fun, inputs=["model", "raw_data"], outputs="predictions")]
+        ),
+        input_name="raw_data",
+    )
+
+
+@pytest.fixture
+def tracking_uri(tmp_path):
+    tracking_uri = (tmp_path / "mlruns").as_uri()
+    mlflow.set_tracking_uri(tracking_uri)
+    return tracking_uri
+
+
+def test_log_model(tmp_path, tracking_uri, pipeline_ml_obj):
+    catalog = DataCatalog(
+        {
+            "raw_data": MemoryDataSet(1),
+            "model": PickleDataSet((tmp_path / "model.pkl").as_posix()),
+        }
+    )
+    catalog.save("model", 2)
+    artifacts = pipeline_ml_obj.extract_pipeline_artifacts(catalog)
+
+    with mlflow.start_run():
+        _log_model(
+            artifact_path="model",
+            python_model=KedroPipelineModel(
+                pipeline_ml=pipeline_ml_obj, catalog=catalog
+            ),
+            artifacts=artifacts,
+            conda_env={"python": "3.7.0"},
+        )
+        run_id = mlflow.active_run().info.run_id
+
+    # the model must be loadable as if it was logged with mlflow.pyfunc.log_model
+    loaded_model = mlflow.pyfunc.load_model(f"runs:/{run_id}/model")
+    assert loaded_model.predict(1) == {"predictions": 2}
+    logged_files = {
+        file_info.path
+        for file_info in MlflowClient(tracking_uri).list_artifacts(
+            run_id, "model/artifacts"
+        )
+    }
+    assert logged_files == {"model/artifacts/model.pkl"}
+    # the model is recorded in the metadata of the run
+    tags = MlflowClient(tracking_uri).get_run(run_id).data.tags
+    assert "mlflow.log-model.history" in tags
+
+
+def test_log_model_artifacts_with_same_file_name(tmp_path, tracking_uri):
+    pipeline = pipeline_ml(
+        training=Pipeline(
+            [
+                node(fit_fun, inputs="raw_data", outputs="model"),
+                node(fit_fun, inputs="raw_data", outputs="encoder"),
+            ]
+        ),
+        inference=Pipeline(
+            [
+                node(predict_fun, inputs=["model", "raw_data"], outputs="data"),
+                node(predict_fun, inputs=["encoder", "data"], outputs="predictions"),
+            ]
+        ),
+        input_name="raw_data",
+    )
+    (tmp_path / "model").mkdir()
+    (tmp_path / "encoder").mkdir()
+    catalog = DataCatalog(
+        {
+            "raw_data": MemoryDataSet(1),
+            "model": PickleDataSet((tmp_path / "model" / "data.pkl").as_posix()),
+            "encoder": PickleDataSet((tmp_path / "encoder" / "data.pkl").as_posix()),
+        }
+    )
+    catalog.save("model", 2)
+    catalog.save("encoder", 3)
+
+    # the second artifact would overwrite the first one in the model
+    with mlflow.start_run():
+        with pytest.raises(ValueError, match="must have different file names"):
+            _log_model(
+                artifact_path="model",
+                python_model=KedroPipelineModel(pipeline_ml=pipeline, catalog=catalog),
+                artifacts=pipeline.extract_pipeline_artifacts(catalog),
+                conda_env={"python": "3.7.0"},
+            )
@@ -1,12 +1,14 @@
+import pstats
+
 import mlflow
 import pytest
 from kedro.io import DataCatalog, MemoryDataSet
-from kedro.pipeline import node
+from kedro.pipeline import Pipeline, node
 from mlflow.tracking import MlflowClient
 
 from kedro_mlflow.framework.context.config import KedroMlflowConfig
 from kedro_mlflow.framework.hooks import MlflowNodeHook
-from kedro_mlflow.framework.hooks.node_hook import flatten_dict
+from kedro_mlflow.framework.hooks.node_hook import _sanitize_metric_key, flatten_dict
 
 
 def test_flatten_dict_non_nested():
@@ -38,6 +40,16 @@ def test_flatten_dict_nested_2_levels():
     }
 
 
+def test_flatten_dict_nested_2_levels_with_sep():
+    d = dict(a=1, b=dict(c=1, d=dict(e=3, f=5)))
+    assert flatten_dict(d=d, recursive=True, sep="__") == {
+        "a": 1,
+        "b__c": 1,
+        "b__d__e": 3,
+        "b__d__f": 5,
+    }
+
+
 @pytest.mark.parametrize(
     "flatten_dict_params,expected",
     [
@@ -92,3 +104,123 @@ def test_node_hook_logging(tmp_path, mocker, flatten_dict_params, expected):
     mlflow_client = MlflowClient(mlflow_tracking_uri)
     current_run = mlflow_client.get_run(run_id)
     assert current_run.data.params == expected
+
+
+def test_sanitize_metric_key():
+    assert (
+        _sanitize_metric_key("predict_fun([model,data]) -> [predictions]")
+        == "predict_fun_model_data_-_predictions"
+    )
+
+
+def test_node_hook_log_performance(tmp_path, mocker):
+
+    mocker.patch("kedro_mlflow.utils._is_kedro_project", return_value=True)
+    config = KedroMlflowConfig(
+        project_path=tmp_path, node_hook_opts={"log_performance": True},
+    )
+    mocker.patch(
+        "kedro_mlflow.framework.hooks.node_hook.get_mlflow_config", return_value=config
+    )
+    mlflow_node_hook = MlflowNodeHook()
+
+    def fake_fun(arg1):
+        return sum(range(10000))
+
+    node_test = node(func=fake_fun, inputs="foo", outputs="out", name="fake")
+    catalog = DataCatalog({"foo": MemoryDataSet(1), "out": MemoryDataSet()})
+
+    mlflow_tracking_uri = (tmp_path / "mlruns").as_uri()
+    mlflow.set_tracking_uri(mlflow_tracking_uri)
+    with mlflow.start_run():
+        mlflow_node_hook.before_node_run(
+            node=node_test,
+            catalog=catalog,
+            inputs={"foo": 1},
+            is_async=False,
+            run_id="132",
+        )
+        outputs = node_test.run({"foo": 1})
+        mlflow_node_hook.after_node_run(
+            node=node_test,
+            catalog=catalog,
+            inputs={"foo": 1},
+            outputs=outputs,
+            is_async=False,
+            run_id="132",
+        )
+        mlflow_node_hook.after_pipeline_run(
+            run_params={}, pipeline=Pipeline([node_test]), catalog=catalog
+        )
+        run_id = mlflow.active_run().info.run_id
+
+    mlflow_client = MlflowClient(mlflow_tracking_uri)
+    metrics = mlflow_client.get_run(run_id).data.metrics
+    assert set(metrics) == {
+        "node.fake.duration_s",
+        "node.fake.cpu_time_s",
+        "node.fake.max_rss_delta_mb",
+    }
+    assert metrics["node.fake.duration_s"] >= 0
+    artifacts = [
+        artifact.path
+        for artifact in mlflow_client.list_artifacts(run_id, "performance")
+    ]
+    assert artifacts == ["performance/nodes.json"]
+    # the performance is not logged twice
+    assert mlflow_node_hook._nodes_performance == {}
+
+
+@pytest.mark.parametrize("profile", [["fake"], ["my_tag"]])
+def test_node_hook_profile(tmp_path, mocker, profile):
+
+    mocker.patch("kedro_mlflow.utils._is_kedro_project", return_value=True)
+    config = KedroMlflowConfig(
+        project_path=tmp_path, node_hook_opts={"profile": profile}
+    )
+    mocker.patch(
+        "kedro_mlflow.framework.hooks.node_hook.get_mlflow_config", return_value=config
+    )
+    mlflow_node_hook = MlflowNodeHook()
+
+    def fake_fun(arg1):
+        return sum(range(10000))
+
+    node_test = node(
+        func=fake_fun, inputs="foo", outputs="out", name="fake", tags=["my_tag"]
+    )
+    node_not_profiled = node(func=fake_fun, inputs="foo", outputs="out2", name="other")
+    catalog = DataCatalog({"foo": MemoryDataSet(1)})
+
+    mlflow_tracking_uri = (tmp_path / "mlruns").as_uri()
+    mlflow.set_tracking_uri(mlflow_tracking_uri)
+    with mlflow.start_run():
+        for node_to_run in [node_test, node_not_profiled]:
+            mlflow_node_hook.before_node_run(
+                node=node_to_run,
+                catalog=catalog,
+                inputs={"foo": 1},
+                is_async=False,
+                run_id="132",
+            )
+            outputs = node_to_run.run({"foo": 1})
+            mlflow_node_hook.after_node_run(
+                node=node_to_run,
+                catalog=catalog,
+                inputs={"foo": 1},
+                outputs=outputs,
+                is_async=False,
+                run_id="132",
+            )
+        run_id = mlflow.active_run().info.run_id
+
+    mlflow_client = MlflowClient(mlflow_tracking_uri)
+    artifacts = [
+        artifact.path for artifact in mlflow_client.list_artifacts(run_id, "profiles")
+    ]
+    assert artifacts == ["profiles/fake.pstats", "profiles/fake.txt"]
+    stats_path = mlflow_client.download_artifacts(
+        run_id, "profiles/fake.pstats", tmp_path
+    )
+    stats = pstats.Stats(stats_path)
+    assert any(func_name == "fake_fun" for _, _, func_name in stats.stats)
@@ -1,10 +1,16 @@
+import json
+import os
 import sys
+import threading
+import time
 
 import mlflow
+import pandas as pd
 import pytest
 import yaml
 from kedro.extras.datasets.pickle import PickleDataSet
 from kedro.framework.context import KedroContext
+from kedro.framework.hooks import get_hook_manager, hook_impl
 from kedro.io import DataCatalog, MemoryDataSet
 from kedro.pipeline import Pipeline, node
 from kedro.runner import SequentialRunner
@@ -15,7 +21,11 @@ from kedro_mlflow.framework.hooks.pipeline_hook import (
     MlflowPipelineHook,
     _format_conda_env,
     _generate_kedro_command,
+    _infer_model_signature,
 )
+from kedro_mlflow.framework.hooks.timeline import TIMELINE_DIR_ENV_VAR
+from kedro_mlflow.framework.tracking import sync_spool
+from kedro_mlflow.framework.tracking.spool import SPOOL_RUN_ID_TAG
 from kedro_mlflow.io import MlflowMetricsDataSet
 from kedro_mlflow.pipeline import pipeline_ml
 from kedro_mlflow.pipeline.pipeline_ml import PipelineML
@@ -368,3 +378,480 @@ def test_on_pipeline_error(tmp_path, config_dir, mocker):
         failing_context.run()
 
     assert mlflow.active_run() is None
+
+
+def test_infer_model_signature(tmp_path, dummy_pipeline_ml):
+    catalog = DataCatalog(
+        {
+            "raw_data": MemoryDataSet(pd.DataFrame({"a": range(10), "b": range(10)})),
+            "model": PickleDataSet((tmp_path / "model.pkl").as_posix()),
+        }
+    )
+    catalog.save("model", 2)
+
+    signature, input_example = _infer_model_signature(
+        pipeline=dummy_pipeline_ml, catalog=catalog
+    )
+
+    assert signature.inputs.column_names() == ["a", "b"]
+    assert signature.outputs.column_names() == ["a", "b"]
+    assert input_example.shape == (5, 2)
+    # the input dataset of the catalog must not be modified
+    assert catalog.load("raw_data").shape == (10, 2)
+
+
+def test_infer_model_signature_does_not_call_hooks(mocker, tmp_path, dummy_pipeline_ml):
+    catalog = DataCatalog(
+        {
+            "raw_data": MemoryDataSet(pd.DataFrame({"a": range(10), "b": range(10)})),
+            "model": PickleDataSet((tmp_path / "model.pkl").as_posix()),
+        }
+    )
+    catalog.save("model", 2)
+
+    class NodeSpyHook:
+        def __init__(self):
+            self.node_names = []
+
+        @hook_impl
+        def before_node_run(self, node):
+            self.node_names.append(node.name)
+
+    spy_hook = NodeSpyHook()
+    hook_manager = get_hook_manager()
+    hook_manager.register(spy_hook)
+    try:
+        signature, _ = _infer_model_signature(
+            pipeline=dummy_pipeline_ml, catalog=catalog
+        )
+    finally:
+        hook_manager.unregister(spy_hook)
+
+    assert signature is not None
+    # the hooks of the project must not record the sample run
+    assert spy_hook.node_names == []
+
+
+def test_infer_model_signature_persisted_input(mocker, tmp_path, dummy_pipeline_ml):
+    catalog = DataCatalog(
+        {
+            "raw_data": PickleDataSet((tmp_path / "raw_data.pkl").as_posix()),
+            "model": PickleDataSet((tmp_path / "model.pkl").as_posix()),
+        }
+    )
+    catalog.save("raw_data", pd.DataFrame({"a": range(10), "b": range(10)}))
+    catalog.save("model", 2)
+    load_spy = mocker.spy(catalog, "load")
+
+    # all the data of a persisted dataset would be loaded for a sample
+    assert _infer_model_signature(pipeline=dummy_pipeline_ml, catalog=catalog) == (
+        None,
+        None,
+    )
+    load_spy.assert_not_called()
+
+    signature, input_example = _infer_model_signature(
+        pipeline=dummy_pipeline_ml, catalog=catalog, load_persisted_input=True
+    )
+    assert signature.inputs.column_names() == ["a", "b"]
+    assert input_example.shape == (5, 2)
+
+
+def test_infer_model_signature_several_inference_pipelines(tmp_path, dummy_pipeline_ml):
+    pipeline = pipeline_ml(
+        training=dummy_pipeline_ml.training,
+        inference={
+            "predict": dummy_pipeline_ml.inference,
+            "other": dummy_pipeline_ml.inference,
+        },
+        input_name="raw_data",
+    )
+    catalog = DataCatalog(
+        {
+            "raw_data": MemoryDataSet(pd.DataFrame({"a": range(10), "b": range(10)})),
+            "model": PickleDataSet((tmp_path / "model.pkl").as_posix()),
+        }
+    )
+    catalog.save("model", 2)
+
+    # the signature would reject the inputs which contain the inference name
+    assert _infer_model_signature(pipeline=pipeline, catalog=catalog) == (None, None,)
+
+
+def test_infer_model_signature_not_a_dataframe(tmp_path, dummy_pipeline_ml):
+    catalog = DataCatalog(
+        {
+            "raw_data": MemoryDataSet(1),
+            "model": PickleDataSet((tmp_path / "model.pkl").as_posix()),
+        }
+    )
+    catalog.save("model", 2)
+
+    assert _infer_model_signature(pipeline=dummy_pipeline_ml, catalog=catalog) == (
+        None,
+        None,
+    )
+
+
+def predict_as_dict(model, data):
+    return data.to_dict()
+
+
+def test_infer_model_signature_without_output_schema(mocker, tmp_path):
+    pipeline = pipeline_ml(
+        training=Pipeline([node(func=lambda x: 2, inputs="data", outputs="model")]),
+        inference=Pipeline(
+            [node(predict_as_dict, inputs=["model", "data"], outputs="predictions")]
+        ),
+        input_name="data",
+    )
+    catalog = DataCatalog(
+        {
+            "data": MemoryDataSet(pd.DataFrame({"a": range(10), "b": range(10)})),
+            "model": PickleDataSet((tmp_path / "model.pkl").as_posix()),
+        }
+    )
+    catalog.save("model", 2)
+
+    # the loggers may be disabled by the logging config of other tests
+    logger_mock = mocker.patch("kedro_mlflow.framework.hooks.pipeline_hook.LOGGER")
+    signature, input_example = _infer_model_signature(
+        pipeline=pipeline, catalog=catalog
+    )
+
+    # a dict of dicts cannot be described by a schema
+    assert signature.inputs.column_names() == ["a", "b"]
+    assert signature.outputs is None
+    assert "only its input schema is logged" in logger_mock.warning.call_args[0][0]
+
+
+@pytest.fixture
+def mlflow_conf_skip_unchanged_model(tmp_path):
+    def _write_yaml(filepath, config):
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        yaml_str = yaml.dump(config)
+        filepath.write_text(yaml_str)
+
+    _write_yaml(
+        tmp_path / "conf" / "base" / "mlflow.yml",
+        dict(
+            mlflow_tracking_uri=(tmp_path / "mlruns").as_posix(),
+            hooks=dict(pipeline=dict(skip_unchanged_model=True)),
+        ),
+    )
+
+
+def test_mlflow_pipeline_hook_skip_unchanged_model(
+    mocker,
+    monkeypatch,
+    tmp_path,
+    config_dir,
+    dummy_pipeline_ml,
+    dummy_catalog,
+    dummy_run_params,
+    mlflow_conf_skip_unchanged_model,
+):
+    mocker.patch("kedro_mlflow.utils._is_kedro_project", return_value=True)
+    monkeypatch.chdir(tmp_path)
+
+    def run_pipeline(pipeline):
+        pipeline_hook = MlflowPipelineHook()
+        pipeline_hook.before_pipeline_run(
+            run_params=dummy_run_params, pipeline=pipeline, catalog=dummy_catalog
+        )
+        SequentialRunner().run(pipeline, dummy_catalog, dummy_run_params["run_id"])
+        run_id = mlflow.active_run().info.run_id
+        pipeline_hook.after_pipeline_run(
+            run_params=dummy_run_params, pipeline=pipeline, catalog=dummy_catalog
+        )
+        return run_id
+
+    first_run_id = run_pipeline(dummy_pipeline_ml)
+    # the model is saved again but its content is unchanged
+    second_run_id = run_pipeline(dummy_pipeline_ml)
+
+    mlflow_client = MlflowClient(get_mlflow_config(tmp_path).mlflow_tracking_uri)
+    assert len(mlflow_client.list_artifacts(first_run_id)) == 1
+    assert len(mlflow_client.list_artifacts(second_run_id)) == 0
+    assert (
+        mlflow_client.get_run(second_run_id).data.tags["model_uri"]
+        == f"runs:/{first_run_id}/model"
+    )
+    assert "model_fingerprint" in mlflow_client.get_run(first_run_id).data.tags
+
+
+def test_mlflow_pipeline_hook_does_not_fingerprint_model_by_default(
+    mocker,
+    monkeypatch,
+    tmp_path,
+    config_dir,
+    dummy_pipeline_ml,
+    dummy_catalog,
+    dummy_run_params,
+    dummy_mlflow_conf,
+):
+    mocker.patch("kedro_mlflow.utils._is_kedro_project", return_value=True)
+    monkeypatch.chdir(tmp_path)
+    fingerprint_mock = mocker.patch(
+        "kedro_mlflow.framework.hooks.pipeline_hook._compute_model_fingerprint"
+    )
+    pipeline_hook = MlflowPipelineHook()
+    pipeline_hook.before_pipeline_run(
+        run_params=dummy_run_params, pipeline=dummy_pipeline_ml, catalog=dummy_catalog
+    )
+    SequentialRunner().run(dummy_pipeline_ml, dummy_catalog, dummy_run_params["run_id"])
+    run_id = mlflow.active_run().info.run_id
+    pipeline_hook.after_pipeline_run(
+        run_params=dummy_run_params, pipeline=dummy_pipeline_ml, catalog=dummy_catalog
+    )
+
+    # the artifacts are not read when skip_unchanged_model is not set
+    fingerprint_mock.assert_not_called()
+    run = MlflowClient(get_mlflow_config(tmp_path).mlflow_tracking_uri).get_run(run_id)
+    assert "model_fingerprint" not in run.data.tags
+
+
+def _run_with_pipeline_hook(tmp_path, pipeline, catalog, run_params, pipeline_opts):
+    (tmp_path / "conf" / "base" / "mlflow.yml").write_text(
+        yaml.dump(
+            dict(
+                mlflow_tracking_uri=(tmp_path / "mlruns").as_posix(),
+                hooks=dict(pipeline=pipeline_opts),
+            )
+        )
+    )
+    pipeline_hook = MlflowPipelineHook()
+    # the hook is registered to be called by the runner for each node
+    hook_manager = get_hook_manager()
+    hook_manager.register(pipeline_hook)
+    try:
+        pipeline_hook.before_pipeline_run(
+            run_params=run_params, pipeline=pipeline, catalog=catalog
+        )
+        SequentialRunner().run(pipeline, catalog, run_params["run_id"])
+        run_id = mlflow.active_run().info.run_id
+        pipeline_hook.after_pipeline_run(
+            run_params=run_params, pipeline=pipeline, catalog=catalog
+        )
+    finally:
+        hook_manager.unregister(pipeline_hook)
+    return run_id
+
+
+def test_mlflow_pipeline_hook_log_datasets_performance(
+    mocker,
+    monkeypatch,
+    tmp_path,
+    config_dir,
+    dummy_pipeline,
+    dummy_catalog,
+    dummy_run_params,
+):
+    mocker.patch("kedro_mlflow.utils._is_kedro_project", return_value=True)
+    monkeypatch.chdir(tmp_path)
+
+    run_id = _run_with_pipeline_hook(
+        tmp_path,
+        dummy_pipeline,
+        dummy_catalog,
+        dummy_run_params,
+        dict(log_datasets_performance=True),
+    )
+
+    mlflow_client = MlflowClient((tmp_path / "mlruns").as_uri())
+    table_path = mlflow_client.download_artifacts(
+        run_id, "performance/datasets.csv", tmp_path.as_posix()
+    )
+    assert "model" in set(pd.read_csv(table_path)["dataset"])
+    assert "dataset.model.save_time_s" in mlflow_client.get_run(run_id).data.metrics
+    # the transformer is removed from the catalog at the end of the run
+    assert all(
+        not transformers for transformers in dummy_catalog._transformers.values()
+    )
+    assert dummy_catalog._default_transformers == []
+
+
+def test_mlflow_pipeline_hook_log_timeline(
+    mocker,
+    monkeypatch,
+    tmp_path,
+    config_dir,
+    dummy_pipeline,
+    dummy_catalog,
+    dummy_run_params,
+):
+    mocker.patch("kedro_mlflow.utils._is_kedro_project", return_value=True)
+    monkeypatch.chdir(tmp_path)
+
+    run_id = _run_with_pipeline_hook(
+        tmp_path,
+        dummy_pipeline,
+        dummy_catalog,
+        dummy_run_params,
+        dict(log_timeline=True),
+    )
+
+    trace_path = MlflowClient((tmp_path / "mlruns").as_uri()).download_artifacts(
+        run_id, "performance/timeline.json", tmp_path.as_posix()
+    )
+    with open(trace_path) as file_handler:
+        trace = json.load(file_handler)
+    nodes_events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    # each node of the run is in the timeline
+    assert sorted(event["name"] for event in nodes_events) == sorted(
+        node.name for node in dummy_pipeline.nodes
+    )
+    # the folder of the events is removed at the end of the run
+    assert TIMELINE_DIR_ENV_VAR not in os.environ
+
+
+def wait():
+    time.sleep(0.3)
+    return 1
+
+
+def test_mlflow_pipeline_hook_resources_sampling(
+    mocker, monkeypatch, tmp_path, config_dir, dummy_run_params
+):
+    mocker.patch("kedro_mlflow.utils._is_kedro_project", return_value=True)
+    monkeypatch.chdir(tmp_path)
+
+    run_id = _run_with_pipeline_hook(
+        tmp_path,
+        Pipeline([node(wait, inputs=None, outputs="waited")]),
+        DataCatalog(),
+        dummy_run_params,
+        dict(resources_sampling_interval=0.05),
+    )
+
+    mlflow_client = MlflowClient((tmp_path / "mlruns").as_uri())
+    # the cpu usage is the only measure available without psutil
+    history = mlflow_client.get_metric_history(run_id, "resources.process_cpu_percent")
+    assert len(history) >= 2
+    assert [metric.step for metric in history] == list(range(len(history)))
+    # the sampling thread is stopped at the end of the run
+    assert not any(
+        thread.name == "kedro_mlflow_resources_sampler"
+        for thread in threading.enumerate()
+    )
+
+
+def test_format_conda_env_with_included_requirements(tmp_path, python_version):
+    (tmp_path / "base").mkdir()
+    with open(tmp_path / "base" / "base_requirements.txt", mode="w") as file_handler:
+        file_handler.write("pandas>=1.0.0,<2.0.0  # a comment\n")
+    with open(tmp_path / "requirements.txt", mode="w") as file_handler:
+        file_handler.write(
+            "# the base requirements\n-r base/base_requirements.txt\nkedro==0.16.4\n"
+        )
+
+    conda_env = _format_conda_env(tmp_path / "requirements.txt")
+    assert conda_env == dict(
+        python=python_version, dependencies=["pandas>=1.0.0,<2.0.0", "kedro==0.16.4"]
+    )
+
+
+def test_format_conda_env_with_circular_requirements(tmp_path, python_version):
+    with open(tmp_path / "requirements.txt", mode="w") as file_handler:
+        file_handler.write("-r dev_requirements.txt\nkedro==0.16.4\n")
+    with open(tmp_path / "dev_requirements.txt", mode="w") as file_handler:
+        file_handler.write("-r ./requirements.txt\npytest>=5.4.0\n")
+
+    conda_env = _format_conda_env(tmp_path / "requirements.txt")
+    assert conda_env == dict(
+        python=python_version, dependencies=["pytest>=5.4.0", "kedro==0.16.4"]
+    )
+
+
+def test_mlflow_pipeline_hook_with_spool(
+    mocker, monkeypatch, tmp_path, config_dir, dummy_pipeline, dummy_run_params
+):
+    mocker.patch("kedro_mlflow.utils._is_kedro_project", return_value=True)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "conf" / "base" / "mlflow.yml").write_text(
+        yaml.dump(
+            dict(
+                mlflow_tracking_uri=(tmp_path / "mlruns").as_posix(),
+                spool=dict(enabled=True, sync="end_of_run"),
+            )
+        )
+    )
+    catalog = DataCatalog(
+        {
+            "raw_data": MemoryDataSet(1),
+            "params:unused_param": MemoryDataSet("blah"),
+            "metrics": MlflowMetricsDataSet(prefix="metrics"),
+            "another_metrics": MlflowMetricsDataSet(prefix="foo"),
+        }
+    )
+
+    pipeline_hook = MlflowPipelineHook()
+    pipeline_hook.before_pipeline_run(
+        run_params=dummy_run_params, pipeline=dummy_pipeline, catalog=catalog
+    )
+    # the run is recorded in the spool
+    assert mlflow.get_tracking_uri() == (tmp_path / "mlruns_spool").as_uri()
+    SequentialRunner().run(dummy_pipeline, catalog, dummy_run_params["run_id"])
+    run_id = mlflow.active_run().info.run_id
+    pipeline_hook.after_pipeline_run(
+        run_params=dummy_run_params, pipeline=dummy_pipeline, catalog=catalog
+    )
+
+    # and synchronized with the tracking server at the end of the run
+    mlflow_client = MlflowClient((tmp_path / "mlruns").as_uri())
+    remote_runs = mlflow_client.search_runs(
+        experiment_ids=["0"], filter_string=f"tags.`{SPOOL_RUN_ID_TAG}` = '{run_id}'"
+    )
+    assert len(remote_runs) == 1
+    assert remote_runs[0].data.metrics["metrics.metric"] == 1.1
+    assert remote_runs[0].data.tags["pipeline_name"] == "my_cool_pipeline"
+
+
+def test_mlflow_pipeline_hook_with_unavailable_server(
+    mocker, monkeypatch, tmp_path, config_dir, dummy_pipeline, dummy_run_params
+):
+    mocker.patch("kedro_mlflow.utils._is_kedro_project", return_value=True)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "conf" / "base" / "mlflow.yml").write_text(
+        yaml.dump(
+            dict(
+                mlflow_tracking_uri=(tmp_path / "mlruns").as_posix(),
+                tracking_policy=dict(failures_threshold=1),
+            )
+        )
+    )
+    catalog = DataCatalog(
+        {
+            "raw_data": MemoryDataSet(1),
+            "params:unused_param": MemoryDataSet("blah"),
+            "metrics": MlflowMetricsDataSet(prefix="metrics"),
+            "another_metrics": MlflowMetricsDataSet(prefix="foo"),
+        }
+    )
+
+    pipeline_hook = MlflowPipelineHook()
+    pipeline_hook.before_pipeline_run(
+        run_params=dummy_run_params, pipeline=dummy_pipeline, catalog=catalog
+    )
+    run_id = mlflow.active_run().info.run_id
+    # the tracking server becomes unavailable during the run
+    for method in ("log_metric", "set_terminated"):
+        mocker.patch.object(
+            MlflowClient, method, side_effect=ConnectionError("Connection refused")
+        )
+    SequentialRunner().run(dummy_pipeline, catalog, dummy_run_params["run_id"])
+    pipeline_hook.after_pipeline_run(
+        run_params=dummy_run_params, pipeline=dummy_pipeline, catalog=catalog
+    )
+    # the pipeline does not fail and the run is ended
+    assert mlflow.active_run() is None
+    mocker.stopall()
+
+    # the calls which failed are sent with the synchronization
+    sync_spool(
+        spool_uri=(tmp_path / "mlruns_spool").as_uri(),
+        tracking_uri=(tmp_path / "mlruns").as_uri(),
+    )
+    run = MlflowClient((tmp_path / "mlruns").as_uri()).get_run(run_id)
+    assert run.info.status == "FINISHED"
+    assert run.data.metrics["metrics.metric"] == 1.1
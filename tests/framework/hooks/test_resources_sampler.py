@@ -0,0 +1,34 @@
+import time
+
+import mlflow
+from mlflow.tracking import MlflowClient
+
+from kedro_mlflow.framework.hooks.resources_sampler import ResourcesSampler
+
+
+def test_resources_sampler_memory_is_bounded():
+    sampler = ResourcesSampler(interval=1, max_samples=10)
+    for i in range(100):
+        sampler.add_sample(dict(timestamp=i, process_cpu_percent=i))
+
+    assert len(sampler.samples) < 10
+    # the samples are downsampled by averaging them and cover the whole run
+    assert sampler._stride == 16
+    assert sampler.samples[0]["process_cpu_percent"] == 7.5
+    assert sampler.samples[-1]["timestamp"] == 95
+
+
+def test_resources_sampler_logging(tmp_path):
+    mlflow_tracking_uri = (tmp_path / "mlruns").as_uri()
+    mlflow.set_tracking_uri(mlflow_tracking_uri)
+    with mlflow.start_run():
+        sampler = ResourcesSampler(interval=0.01)
+        sampler.start()
+        time.sleep(0.1)
+        sampler.log()
+        run_id = mlflow.active_run().info.run_id
+
+    mlflow_client = MlflowClient(mlflow_tracking_uri)
+    history = mlflow_client.get_metric_history(run_id, "resources.process_cpu_percent")
+    assert len(history) > 1
+    assert [metric.step for metric in history] == list(range(len(history)))
@@ -0,0 +1,78 @@
+import json
+import multiprocessing
+import os
+
+import mlflow
+from kedro.pipeline import node
+from mlflow.tracking import MlflowClient
+
+from kedro_mlflow.framework.hooks.timeline import (
+    TIMELINE_DIR_ENV_VAR,
+    NodesTimeline,
+    _record_node_end,
+    _record_node_start,
+)
+
+
+def identity(x):
+    return x
+
+
+def run_node_in_worker(node_to_run):
+    _record_node_start(node_to_run)
+    _record_node_end(node_to_run)
+
+
+def test_nodes_timeline(tmp_path):
+    node_main = node(identity, inputs="a", outputs="b", name="main", tags=["t"])
+    node_worker = node(identity, inputs="b", outputs="c", name="worker")
+
+    timeline = NodesTimeline()
+    timeline.start()
+    _record_node_start(node_main)
+    _record_node_end(node_main, error=ValueError("failed"))
+    # the nodes of the ParallelRunner run in subprocesses
+    worker = multiprocessing.Process(target=run_node_in_worker, args=(node_worker,))
+    worker.start()
+    worker.join()
+
+    mlflow_tracking_uri = (tmp_path / "mlruns").as_uri()
+    mlflow.set_tracking_uri(mlflow_tracking_uri)
+    with mlflow.start_run():
+        timeline.log()
+        run_id = mlflow.active_run().info.run_id
+
+    # the events are not recorded anymore after the run
+    assert TIMELINE_DIR_ENV_VAR not in os.environ
+    mlflow_client = MlflowClient(mlflow_tracking_uri)
+    timeline_path = mlflow_client.download_artifacts(
+        run_id, "performance/timeline.json", tmp_path
+    )
+    with open(timeline_path, mode="r") as file_handler:
+        trace = json.load(file_handler)
+
+    nodes_events = {
+        event["name"]: event for event in trace["traceEvents"] if event["ph"] == "X"
+    }
+    assert set(nodes_events) == {"main", "worker"}
+    assert nodes_events["main"]["pid"] == os.getpid()
+    assert nodes_events["worker"]["pid"] == worker.pid
+    assert nodes_events["main"]["args"]["tags"] == ["t"]
+    assert "failed" in nodes_events["main"]["args"]["error"]
+    processes_names = {
+        event["pid"]: event["args"]["name"]
+        for event in trace["traceEvents"]
+        if event["ph"] == "M"
+    }
+    assert processes_names == {
+        os.getpid(): "kedro run",
+        worker.pid: f"worker {worker.pid}",
+    }
+
+
+def test_nodes_timeline_disabled(tmp_path):
+    node_main = node(identity, inputs="a", outputs="b", name="main")
+    _record_node_start(node_main)
+    _record_node_end(node_main)
+    # nothing is recorded when the timeline is not started
+    assert NodesTimeline().stop() == []
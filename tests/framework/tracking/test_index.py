@@ -0,0 +1,142 @@
+import pandas as pd
+import pytest
+from mlflow.tracking import MlflowClient
+
+from kedro_mlflow.framework.tracking.index import RunsIndex, export_runs
+
+
+@pytest.fixture
+def tracking_uri(tmp_path):
+    return (tmp_path / "mlruns").as_uri()
+
+
+def _create_run(client, experiment_id, start_time, tags, params, metrics, end=True):
+    run_id = client.create_run(experiment_id, start_time=start_time).info.run_id
+    for key, value in tags.items():
+        client.set_tag(run_id, key, value)
+    for key, value in params.items():
+        client.log_param(run_id, key, value)
+    for key, value in metrics.items():
+        client.log_metric(run_id, key, value)
+    if end:
+        client.set_terminated(run_id)
+    return run_id
+
+
+@pytest.fixture
+def runs(tracking_uri):
+    client = MlflowClient(tracking_uri)
+    experiment_id = client.create_experiment("my_experiment")
+    other_experiment_id = client.create_experiment("other_experiment")
+    run_ids = [
+        _create_run(
+            client,
+            experiment_id,
+            start_time=1000 * (i + 1),
+            tags={"pipeline_name": "training" if i % 2 else "inference"},
+            params={"alpha": str(i / 10)},
+            metrics={"rmse": 1 / (i + 1)},
+        )
+        for i in range(5)
+    ]
+    _create_run(
+        client, other_experiment_id, 1000, {"pipeline_name": "training"}, {}, {}
+    )
+    return run_ids
+
+
+def test_runs_index_search(tmp_path, tracking_uri, runs):
+    runs_index = RunsIndex(tmp_path / "index.db", tracking_uri)
+    assert runs_index.sync(["my_experiment"]) == 5
+
+    runs_df = runs_index.search(
+        ["my_experiment"],
+        filters=["tags.pipeline_name = 'training'"],
+        order_by="metrics.rmse ASC",
+    )
+    assert runs_df["run_id"].tolist() == [runs[3], runs[1]]
+    assert runs_df["params.alpha"].tolist() == ["0.3", "0.1"]
+    assert runs_df["metrics.rmse"].tolist() == [0.25, 0.5]
+    assert runs_df["status"].tolist() == ["FINISHED", "FINISHED"]
+    assert runs_df["start_time"].tolist() == [
+        pd.Timestamp(4000, unit="ms", tz="UTC"),
+        pd.Timestamp(2000, unit="ms", tz="UTC"),
+    ]
+
+    # the most recent runs first by default
+    runs_df = runs_index.search(
+        ["my_experiment"], filters=["metrics.rmse < 0.5"], max_results=2
+    )
+    assert runs_df["run_id"].tolist() == [runs[4], runs[3]]
+    runs_df = runs_index.search(filters=["params.alpha LIKE '0.%'"])
+    assert len(runs_df) == 5
+
+    with pytest.raises(ValueError, match="Invalid key"):
+        runs_index.search(filters=["attributes.unknown = 1"])
+    with pytest.raises(ValueError, match="is not a number"):
+        runs_index.search(filters=["metrics.rmse < low"])
+
+
+def test_runs_index_incremental_sync(mocker, tmp_path, tracking_uri, runs):
+    client = MlflowClient(tracking_uri)
+    experiment_id = client.get_experiment_by_name("my_experiment").experiment_id
+    running_run_id = _create_run(
+        client, experiment_id, 2500, {}, {}, {"rmse": 0.1}, end=False
+    )
+    runs_index = RunsIndex(tmp_path / "index.db", tracking_uri)
+    assert runs_index.sync() == 7
+
+    new_run_id = _create_run(client, experiment_id, 6000, {}, {}, {"rmse": 0.05})
+    client.log_metric(running_run_id, "rmse", 0.01)
+    client.set_terminated(running_run_id)
+    client.set_tag(runs[0], "late_tag", "value")
+    get_run_spy = mocker.spy(MlflowClient, "get_run")
+
+    # only the runs started since the last synchronization (including the most
+    # recent one then) and the run which was running are fetched again
+    assert runs_index.sync(["my_experiment"]) == 3
+    get_run_spy.assert_called_once_with(mocker.ANY, running_run_id)
+    runs_df = runs_index.search(["my_experiment"], filters=["metrics.rmse < 0.1"])
+    assert runs_df["run_id"].tolist() == [new_run_id, running_run_id]
+    assert runs_df["status"].tolist() == ["FINISHED"] * 2
+    assert runs_df["metrics.rmse"].tolist() == [0.05, 0.01]
+    assert "tags.late_tag" not in runs_df.columns
+
+    # a full synchronization catches the updates of the old runs
+    client.delete_run(runs[1])
+    assert runs_index.sync(["my_experiment"], full=True) == 6
+    runs_df = runs_index.search(["my_experiment"], filters=["tags.late_tag = value"])
+    assert runs_df["run_id"].tolist() == [runs[0]]
+    assert runs[1] not in runs_index.search()["run_id"].tolist()
+
+
+def test_runs_index_other_tracking_uri(tmp_path, tracking_uri, runs):
+    RunsIndex(tmp_path / "index.db", tracking_uri).sync()
+    runs_index = RunsIndex(tmp_path / "index.db", (tmp_path / "other").as_uri())
+    # the index of another tracking server is not reused
+    assert runs_index.search().empty
+
+
+@pytest.mark.parametrize("extension", [".csv", ".parquet"])
+def test_export_runs(tmp_path, tracking_uri, runs, extension):
+    if extension == ".parquet":
+        pytest.importorskip("pyarrow")
+    runs_index = RunsIndex(tmp_path / "index.db", tracking_uri)
+    runs_index.sync()
+    runs_df = runs_index.search(["my_experiment"])
+    filepath = tmp_path / f"runs{extension}"
+    export_runs(runs_df, filepath)
+
+    exported_df = (
+        pd.read_csv(filepath, dtype={"params.alpha": str})
+        if extension == ".csv"
+        else pd.read_parquet(filepath)
+    )
+    assert exported_df["run_id"].tolist() == runs_df["run_id"].tolist()
+    assert exported_df["params.alpha"].tolist() == runs_df["params.alpha"].tolist()
+    assert exported_df["metrics.rmse"].tolist() == runs_df["metrics.rmse"].tolist()
+
+
+def test_export_runs_invalid_extension(tmp_path):
+    with pytest.raises(ValueError, match="can only be exported"):
+        export_runs(pd.DataFrame(), tmp_path / "runs.json")
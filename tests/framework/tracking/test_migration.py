@@ -0,0 +1,106 @@
+import math
+
+import mlflow
+import pytest
+from mlflow.entities import ViewType
+from mlflow.tracking import MlflowClient
+
+from kedro_mlflow.framework.tracking.migration import migrate_file_store
+
+
+@pytest.fixture
+def file_store_uri(tmp_path):
+    file_store_uri = (tmp_path / "mlruns").as_uri()
+    client = MlflowClient(file_store_uri)
+    experiment_id = client.create_experiment("my_experiment")
+    client.set_experiment_tag(experiment_id, "team", "data")
+    deleted_experiment_id = client.create_experiment("deleted_experiment")
+    client.create_run(deleted_experiment_id)
+    client.delete_experiment(deleted_experiment_id)
+    mlflow.set_tracking_uri(file_store_uri)
+    with mlflow.start_run(experiment_id=experiment_id):
+        mlflow.log_params({"alpha": 0.1, "l1_ratio": 0.5})
+        mlflow.set_tag("pipeline_name", "training")
+        for step in range(3):
+            mlflow.log_metric("loss", 1 / (step + 1), step=step)
+        mlflow.log_metric("nan", math.nan)
+        (tmp_path / "artifact.txt").write_text("hello")
+        mlflow.log_artifact((tmp_path / "artifact.txt").as_posix())
+        with mlflow.start_run(nested=True):
+            mlflow.log_metric("loss", 2)
+    for _ in range(3):
+        with mlflow.start_run(experiment_id=experiment_id) as run:
+            pass
+    client.delete_run(run.info.run_id)
+    return file_store_uri
+
+
+def _comparable(metrics):
+    # nan is not equal to itself
+    return {key: str(value) for key, value in metrics.items()}
+
+
+def _history(client, run_id, key):
+    return [
+        (str(metric.value), metric.timestamp, metric.step)
+        for metric in client.get_metric_history(run_id, key)
+    ]
+
+
+def test_migrate_file_store(tmp_path, file_store_uri):
+    db_uri = f"sqlite:///{(tmp_path / 'mlflow.db').as_posix()}"
+    progress = []
+    summary = migrate_file_store(
+        file_store_uri,
+        db_uri,
+        batch_size=2,
+        progress=lambda *args: progress.append(args),
+    )
+
+    assert summary == dict(experiments=3, runs=6, metrics=5, skipped=0)
+    assert progress == [(2, 6), (4, 6), (6, 6)]
+    file_client = MlflowClient(file_store_uri)
+    db_client = MlflowClient(db_uri)
+    for experiment in file_client.list_experiments(view_type=ViewType.ALL):
+        db_experiment = db_client.get_experiment(experiment.experiment_id)
+        assert db_experiment.name == experiment.name
+        assert db_experiment.artifact_location == experiment.artifact_location
+        assert db_experiment.lifecycle_stage == experiment.lifecycle_stage
+        assert db_experiment.tags == experiment.tags
+        runs = file_client.search_runs(
+            [experiment.experiment_id], run_view_type=ViewType.ALL
+        )
+        for run in runs:
+            db_run = db_client.get_run(run.info.run_id)
+            assert db_run.info == run.info
+            assert db_run.data.params == run.data.params
+            assert db_run.data.tags == run.data.tags
+            assert _comparable(db_run.data.metrics) == _comparable(run.data.metrics)
+            for key in run.data.metrics:
+                assert _history(db_client, run.info.run_id, key) == _history(
+                    file_client, run.info.run_id, key
+                )
+    # the artifacts are read from the file store
+    run = db_client.search_runs(["1"], "params.alpha = '0.1'")[0]
+    assert [
+        artifact.path for artifact in db_client.list_artifacts(run.info.run_id)
+    ] == ["artifact.txt"]
+
+
+def test_migrate_file_store_twice(tmp_path, file_store_uri):
+    db_uri = f"sqlite:///{(tmp_path / 'mlflow.db').as_posix()}"
+    migrate_file_store(file_store_uri, db_uri)
+    summary = migrate_file_store(file_store_uri, db_uri)
+    # the runs already migrated are skipped
+    assert summary == dict(experiments=3, runs=0, metrics=0, skipped=6)
+    assert (
+        len(MlflowClient(db_uri).search_runs(["0", "1"], run_view_type=ViewType.ALL))
+        == 5
+    )
+
+
+def test_migrate_file_store_invalid_uri(tmp_path):
+    with pytest.raises(ValueError, match="is not the uri of a file store"):
+        migrate_file_store(
+            "sqlite:///mlflow.db", f"sqlite:///{(tmp_path / 'mlflow.db').as_posix()}"
+        )
@@ -0,0 +1,153 @@
+import time
+
+import mlflow
+import pytest
+from mlflow.entities import Metric, Param
+from mlflow.exceptions import MlflowException
+from mlflow.protos.databricks_pb2 import INVALID_PARAMETER_VALUE
+from mlflow.tracking import MlflowClient
+
+from kedro_mlflow.framework.tracking import TrackingPolicy, sync_spool
+from kedro_mlflow.framework.tracking.policy import SPOOLED, TrackingUnavailableError
+
+
+@pytest.fixture
+def tracking_uri(tmp_path):
+    tracking_uri = (tmp_path / "mlruns").as_uri()
+    mlflow.set_tracking_uri(tracking_uri)
+    yield tracking_uri
+    while mlflow.active_run():
+        mlflow.end_run()
+
+
+def test_tracking_policy_retries_transient_errors():
+    calls = []
+
+    def flaky_call():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("Connection reset by peer")
+        return "ok"
+
+    policy = TrackingPolicy(max_retries=2, backoff_factor=0)
+    assert policy.execute(flaky_call) == "ok"
+    assert len(calls) == 3
+
+
+def test_tracking_policy_does_not_retry_invalid_calls():
+    calls = []
+
+    def invalid_call():
+        calls.append(1)
+        raise MlflowException("Invalid value", error_code=INVALID_PARAMETER_VALUE)
+
+    policy = TrackingPolicy(max_retries=2, backoff_factor=0, failures_threshold=1)
+    with pytest.raises(MlflowException, match="Invalid value"):
+        policy.execute(invalid_call)
+    assert len(calls) == 1
+    # an invalid call does not mean that the server is unavailable
+    assert not policy.circuit_open
+
+
+def test_tracking_policy_timeout():
+    policy = TrackingPolicy(timeout=0.05)
+    start = time.time()
+    with pytest.raises(TimeoutError):
+        policy.execute(time.sleep, 2)
+    assert time.time() - start < 1
+
+
+def test_tracking_policy_circuit_breaker():
+    calls = []
+
+    def failing_call():
+        calls.append(1)
+        raise ConnectionError("Connection refused")
+
+    policy = TrackingPolicy(failures_threshold=2)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            policy.execute(failing_call)
+    assert policy.circuit_open
+    with pytest.raises(TrackingUnavailableError):
+        policy.execute(failing_call)
+    # the server is not called anymore
+    assert len(calls) == 2
+
+
+def test_tracking_policy_falls_back_to_spool(mocker, tmp_path, tracking_uri):
+    spool_uri = (tmp_path / "mlruns_spool").as_uri()
+    run = mlflow.start_run()
+    run_id = run.info.run_id
+    (tmp_path / "artifact.txt").write_text("hello")
+
+    mocker.patch.object(
+        MlflowClient, "log_batch", side_effect=ConnectionError("Connection refused")
+    )
+    policy = TrackingPolicy(failures_threshold=1, spool_uri=spool_uri)
+    policy.log_batch(
+        run_id,
+        metrics=[Metric("metric", 1.5, 1000, 2)],
+        params=[Param("param", "value")],
+    )
+    # the circuit is open, the artifact goes to the spool without calling the server
+    assert policy.circuit_open
+    assert (
+        policy.call(
+            "log_artifact",
+            run_id=run_id,
+            local_path=(tmp_path / "artifact.txt").as_posix(),
+        )
+        is SPOOLED
+    )
+    policy.end_run()
+    assert mlflow.active_run() is None
+    # the artifact is copied, it may be modified before the synchronization
+    (tmp_path / "artifact.txt").write_text("modified")
+    mocker.stopall()
+
+    sync_spool(spool_uri=spool_uri, tracking_uri=tracking_uri)
+
+    remote_run = MlflowClient(tracking_uri).get_run(run_id)
+    assert remote_run.info.status == "FINISHED"
+    assert remote_run.data.params == {"param": "value"}
+    history = MlflowClient(tracking_uri).get_metric_history(run_id, "metric")
+    assert [(m.value, m.timestamp, m.step) for m in history] == [(1.5, 1000, 2)]
+    (tmp_path / "download").mkdir()
+    artifact_path = MlflowClient(tracking_uri).download_artifacts(
+        run_id, "artifact.txt", (tmp_path / "download").as_posix()
+    )
+    with open(artifact_path) as file_handler:
+        assert file_handler.read() == "hello"
+    # the journal is emptied
+    assert list((tmp_path / "mlruns_spool_journal").glob("*.jsonl")) == []
+    assert list((tmp_path / "mlruns_spool_journal").glob("*.replay")) == []
+
+
+def test_tracking_policy_interrupted_replay(mocker, tmp_path, tracking_uri):
+    spool_uri = (tmp_path / "mlruns_spool").as_uri()
+    run_id = mlflow.start_run().info.run_id
+    mlflow.end_run()
+
+    policy = TrackingPolicy(failures_threshold=1, spool_uri=spool_uri)
+    mocker.patch.object(
+        MlflowClient, "set_tag", side_effect=ConnectionError("Connection refused")
+    )
+    for i in range(2):
+        assert policy.call("set_tag", run_id=run_id, key=f"tag_{i}", value=i) is SPOOLED
+    mocker.stopall()
+
+    mocker.patch.object(
+        MlflowClient,
+        "set_tag",
+        side_effect=[None, ConnectionError("Connection refused")],
+    )
+    with pytest.raises(ConnectionError):
+        sync_spool(spool_uri=spool_uri, tracking_uri=tracking_uri)
+    mocker.stopall()
+
+    # only the call which failed is replayed
+    sync_spool(spool_uri=spool_uri, tracking_uri=tracking_uri)
+    tags = MlflowClient(tracking_uri).get_run(run_id).data.tags
+    assert tags["tag_1"] == "1"
+    assert "tag_0" not in tags
@@ -0,0 +1,96 @@
+import mlflow
+from mlflow.entities import RunStatus
+from mlflow.tracking import MlflowClient
+
+from kedro_mlflow.framework.tracking import sync_spool
+from kedro_mlflow.framework.tracking.spool import SPOOL_RUN_ID_TAG, SYNCED_RUN_ID_TAG
+
+
+def test_sync_spool(tmp_path):
+    spool_uri = (tmp_path / "mlruns_spool").as_uri()
+    tracking_uri = (tmp_path / "mlruns").as_uri()
+    mlflow.set_tracking_uri(spool_uri)
+    experiment_id = MlflowClient(spool_uri).create_experiment("my_experiment")
+    with mlflow.start_run(experiment_id=experiment_id) as parent_run:
+        # more params than a single batch can contain
+        mlflow.log_params({f"param_{i}": i for i in range(100)})
+        mlflow.log_params({f"param_{i}": i for i in range(100, 150)})
+        for step in range(3):
+            mlflow.log_metric("metric", step * 2, step=step)
+        (tmp_path / "artifact.txt").write_text("hello")
+        mlflow.log_artifact((tmp_path / "artifact.txt").as_posix(), "folder")
+        with mlflow.start_run(nested=True) as child_run:
+            mlflow.set_tag("child", "yes")
+    running_run_id = (
+        MlflowClient(spool_uri).create_run(parent_run.info.experiment_id).info.run_id
+    )
+
+    synced_run_ids = sync_spool(spool_uri=spool_uri, tracking_uri=tracking_uri)
+
+    # the run which is still running is not synchronized
+    assert set(synced_run_ids) == {parent_run.info.run_id, child_run.info.run_id}
+    assert running_run_id not in synced_run_ids
+    remote_client = MlflowClient(tracking_uri)
+    remote_parent_run = remote_client.get_run(synced_run_ids[parent_run.info.run_id])
+    assert remote_parent_run.info.status == "FINISHED"
+    assert remote_parent_run.info.start_time == parent_run.info.start_time
+    assert remote_parent_run.data.tags[SPOOL_RUN_ID_TAG] == parent_run.info.run_id
+    assert len(remote_parent_run.data.params) == 150
+    history = remote_client.get_metric_history(remote_parent_run.info.run_id, "metric")
+    assert [(metric.step, metric.value) for metric in history] == [
+        (0, 0),
+        (1, 2),
+        (2, 4),
+    ]
+    assert remote_client.list_artifacts(remote_parent_run.info.run_id, "folder")[
+        0
+    ].path == ("folder/artifact.txt")
+    remote_child_run = remote_client.get_run(synced_run_ids[child_run.info.run_id])
+    assert remote_child_run.data.tags["child"] == "yes"
+    assert (
+        remote_child_run.data.tags["mlflow.parentRunId"]
+        == remote_parent_run.info.run_id
+    )
+    assert (
+        MlflowClient(spool_uri)
+        .get_run(parent_run.info.run_id)
+        .data.tags[SYNCED_RUN_ID_TAG]
+        == remote_parent_run.info.run_id
+    )
+
+    # the synchronization is idempotent
+    assert sync_spool(spool_uri=spool_uri, tracking_uri=tracking_uri) == {}
+    remote_experiment = remote_client.get_experiment_by_name("my_experiment")
+    # the nested run is in the default experiment
+    assert len(remote_client.search_runs(["0", remote_experiment.experiment_id])) == 2
+    mlflow.set_tracking_uri(None)
+
+
+def test_sync_spool_interrupted(tmp_path):
+    spool_uri = (tmp_path / "mlruns_spool").as_uri()
+    tracking_uri = (tmp_path / "mlruns").as_uri()
+    mlflow.set_tracking_uri(spool_uri)
+    with mlflow.start_run() as run:
+        mlflow.log_param("param", 1)
+
+    # a previous synchronization was interrupted before the end of the run
+    remote_client = MlflowClient(tracking_uri)
+    partial_run_id = remote_client.create_run(
+        experiment_id="0", tags={SPOOL_RUN_ID_TAG: run.info.run_id}
+    ).info.run_id
+
+    synced_run_ids = sync_spool(spool_uri=spool_uri, tracking_uri=tracking_uri)
+
+    assert remote_client.get_run(partial_run_id).info.lifecycle_stage == "deleted"
+    remote_run = remote_client.get_run(synced_run_ids[run.info.run_id])
+    assert remote_run.data.params == {"param": "1"}
+    assert RunStatus.is_terminated(RunStatus.from_string(remote_run.info.status))
+    mlflow.set_tracking_uri(None)
+
+
+def test_sync_spool_without_spool(tmp_path):
+    spool_path = tmp_path / "mlruns_spool"
+    assert (
+        sync_spool(spool_uri=spool_path.as_uri(), tracking_uri=tmp_path.as_uri()) == {}
+    )
+    assert not spool_path.exists()
@@ -0,0 +1,109 @@
+import pandas as pd
+import pytest
+from kedro.io import DataSetError
+from mlflow.tracking import MlflowClient
+
+from kedro_mlflow.io import MlflowExperimentMetricsDataSet
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def tracking_uri(tmp_path):
+    return (tmp_path / "mlruns").as_uri()
+
+
+@pytest.fixture
+def runs(tracking_uri):
+    client = MlflowClient(tracking_uri)
+    experiment_id = client.create_experiment("my_experiment")
+    run_ids = []
+    for i, pipeline_name in enumerate(["training", "training", "inference"]):
+        run_id = client.create_run(experiment_id).info.run_id
+        client.set_tag(run_id, "pipeline_name", pipeline_name)
+        for step in range(3):
+            client.log_metric(run_id, "loss", i + 1 / (step + 1), step=step)
+        client.log_metric(run_id, "accuracy", 0.9)
+        client.set_terminated(run_id)
+        run_ids.append(run_id)
+    return run_ids
+
+
+def _history(data, run_id, key):
+    rows = data[(data["run_id"] == run_id) & (data["key"] == key)]
+    return rows.sort_values("step")["value"].tolist()
+
+
+def test_experiment_metrics_dataset_load(tmp_path, tracking_uri, runs):
+    dataset = MlflowExperimentMetricsDataSet(
+        filepath=(tmp_path / "metrics").as_posix(),
+        experiment_name="my_experiment",
+        filter_string="tags.pipeline_name = 'training'",
+        metrics=["loss"],
+        tracking_uri=tracking_uri,
+    )
+    assert not dataset.exists()
+    data = dataset.load()
+
+    assert dataset.exists()
+    assert list(data.columns) == ["run_id", "key", "value", "timestamp", "step"]
+    assert len(data) == 6
+    assert set(data["run_id"]) == set(runs[:2])
+    assert set(data["key"]) == {"loss"}
+    assert _history(data, runs[1], "loss") == [2, 1.5, 1 + 1 / 3]
+    # the dataset is partitioned by run
+    assert {path.name for path in (tmp_path / "metrics").glob("run_id=*")} == {
+        f"run_id={run_id}" for run_id in runs[:2]
+    }
+
+
+def test_experiment_metrics_dataset_incremental_export(
+    mocker, tmp_path, tracking_uri, runs
+):
+    dataset = MlflowExperimentMetricsDataSet(
+        filepath=(tmp_path / "metrics").as_posix(),
+        experiment_name="my_experiment",
+        tracking_uri=tracking_uri,
+    )
+    assert dataset.export() == dict(exported=3, unchanged=0, removed=0, values=12)
+
+    client = MlflowClient(tracking_uri)
+    client.log_metric(runs[0], "loss", 0.5, step=3)
+    client.delete_run(runs[2])
+    history_spy = mocker.spy(MlflowClient, "get_metric_history")
+    # only the run whose metrics changed is fetched again
+    assert dataset.export() == dict(exported=1, unchanged=1, removed=1, values=5)
+    assert {call.args[1] for call in history_spy.call_args_list} == {runs[0]}
+
+    data = MlflowExperimentMetricsDataSet(
+        filepath=(tmp_path / "metrics").as_posix(),
+        experiment_name="my_experiment",
+        update=False,
+    ).load()
+    assert set(data["run_id"]) == set(runs[:2])
+    assert _history(data, runs[0], "loss") == [1, 0.5, 1 / 3, 0.5]
+    assert _history(data, runs[1], "accuracy") == [0.9]
+
+
+def test_experiment_metrics_dataset_empty(tmp_path, tracking_uri, runs):
+    dataset = MlflowExperimentMetricsDataSet(
+        filepath=(tmp_path / "metrics").as_posix(),
+        experiment_name="my_experiment",
+        filter_string="tags.pipeline_name = 'unknown'",
+        tracking_uri=tracking_uri,
+    )
+    data = dataset.load()
+    assert data.empty
+    assert list(data.columns) == ["run_id", "key", "value", "timestamp", "step"]
+
+
+def test_experiment_metrics_dataset_errors(tmp_path, tracking_uri):
+    dataset = MlflowExperimentMetricsDataSet(
+        filepath=(tmp_path / "metrics").as_posix(),
+        experiment_name="unknown_experiment",
+        tracking_uri=tracking_uri,
+    )
+    with pytest.raises(DataSetError, match="does not exist"):
+        dataset.load()
+    with pytest.raises(DataSetError, match="is read only"):
+        dataset.save(pd.DataFrame())
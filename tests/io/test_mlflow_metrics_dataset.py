@@ -105,3 +105,20 @@ def test_mlflow_metrics_dataset_saved_and_logged(tmp_path, tracking_uri, data, p
     for k in catalog_metrics.keys():
         data_key = k.split(".")[-1] if prefix is not None else k
         assert data[data_key] == catalog_metrics[k]
+
+
+def test_mlflow_metrics_dataset_with_database(tmp_path, metrics2):
+    # the metrics are loaded with the public api of the client,
+    # which is available for all the tracking stores
+    tracking_uri = f"sqlite:///{(tmp_path / 'mlflow.db').as_posix()}"
+    mlflow.set_tracking_uri(tracking_uri)
+    mlflow_metrics_dataset = MlflowMetricsDataSet(prefix="test")
+
+    with mlflow.start_run():
+        run_id = mlflow.active_run().info.run_id
+        mlflow_metrics_dataset.save(metrics2)
+
+    catalog_metrics = MlflowMetricsDataSet(prefix="test", run_id=run_id).load()
+    assert catalog_metrics == {f"test.{k}": v for k, v in metrics2.items()}
+    assert MlflowMetricsDataSet(prefix="test", run_id=run_id).exists()
+    assert not MlflowMetricsDataSet(prefix="other", run_id=run_id).exists()
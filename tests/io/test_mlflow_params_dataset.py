@@ -0,0 +1,91 @@
+import mlflow
+import pytest
+from kedro.io import DataSetError
+from mlflow.tracking import MlflowClient
+
+from kedro_mlflow.framework.hooks.node_hook import flatten_dict
+from kedro_mlflow.io import MlflowParamsDataSet
+
+
+@pytest.fixture
+def tracking_uri(tmp_path):
+    tracking_uri = (tmp_path / "mlruns").as_uri()
+    mlflow.set_tracking_uri(tracking_uri)
+    yield tracking_uri
+    while mlflow.active_run():
+        mlflow.end_run()
+
+
+@pytest.fixture
+def params():
+    return {
+        "model": {"alpha": 0.1, "layers": [64, 32], "optimizer": {"name": "adam"}},
+        "seed": 42,
+        "early_stopping": True,
+        "scaler": None,
+    }
+
+
+@pytest.mark.parametrize("sep", [".", "__"])
+def test_params_dataset_load_flattened_params(tracking_uri, params, sep):
+    # the params are logged as the MlflowNodeHook does
+    with mlflow.start_run() as run:
+        mlflow.log_params(flatten_dict(params, recursive=True, sep=sep))
+
+    dataset = MlflowParamsDataSet(run_id=run.info.run_id, sep=sep)
+    assert dataset.exists()
+    assert dataset.load() == params
+    assert MlflowParamsDataSet(
+        run_id=run.info.run_id, prefix="model", sep=sep
+    ).load() == {"alpha": 0.1, "layers": [64, 32], "optimizer": {"name": "adam"}}
+    assert MlflowParamsDataSet(
+        run_id=run.info.run_id, sep=sep, unflatten=False
+    ).load() == flatten_dict(params, recursive=True, sep=sep)
+    assert not MlflowParamsDataSet(run_id=run.info.run_id, prefix="unknown").exists()
+
+
+def test_params_dataset_save(tracking_uri, params):
+    dataset = MlflowParamsDataSet(prefix="best")
+    with mlflow.start_run() as run:
+        dataset.save(params)
+        assert dataset.load() == params
+
+    logged_params = MlflowClient(tracking_uri).get_run(run.info.run_id).data.params
+    assert logged_params["best.model.optimizer.name"] == "adam"
+    assert logged_params["best.model.layers"] == "[64, 32]"
+
+
+def test_params_dataset_single_call_and_cache(mocker, tracking_uri, params):
+    with mlflow.start_run() as run:
+        mlflow.log_params(flatten_dict(params, recursive=True))
+    get_run_spy = mocker.spy(MlflowClient, "get_run")
+
+    dataset = MlflowParamsDataSet(run_id=run.info.run_id)
+    for _ in range(2):
+        assert dataset.load() == params
+    assert MlflowParamsDataSet(run_id=run.info.run_id, prefix="model").load()
+    # the params of a terminated run are fetched once
+    get_run_spy.assert_called_once()
+
+
+def test_params_dataset_running_run_is_not_cached(tracking_uri):
+    with mlflow.start_run():
+        dataset = MlflowParamsDataSet()
+        mlflow.log_param("alpha", 0.1)
+        assert dataset.load() == {"alpha": 0.1}
+        mlflow.log_param("beta", 0.2)
+        assert dataset.load() == {"alpha": 0.1, "beta": 0.2}
+
+
+def test_params_dataset_errors(tracking_uri):
+    with pytest.raises(DataSetError, match="Cannot find run id"):
+        MlflowParamsDataSet().load()
+
+    with mlflow.start_run() as run:
+        mlflow.log_params({"model": "linear", "model.alpha": 0.1})
+    with pytest.raises(DataSetError, match="'model' is also a param"):
+        MlflowParamsDataSet(run_id=run.info.run_id).load()
+    assert MlflowParamsDataSet(run_id=run.info.run_id, unflatten=False).load() == {
+        "model": "linear",
+        "model.alpha": 0.1,
+    }
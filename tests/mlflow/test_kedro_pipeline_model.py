@@ -173,3 +173,127 @@ def test_model_packaging_missing_artifacts(tmp_path, pipeline_ml_obj):
         mlflow.pyfunc.load_model(
             model_uri=(Path(r"runs:/") / run_id / "model").as_posix()
         )
+
+
+def test_model_does_not_store_input_data(tmp_path, pipeline_ml_obj):
+
+    catalog = DataCatalog(
+        {
+            "raw_data": MemoryDataSet(data=list(range(1000))),
+            "data": MemoryDataSet(),
+            "model": PickleDataSet(
+                filepath=(tmp_path / "model.pkl").resolve().as_posix()
+            ),
+        }
+    )
+
+    kedro_model = KedroPipelineModel(pipeline_ml=pipeline_ml_obj, catalog=catalog)
+
+    # the training data must not be pickled with the model
+    assert kedro_model.initial_catalog.list() == ["model"]
+
+
+@pytest.mark.parametrize("preload_artifacts", [False, True])
+def test_model_artifacts_preloading(
+    tmp_path, mocker, pipeline_ml_obj, preload_artifacts
+):
+
+    catalog = DataCatalog(
+        {
+            "raw_data": MemoryDataSet(),
+            "data": MemoryDataSet(),
+            "model": PickleDataSet(
+                filepath=(tmp_path / "model.pkl").resolve().as_posix()
+            ),
+        }
+    )
+
+    catalog._data_sets["model"].save(2)  # emulate model fitting
+
+    artifacts = pipeline_ml_obj.extract_pipeline_artifacts(catalog)
+
+    kedro_model = KedroPipelineModel(
+        pipeline_ml=pipeline_ml_obj,
+        catalog=catalog,
+        preload_artifacts=preload_artifacts,
+    )
+
+    mlflow_tracking_uri = (tmp_path / "mlruns").as_uri()
+    mlflow.set_tracking_uri(mlflow_tracking_uri)
+    with mlflow.start_run():
+        mlflow.pyfunc.log_model(
+            artifact_path="model",
+            python_model=kedro_model,
+            artifacts=artifacts,
+            conda_env={"python": "3.7.0"},
+        )
+        run_id = mlflow.active_run().info.run_id
+
+    loaded_model = mlflow.pyfunc.load_model(
+        model_uri=(Path(r"runs:/") / run_id / "model").as_posix()
+    )
+
+    load_spy = mocker.spy(PickleDataSet, "_load")
+    assert loaded_model.predict(1) == {"predictions": 2}
+    assert loaded_model.predict(2) == {"predictions": 4}
+    # by default each prediction reads its own copy of the artifacts,
+    # preloaded artifacts are already in memory and the disk is not read
+    assert load_spy.call_count == (0 if preload_artifacts else 2)
+
+
+def explain_fun(model, data):
+    return {"prediction": data * model, "model": model}
+
+
+def test_model_with_several_inference_pipelines(tmp_path, pipeline_ml_obj):
+    pipeline_ml_obj = pipeline_ml(
+        training=pipeline_ml_obj.training,
+        inference={
+            "predict": pipeline_ml_obj.inference,
+            "explain": Pipeline(
+                [
+                    node(
+                        func=explain_fun,
+                        inputs=["model", "raw_data"],
+                        outputs="explanations",
+                    )
+                ]
+            ),
+        },
+        input_name="raw_data",
+    )
+    catalog = DataCatalog(
+        {
+            "raw_data": MemoryDataSet(),
+            "data": MemoryDataSet(),
+            "model": PickleDataSet(
+                filepath=(tmp_path / "model.pkl").resolve().as_posix()
+            ),
+        }
+    )
+    catalog._data_sets["model"].save(2)  # emulate model fitting
+
+    # the artifacts are shared by the inference pipelines
+    artifacts = pipeline_ml_obj.extract_pipeline_artifacts(catalog)
+    assert set(artifacts) == {"model"}
+
+    mlflow.set_tracking_uri((tmp_path / "mlruns").as_uri())
+    with mlflow.start_run():
+        mlflow.pyfunc.log_model(
+            artifact_path="model",
+            python_model=KedroPipelineModel(
+                pipeline_ml=pipeline_ml_obj, catalog=catalog
+            ),
+            artifacts=artifacts,
+            conda_env={"python": "3.7.0"},
+        )
+        run_id = mlflow.active_run().info.run_id
+
+    loaded_model = mlflow.pyfunc.load_model(
+        model_uri=(Path(r"runs:/") / run_id / "model").as_posix()
+    )
+    # the first inference pipeline is the default one
+    assert loaded_model.predict(1) == {"predictions": 2}
+    assert loaded_model.predict({"inference_name": "explain", "model_input": 1}) == {
+        "explanations": {"prediction": 2, "model": 2}
+    }
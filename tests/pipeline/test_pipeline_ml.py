@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 from kedro import __version__ as KEDRO_VERSION
 from kedro.extras.datasets.pandas import CSVDataSet
@@ -332,3 +334,125 @@ def test_decorate(pipeline_ml_with_tag):
 
     new_pl = pipeline_ml_with_tag.decorate(fake_dec)
     assert all([fake_dec in node._decorators for node in new_pl.nodes])
+
+
+def test_inference_inputs_are_memoized(mocker, pipeline_ml_with_tag, dummy_catalog):
+    inputs_spy = mocker.spy(pipeline_ml_with_tag.inference, "inputs")
+
+    pipeline_catalog = pipeline_ml_with_tag.extract_pipeline_catalog(dummy_catalog)
+    pipeline_ml_with_tag.extract_pipeline_artifacts(pipeline_catalog)
+
+    # the inputs were computed when the pipeline was created
+    inputs_spy.assert_not_called()
+
+
+def test_filtering_reuses_inference_inputs(mocker, pipeline_ml_with_tag):
+    inputs_spy = mocker.spy(pipeline_ml_with_tag.inference, "inputs")
+
+    filtered_pipeline_ml = (
+        pipeline_ml_with_tag.only_nodes_with_tags("training", "preprocessing")
+        .from_nodes("preprocess_fun([raw_data]) -> [data]")
+        .tag(["hello"])
+    )
+
+    # the validation of the filtered pipelines does not scan the inference again
+    assert isinstance(filtered_pipeline_ml, PipelineML)
+    inputs_spy.assert_not_called()
+
+
+def test_filtering_keeps_model_options(pipeline_with_tag):
+    pipeline_ml_obj = pipeline_ml(
+        training=pipeline_with_tag,
+        inference=Pipeline(
+            [node(func=predict_fun, inputs=["model", "data"], outputs="predictions")]
+        ),
+        input_name="data",
+        conda_env={"python": "3.7.0", "dependencies": ["pandas==1.0.5"]},
+        model_name="my_model",
+    )
+    filtered_pipeline_ml = pipeline_ml_obj.only_nodes_with_tags("training")
+
+    assert filtered_pipeline_ml.conda_env == pipeline_ml_obj.conda_env
+    assert filtered_pipeline_ml.model_name == "my_model"
+
+
+def explain_fun(model, data):
+    return data
+
+
+def test_several_inference_pipelines(pipeline_with_tag):
+    predict_pipeline = Pipeline(
+        [node(func=predict_fun, inputs=["model", "data"], outputs="predictions")]
+    )
+    explain_pipeline = Pipeline(
+        [node(func=explain_fun, inputs=["model", "data"], outputs="explanations")]
+    )
+    pipeline_ml_obj = pipeline_ml(
+        training=pipeline_with_tag,
+        inference={"predict": predict_pipeline, "explain": explain_pipeline},
+        input_name="data",
+    )
+
+    assert pipeline_ml_obj.inference is predict_pipeline
+    assert pipeline_ml_obj.get_inference_pipeline("explain") is explain_pipeline
+    assert pipeline_ml_obj._get_inference_inputs() == {"model", "data"}
+    # the inference pipelines are kept when the pipeline is filtered
+    filtered_pipeline_ml = pipeline_ml_obj.only_nodes_with_tags("training")
+    assert filtered_pipeline_ml.inference_pipelines == {
+        "predict": predict_pipeline,
+        "explain": explain_pipeline,
+    }
+    with pytest.raises(KedroMlflowPipelineMLInputsError, match="inference_name="):
+        pipeline_ml_obj.get_inference_pipeline("unknown")
+
+
+def test_input_name_must_be_an_input_of_all_inference_pipelines(pipeline_with_tag):
+    with pytest.raises(
+        KedroMlflowPipelineMLInputsError, match="must be an input of inference 'other'"
+    ):
+        pipeline_ml(
+            training=pipeline_with_tag,
+            inference={
+                "predict": Pipeline(
+                    [
+                        node(
+                            func=predict_fun,
+                            inputs=["model", "data"],
+                            outputs="predictions",
+                        )
+                    ]
+                ),
+                "other": Pipeline(
+                    [node(func=explain_fun, inputs=["model", "model"], outputs="x")]
+                ),
+            },
+            input_name="data",
+        )
+
+
+def test_unpickle_pipeline_ml_with_single_inference(pipeline_ml_with_tag):
+    # the PipelineML pickled with an older version of kedro-mlflow
+    # (e.g. in a logged model) only have an "inference" attribute
+    old_state = {
+        key: value
+        for key, value in pipeline_ml_with_tag.__dict__.items()
+        if key not in {"inference_pipelines", "default_inference_name"}
+    }
+    old_pipeline_ml = PipelineML.__new__(PipelineML)
+    old_pipeline_ml.__dict__.update(old_state)
+
+    pipeline_ml_obj = pickle.loads(pickle.dumps(old_pipeline_ml))
+
+    assert list(pipeline_ml_obj.inference_pipelines) == ["inference"]
+    assert (
+        pipeline_ml_obj.get_inference_pipeline("inference").nodes
+        == pipeline_ml_with_tag.inference.nodes
+    )
+    assert pipeline_ml_obj._get_inference_inputs() == {"model", "data"}
+    assert set(
+        pipeline_ml_obj.extract_pipeline_catalog(
+            DataCatalog(
+                {"model": CSVDataSet("fake/path/to/model.csv"), "data": MemoryDataSet()}
+            )
+        ).list()
+    ) == {"model", "data"}
@@ -32,7 +32,12 @@ def test_mlflow_yml_rendering(template_mlflowyml):
         ui=KedroMlflowConfig.UI_OPTS,
         run=KedroMlflowConfig.RUN_OPTS,
         experiment=KedroMlflowConfig.EXPERIMENT_OPTS,
-        hooks=dict(node=KedroMlflowConfig.NODE_HOOK_OPTS),
+        spool=KedroMlflowConfig.SPOOL_OPTS,
+        tracking_policy=KedroMlflowConfig.TRACKING_POLICY_OPTS,
+        hooks=dict(
+            node=KedroMlflowConfig.NODE_HOOK_OPTS,
+            pipeline=KedroMlflowConfig.PIPELINE_HOOK_OPTS,
+        ),
     )
     expected_config["experiment"]["name"] = "fake_project"  # check for proper rendering
     assert mlflow_config == expected_config